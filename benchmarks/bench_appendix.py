@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Compare the inline PDF layout with the shared exercise appendix
+Usage: python benchmarks/bench_appendix.py [days...]
+"""
+
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from course_generator.generator import CourseGenerator
+from pdf_generator.generator import PDFGenerator
+
+DATA_DIR = Path(__file__).parent.parent / "data" / "exercises"
+
+def bench(course, appendix, repeat=3):
+    # The first run warms the per-process caches (styles, layouts)
+    PDFGenerator(io.BytesIO(), appendix=appendix).render(course)
+    best = None
+    for _ in range(repeat):
+        output = io.BytesIO()
+        renderer = PDFGenerator(output, appendix=appendix)
+        start = time.perf_counter()
+        renderer.render(course)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return renderer.doc.page, len(output.getvalue()), best
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [30, 90, 180, 365]
+    generator = CourseGenerator(str(DATA_DIR / "vocabulary.json"), str(DATA_DIR / "program_templates.json"))
+    print(f"{'days':>6} {'layout':>9} {'pages':>6} {'size (KiB)':>11} {'render (ms)':>12}")
+    for days in sizes:
+        course = generator.generate_course(f"{days}-Day Benchmark", days, "intermediate_handstand", seed=days)
+        inline = bench(course, False)
+        for layout, (pages, size, elapsed) in (("inline", inline), ("appendix", bench(course, True))):
+            change = "" if layout == "inline" else f"  ({pages / inline[0] - 1:+.0%} pages, {elapsed / inline[2] - 1:+.0%} time)"
+            print(f"{days:>6} {layout:>9} {pages:>6} {size / 1024:>11.1f} {elapsed * 1000:>12.1f}{change}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Compare the PDF output profiles (draft, screen, print) on the same course
+Usage: python benchmarks/bench_profiles.py [days...]
+
+Every exercise gets one of a few generated 2400x1800 photos, ingested
+through the asset store like real exercise images.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from course_generator.assets import AssetStore, find_images
+from course_generator.generator import CourseGenerator
+from pdf_generator.profiles import PROFILES
+from pdf_generator.renderer import create_renderer
+
+DATA_DIR = Path(__file__).parent.parent / "data" / "exercises"
+PHOTOS = 12
+
+def make_asset_store(base_dir):
+    from PIL import Image, ImageDraw
+
+    for i in range(PHOTOS):
+        exercise_dir = os.path.join(base_dir, "Handstand", f"Photo {i}")
+        os.makedirs(exercise_dir)
+        with open(os.path.join(exercise_dir, "exercise.json"), "w") as f:
+            f.write("{}")
+        # Gradients and noise so the JPEGs compress like photos, not flat colour
+        image = Image.effect_noise((2400, 1800), 40 + i).convert("RGB")
+        draw = ImageDraw.Draw(image)
+        for x in range(0, 2400, 40):
+            draw.rectangle([x, 0, x + 40, 1800 - x // 2], fill=(x % 256, (i * 20) % 256, 255 - x % 256))
+        image.save(os.path.join(exercise_dir, "photo.jpg"), quality=90)
+
+    store = AssetStore(base_dir)
+    images = find_images(base_dir)
+    store.ingest(images)
+    return store, [paths[0] for paths in store.exercise_images(images).values()]
+
+def attach_images(course, asset_paths):
+    for session in course.sessions:
+        for exercises in session.sections.values():
+            for exercise in exercises:
+                exercise.image = asset_paths[zlib.crc32(exercise.exercise_id.encode()) % len(asset_paths)]
+
+def bench(course, store, tmp_dir, repeat=3):
+    rows = []
+    for name in PROFILES:
+        output_path = os.path.join(tmp_dir, f"course_{course.days}_{name}.pdf")
+        # The first run warms the per-process caches (fonts, layouts, images)
+        create_renderer("pdf", output_path, profile=name, asset_store=store).render(course)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            create_renderer("pdf", output_path, profile=name, asset_store=store).render(course)
+        elapsed = (time.perf_counter() - start) / repeat
+        rows.append((course.days, name, elapsed, os.path.getsize(output_path)))
+    return rows
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [7, 30, 90]
+    generator = CourseGenerator(str(DATA_DIR / "vocabulary.json"), str(DATA_DIR / "program_templates.json"))
+    print(f"{'days':>6} {'profile':>8} {'render (ms)':>12} {'size (KiB)':>11} {'KiB/day':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store, asset_paths = make_asset_store(os.path.join(tmp_dir, "exercises"))
+        for days in sizes:
+            course = generator.generate_course(f"{days}-Day Benchmark", days, "intermediate_handstand", seed=days)
+            attach_images(course, asset_paths)
+            for days, name, elapsed, size in bench(course, store, tmp_dir):
+                print(f"{days:>6} {name:>8} {elapsed * 1000:>12.1f} {size / 1024:>11.1f} {size / 1024 / days:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Compare the PDF, HTML, Markdown and JSON renderers on the same course
+Usage: python benchmarks/bench_renderers.py [days...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from course_generator.generator import CourseGenerator
+from pdf_generator.renderer import FORMATS, create_renderer
+
+DATA_DIR = Path(__file__).parent.parent / "data" / "exercises"
+
+def bench(generator, days, tmp_dir, repeat=3):
+    course = generator.generate_course(f"{days}-Day Benchmark", days, "intermediate_handstand", seed=days)
+    rows = []
+    for format_name in FORMATS:
+        output_path = os.path.join(tmp_dir, f"course_{days}.{format_name}")
+        # The first run warms the per-process caches (fonts, layouts, rows)
+        create_renderer(format_name, output_path).render(course)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            create_renderer(format_name, output_path).render(course)
+        elapsed = (time.perf_counter() - start) / repeat
+        rows.append((days, format_name, elapsed, os.path.getsize(output_path)))
+    return rows
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [7, 30, 90]
+    generator = CourseGenerator(str(DATA_DIR / "vocabulary.json"), str(DATA_DIR / "program_templates.json"))
+    print(f"{'days':>6} {'format':>7} {'render (ms)':>12} {'vs pdf':>8} {'size (KiB)':>11}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for days in sizes:
+            rows = bench(generator, days, tmp_dir)
+            pdf_time = rows[0][2]
+            for days, format_name, elapsed, size in rows:
+                print(f"{days:>6} {format_name:>7} {elapsed * 1000:>12.2f} {elapsed / pdf_time:>7.1%} {size / 1024:>11.1f}")
+
+if __name__ == "__main__":
+    main()
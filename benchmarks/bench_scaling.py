@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark: loaders, generator, builder and renderers on synthetic libraries
+Usage: python benchmarks/bench_scaling.py [--templates N] [sizes...]
+"""
+
+import argparse
+import io
+import math
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from course_generator.generator import CourseGenerator
+from course_generator.storage import JSONExerciseStore, SQLiteExerciseStore
+from course_generator.synthetic import (generate_exercises, generate_templates,
+                                        write_category_folders, write_master_files)
+from course_generator.validation import find_exercise_files, load_exercise_files
+from pdf_generator.renderer import create_renderer
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def build_from_folders(data_dir):
+    exercises, issues = load_exercise_files(find_exercise_files(data_dir), data_dir)
+    if issues:
+        raise ValueError(f"{len(issues)} invalid synthetic exercises, e.g. {issues[0]}")
+    return exercises
+
+def bench(size, template_count, tmp_dir):
+    data_dir = os.path.join(tmp_dir, f"library_{size}")
+    exercises = list(generate_exercises(size))
+    templates = generate_templates(size, template_count)
+    write_master_files(data_dir, exercises, templates)
+    write_category_folders(data_dir, exercises)
+    vocabulary_path = os.path.join(data_dir, "vocabulary.json")
+    templates_path = os.path.join(data_dir, "program_templates.json")
+
+    stages = {}
+    stages["load vocabulary.json"], _ = timed(lambda: JSONExerciseStore(vocabulary_path))
+    stages["build from folders"], built = timed(lambda: build_from_folders(data_dir))
+    stages["build SQLite store"], _ = timed(
+        lambda: SQLiteExerciseStore.build(os.path.join(data_dir, "vocabulary.db"), built))
+    stages["CourseGenerator()"], generator = timed(lambda: CourseGenerator(vocabulary_path, templates_path))
+    template_name = next(iter(templates))
+    stages["generate 365 days"], course = timed(
+        lambda: generator.generate_course("Scaling", 365, template_name, seed=1))
+    short_course = generator.generate_course("Scaling", 14, template_name, seed=1)
+    # Warm caches (styles, compiled templates) so each size times steady state
+    create_renderer("html", io.StringIO()).render(short_course)
+    create_renderer("pdf", io.BytesIO()).render(short_course)
+    stages["render HTML"], _ = timed(lambda: create_renderer("html", io.StringIO()).render(course))
+    stages["render PDF (14 days)"], _ = timed(lambda: create_renderer("pdf", io.BytesIO()).render(short_course))
+    return stages
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=[10000, 30000, 100000],
+                        help="Library sizes in exercises (default: 10000 30000 100000)")
+    parser.add_argument("--templates", type=int, default=1000, help="Templates per library (default: 1000)")
+    args = parser.parse_args()
+    sizes = sorted(args.sizes)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            print(f"… {size} exercises", file=sys.stderr)
+            results[size] = bench(size, args.templates, tmp_dir)
+
+    stage_names = list(results[sizes[0]])
+    print(f"{'stage':<22}" + "".join(f"{size:>12}" for size in sizes) + f"{'growth':>12}")
+    for stage in stage_names:
+        times = [results[size][stage] for size in sizes]
+        # Exponent k of a t ~ n^k fit between the smallest and largest size
+        if len(sizes) > 1 and times[0] > 0:
+            growth = f"n^{math.log(times[-1] / times[0]) / math.log(sizes[-1] / sizes[0]):.2f}"
+        else:
+            growth = "-"
+        print(f"{stage:<22}" + "".join(f"{t * 1000:>10.1f}ms" for t in times) + f"{growth:>12}")
+
+if __name__ == "__main__":
+    main()
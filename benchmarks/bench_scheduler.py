@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Interactive latency while a batch is running, with and without priorities
+Usage: python benchmarks/bench_scheduler.py [batch_jobs] [workers]
+
+A batch of 30-day PDF courses is queued all at once, and an interactive
+7-day course is requested every 250 ms while it runs. "fifo" puts both in
+one queue; "priority" uses the scheduler's interactive and batch classes.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from course_generator.scheduler import JobScheduler
+from scheduler_server import init_worker, render_job
+
+DATA_DIR = Path(__file__).parent.parent / "data" / "exercises"
+
+async def run(executor, workers, queue_sizes, batch_class, batch_jobs, output_dir):
+    async with JobScheduler(executor, workers, queue_sizes) as scheduler:
+        async def batch_job(i):
+            request = {"days": 30, "template": "intermediate_handstand", "seed": i,
+                       "output": os.path.join(output_dir, f"batch{i}.pdf")}
+            await scheduler.submit(batch_class, render_job, request)
+
+        async def interactive_job(i):
+            request = {"days": 7, "template": "beginner_handstand", "seed": i,
+                       "output": os.path.join(output_dir, f"interactive{i}.pdf")}
+            start = time.perf_counter()
+            await scheduler.submit("interactive", render_job, request)
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = asyncio.gather(*(batch_job(i) for i in range(batch_jobs)))
+        latencies = []
+        i = 0
+        while not batch.done():
+            latencies.append(asyncio.create_task(interactive_job(i)))
+            i += 1
+            await asyncio.sleep(0.25)
+        await batch
+        batch_seconds = time.perf_counter() - start
+        return batch_seconds, await asyncio.gather(*latencies), scheduler.snapshot()
+
+def main():
+    batch_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else min(4, os.cpu_count() or 1)
+    print(f"{batch_jobs} batch jobs, {workers} workers\n")
+    print(f"{'queues':<10} {'batch':>9} {'interactive p50':>16} {'p95':>9} {'max':>9} {'wait p95':>9}")
+    with tempfile.TemporaryDirectory() as output_dir:
+        with ProcessPoolExecutor(workers, initializer=init_worker,
+                                 initargs=(str(DATA_DIR / "vocabulary.json"),
+                                           str(DATA_DIR / "program_templates.json"))) as executor:
+            # Start and warm every worker before timing
+            asyncio.run(run(executor, workers, {"interactive": 1024}, "interactive", workers * 2, output_dir))
+            for name, queue_sizes, batch_class in [
+                ("fifo", {"interactive": 1024}, "interactive"),
+                ("priority", {"interactive": 32, "batch": 1024}, "batch"),
+            ]:
+                batch_seconds, latencies, stats = asyncio.run(
+                    run(executor, workers, queue_sizes, batch_class, batch_jobs, output_dir))
+                latencies.sort()
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                print(f"{name:<10} {batch_seconds:>8.2f}s {statistics.median(latencies) * 1000:>13.0f} ms"
+                      f" {p95 * 1000:>6.0f} ms {latencies[-1] * 1000:>6.0f} ms"
+                      f" {stats['interactive']['wait_p95'] * 1000:>6.0f} ms")
+
+if __name__ == "__main__":
+    main()
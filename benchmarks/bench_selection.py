@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Compare uniform and weighted exercise selection
+Usage: python benchmarks/bench_selection.py [days...]
+
+The weighted template is the intermediate template with a random weight
+between 1 and 5 on every exercise, so both draw from the same pools.
+"""
+
+import copy
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from course_generator.generator import CourseGenerator
+from course_generator.selection import SectionSelector, WeightedSectionSelector
+
+DATA_DIR = Path(__file__).parent.parent / "data" / "exercises"
+
+def weighted_copy(template, seed=0):
+    rng = random.Random(seed)
+    template = copy.deepcopy(template)
+    for config in template["sections"].values():
+        config["weights"] = {ex_id: rng.randint(1, 5) for ex_id in config["exercise_ids"]}
+    return template
+
+def courses_per_second(generator, template, days, seconds=1.0):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for _ in generator.iter_template_sessions(days, template, seed=count):
+            pass
+        count += 1
+    return count / (time.perf_counter() - start)
+
+def picks_per_second(make_selector, picks=200000):
+    selector = make_selector()
+    start = time.perf_counter()
+    for _ in range(picks // 3):
+        selector.pick(3)
+    return picks / (time.perf_counter() - start)
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [30, 365]
+    generator = CourseGenerator(str(DATA_DIR / "vocabulary.json"), str(DATA_DIR / "program_templates.json"))
+    uniform = generator.get_template("intermediate_handstand")
+    weighted = weighted_copy(uniform)
+
+    print(f"{'days':>6} {'uniform (courses/s)':>20} {'weighted (courses/s)':>21} {'ratio':>7}")
+    for days in sizes:
+        plain = courses_per_second(generator, uniform, days)
+        heavy = courses_per_second(generator, weighted, days)
+        print(f"{days:>6} {plain:>20.1f} {heavy:>21.1f} {heavy / plain:>7.2f}")
+
+    print(f"\n{'pool':>6} {'uniform (picks/s)':>18} {'weighted (picks/s)':>19} {'ratio':>7}")
+    for pool_size in (10, 100, 10000):
+        pool = [f"ex_{i}" for i in range(pool_size)]
+        weights = [random.Random(i).randint(1, 5) for i in range(pool_size)]
+        plain = picks_per_second(lambda: SectionSelector(pool, random.Random(1), window=1))
+        heavy = picks_per_second(lambda: WeightedSectionSelector(pool, weights, random.Random(1), window=1))
+        print(f"{pool_size:>6} {plain:>18,.0f} {heavy:>19,.0f} {heavy / plain:>7.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Compare the JSON and SQLite exercise stores at 1k, 10k and 100k exercises
+Usage: python benchmarks/bench_storage.py [sizes...]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from course_generator.storage import JSONExerciseStore, SQLiteExerciseStore
+from course_generator.validation import CATEGORIES, DIFFICULTIES
+
+EQUIPMENT = ["none", "wall", "yoga mat", "resistance band"]
+
+def synthetic_exercises(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield {
+            "id": f"synthetic_{i:07d}",
+            "name": f"Synthetic Exercise {i}",
+            "description": "Keep your core tight and your shoulders stacked over your wrists. " * 2,
+            "default_sets": rng.randint(1, 4),
+            "default_reps": f"{rng.choice([5, 8, 10, 12, 30])} {rng.choice(['reps', 'seconds'])}",
+            "difficulty": rng.choice(DIFFICULTIES),
+            "equipment": rng.choice(EQUIPMENT),
+            "primary_muscle_groups": rng.sample(["core", "shoulders", "wrists", "hamstrings"], 2),
+            "image": None,
+            "category": rng.choice(CATEGORIES)
+        }
+
+def timed(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+def open_and_query(store_class, path, exercise_ids):
+    store = store_class(path)
+    store.get_many(exercise_ids)
+    return store
+
+def bench(size, tmp_dir):
+    exercises = list(synthetic_exercises(size))
+    json_path = os.path.join(tmp_dir, f"vocabulary_{size}.json")
+    db_path = os.path.join(tmp_dir, f"vocabulary_{size}.db")
+    with open(json_path, "w") as f:
+        json.dump({"exercises": exercises}, f)
+    SQLiteExerciseStore.build(db_path, exercises)
+    template_ids = [ex["id"] for ex in random.Random(1).sample(exercises, 20)]
+
+    rows = []
+    for name, store_class, path in (("json", JSONExerciseStore, json_path),
+                                    ("sqlite", SQLiteExerciseStore, db_path)):
+        # Loading includes the first query, which opens the SQLite connection
+        load_time, store = timed(lambda: open_and_query(store_class, path, template_ids[:1]))
+        query_time, _ = timed(lambda: store.get_many(template_ids), repeat=200)
+        find_time, found = timed(lambda: store.find(category="Handstand", difficulty="advanced"), repeat=5)
+        rows.append((size, name, load_time, query_time, find_time, len(found)))
+    return rows
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    print(f"{'size':>8} {'backend':>8} {'load (ms)':>10} {'20 ids (ms)':>12} {'find (ms)':>10} {'matches':>8}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in sizes:
+            for size, name, load_time, query_time, find_time, matches in bench(size, tmp_dir):
+                print(f"{size:>8} {name:>8} {load_time * 1000:>10.2f} {query_time * 1000:>12.3f} {find_time * 1000:>10.2f} {matches:>8}")
+
+if __name__ == "__main__":
+    main()
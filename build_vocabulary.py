@@ -1,35 +1,36 @@
 #!/usr/bin/env python3
 """
 Build master vocabulary.json from individual exercise.json files
-Scans all exercise folders and combines them into vocabulary.json
+Scans all exercise folders, validates them and combines them into vocabulary.json
+With --sqlite, also writes the indexed vocabulary.db store
 """
 
 import json
+import sys
 from pathlib import Path
 
-def build_vocabulary():
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from course_generator.storage import SQLiteExerciseStore
+from course_generator.validation import CATEGORIES, find_exercise_files, load_exercise_files
+
+def build_vocabulary(sqlite=False):
     # Base directory for exercises
     base_dir = Path(__file__).parent / "data" / "exercises"
     
-    # Categories to scan (in preferred order)
-    categories = ["Warmup", "Prehab", "Shoulder opener", "Handstand", "Conditioning", "Stretching"]
+    # Find all exercise.json files, in category order
+    exercise_files = find_exercise_files(str(base_dir), CATEGORIES)
     
-    exercises = []
+    # Load and validate them (in parallel for large libraries)
+    exercises, issues = load_exercise_files(exercise_files, str(base_dir))
+    if issues:
+        print(f"❌ {len(issues)} problem(s) found, vocabulary.json was not written:")
+        for issue in issues:
+            print(f"  - {issue}")
+        return False
     
-    # Scan each category
-    for category in categories:
-        category_path = base_dir / category
-        if not category_path.exists():
-            continue
-        
-        # Find all exercise.json files in this category
-        for exercise_file in sorted(category_path.glob("*/exercise.json")):
-            with open(exercise_file, 'r', encoding='utf-8') as f:
-                exercise_data = json.load(f)
-                exercises.append(exercise_data)
-            
-            exercise_name = exercise_file.parent.name
-            print(f"Added: {category}/{exercise_name}")
+    for exercise_data in exercises:
+        print(f"Added: {exercise_data['category']}/{exercise_data['name']}")
     
     # Create the master vocabulary structure
     vocabulary = {
@@ -44,6 +45,12 @@ def build_vocabulary():
     print(f"\n✅ Done!")
     print(f"📄 Total exercises: {len(exercises)}")
     print(f"💾 Saved to: {output_path}")
+    
+    if sqlite:
+        db_path = base_dir / "vocabulary.db"
+        SQLiteExerciseStore.build(str(db_path), exercises)
+        print(f"🗄️  SQLite store: {db_path}")
+    return True
 
 if __name__ == "__main__":
-    build_vocabulary()
+    sys.exit(0 if build_vocabulary(sqlite="--sqlite" in sys.argv[1:]) else 1)
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic exercise library for scaling tests
+Writes category folders with exercise.json files plus the master vocabulary.json
+and program_templates.json, deterministically for a given seed
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from course_generator.synthetic import (generate_exercises, generate_templates,
+                                        write_category_folders, write_master_files)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic exercise library for scaling tests.")
+    parser.add_argument("--exercises", type=int, default=10000, help="Number of exercises (default: 10000)")
+    parser.add_argument("--templates", type=int, default=1000, help="Number of program templates (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed; the same seed always gives the same data")
+    parser.add_argument("--output", default=str(Path(__file__).parent / "data" / "synthetic"),
+                        help="Output directory (default: data/synthetic)")
+    parser.add_argument("--no-folders", action="store_true",
+                        help="Only write the master files, not one folder per exercise")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    exercises = list(generate_exercises(args.exercises, args.seed))
+    templates = generate_templates(args.exercises, args.templates, args.seed)
+    write_master_files(args.output, exercises, templates)
+    if not args.no_folders:
+        write_category_folders(args.output, exercises)
+
+    print(f"✅ Done in {time.perf_counter() - start:.1f}s")
+    print(f"🏋️  Exercises: {len(exercises)}")
+    print(f"📋 Templates: {len(templates)}")
+    print(f"📁 Output: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .models import Course
+
+# Tempo assumed for counted reps when estimating time under tension
+DEFAULT_SECONDS_PER_REP = 3.0
+
+
+class CourseAnalytics:
+    """Training volume of one or more courses, computed with NumPy.
+
+    The courses are flattened once into arrays with one row per prescribed
+    exercise (course, day, exercise and reps, sets). Every statistic is then a
+    vectorized reduction over those arrays. Arrays are indexed
+    ``[course, day]`` or ``[course, week]``, padded with zeros for courses
+    shorter than the longest one.
+
+    Volume is ``sets * quantity * sides * repeats``, using the middle of a
+    prescribed range. Time under tension counts hold durations as given and
+    counted reps at ``seconds_per_rep``. Each exercise's time under tension is added
+    in full to every one of its primary muscle groups.
+    """
+
+    def __init__(self, courses: Sequence[Course], seconds_per_rep: float = DEFAULT_SECONDS_PER_REP):
+        self.seconds_per_rep = seconds_per_rep
+        self.course_names = [course.name for course in courses]
+
+        # One row per exercise and prescription: the same exercise may be prescribed differently
+        exercise_rows: Dict[Tuple[str, str], int] = {}
+        quantity, is_time, times, muscle_lists = [], [], [], []
+        course_index, day_index, exercise_index, sets = [], [], [], []
+        days = []
+        for c, course in enumerate(courses):
+            day = -1
+            for day, session in enumerate(course.iter_sessions()):
+                for exercises in session.sections.values():
+                    for exercise in exercises:
+                        key = (exercise.exercise_id or exercise.name, exercise.reps)
+                        row = exercise_rows.get(key)
+                        if row is None:
+                            row = exercise_rows[key] = len(quantity)
+                            prescription = exercise.prescription
+                            quantity.append(prescription.quantity)
+                            is_time.append(prescription.is_time)
+                            times.append(prescription.times)
+                            muscle_lists.append(exercise.primary_muscle_groups)
+                        course_index.append(c)
+                        day_index.append(day)
+                        exercise_index.append(row)
+                        sets.append(exercise.sets)
+            days.append(day + 1)
+
+        self.muscle_groups: List[str] = sorted({group for groups in muscle_lists for group in groups})
+        group_columns = {group: i for i, group in enumerate(self.muscle_groups)}
+        muscles = np.zeros((len(muscle_lists), len(self.muscle_groups)))
+        for row, groups in enumerate(muscle_lists):
+            muscles[row, [group_columns[group] for group in groups]] = 1.0
+
+        self.days = np.asarray(days, dtype=np.int64)
+        self._course = np.asarray(course_index, dtype=np.int64)
+        self._day = np.asarray(day_index, dtype=np.int64)
+        exercise_index = np.asarray(exercise_index, dtype=np.int64)
+
+        amount = np.asarray(sets, dtype=float) * np.asarray(quantity)[exercise_index] * np.asarray(times)[exercise_index]
+        timed = np.asarray(is_time, dtype=bool)[exercise_index]
+        self._reps = np.where(timed, 0.0, amount)
+        self._seconds = np.where(timed, amount, 0.0)
+        self._tut = self._seconds + self._reps * seconds_per_rep
+
+        # Time under tension per (course, exercise), then spread over muscle groups
+        n_courses, n_exercises = len(self.course_names), len(quantity)
+        per_exercise = np.bincount(self._course * n_exercises + exercise_index, weights=self._tut,
+                                   minlength=n_courses * n_exercises).reshape(n_courses, n_exercises)
+        self.muscle_load = per_exercise @ muscles
+
+    @property
+    def max_days(self) -> int:
+        return int(self.days.max()) if len(self.days) else 0
+
+    def _per_day(self, values: np.ndarray) -> np.ndarray:
+        n_courses, n_days = len(self.course_names), self.max_days
+        return np.bincount(self._course * n_days + self._day, weights=values,
+                           minlength=n_courses * n_days).reshape(n_courses, n_days)
+
+    def _per_week(self, values: np.ndarray) -> np.ndarray:
+        n_courses, n_weeks = len(self.course_names), -(-self.max_days // 7)
+        return np.bincount(self._course * n_weeks + self._day // 7, weights=values,
+                           minlength=n_courses * n_weeks).reshape(n_courses, n_weeks)
+
+    def daily_reps(self) -> np.ndarray:
+        return self._per_day(self._reps)
+
+    def daily_seconds(self) -> np.ndarray:
+        return self._per_day(self._seconds)
+
+    def daily_time_under_tension(self) -> np.ndarray:
+        return self._per_day(self._tut)
+
+    def weekly_reps(self) -> np.ndarray:
+        return self._per_week(self._reps)
+
+    def weekly_seconds(self) -> np.ndarray:
+        return self._per_week(self._seconds)
+
+    def weekly_time_under_tension(self) -> np.ndarray:
+        return self._per_week(self._tut)
+
+    def summary(self, course: int = 0) -> Dict:
+        """Totals for one course, as plain JSON-serializable values."""
+        days = int(self.days[course])
+        weekly_tut = self.weekly_time_under_tension()[course, :-(-days // 7)]
+        return {
+            "name": self.course_names[course],
+            "days": days,
+            "total_reps": float(self._reps[self._course == course].sum()),
+            "total_hold_seconds": float(self._seconds[self._course == course].sum()),
+            "time_under_tension_seconds": float(weekly_tut.sum()),
+            "weekly_time_under_tension_seconds": weekly_tut.tolist(),
+            "muscle_group_load_seconds": {
+                group: float(load) for group, load in zip(self.muscle_groups, self.muscle_load[course]) if load
+            }
+        }
@@ -0,0 +1,240 @@
+import hashlib
+import itertools
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .generator import GENERATOR_VERSION, CourseGenerator
+from .models import Course, CourseSpec, Exercise, Session
+from .snapshot import DataSnapshot
+from .storage import ExerciseStore
+
+ARCHIVE_FORMAT = 1
+
+# Exercise fields an override may change, besides picking another exercise
+OVERRIDABLE_FIELDS = ["name", "description", "sets", "reps", "category", "difficulty",
+                      "equipment", "primary_muscle_groups", "image"]
+
+
+class ArchiveMismatchError(ValueError):
+    """Raised when the data a course was archived against has changed."""
+
+
+def content_hash(data) -> str:
+    """Short, stable hash of JSON-serializable data."""
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def template_hash(template: Dict) -> str:
+    return content_hash(template)
+
+
+def vocabulary_hash(generator: CourseGenerator, template: Dict, snapshot: Optional[DataSnapshot] = None) -> str:
+    """Hash the vocabulary entries a template can draw from.
+
+    Only referenced exercises affect generation, so edits to unrelated
+    exercises don't invalidate existing archives.
+    """
+    ids = sorted({ex_id for config in template['sections'].values() for ex_id in config['exercise_ids']})
+    exercises = (snapshot or generator.snapshot).vocabulary.get_many(ids)
+    return content_hash({ex_id: exercise.to_dict() for ex_id, exercise in exercises.items()})
+
+
+def _compact_exercise(exercise: Exercise, base: Optional[Exercise]) -> Dict:
+    entry = {"id": exercise.exercise_id, "sets": exercise.sets}
+    base_dict = base.to_dict() if base is not None else {}
+    for field, value in exercise.to_dict().items():
+        if field in ("exercise_id", "sets"):
+            continue
+        if base is None or base_dict.get(field) != value:
+            entry[field] = value
+    return entry
+
+
+def _expand_exercise(entry: Dict, base: Optional[Exercise]) -> Exercise:
+    values = base.to_dict() if base is not None else {}
+    values.update({field: entry[field] for field in OVERRIDABLE_FIELDS if field in entry})
+    values["exercise_id"] = entry["id"]
+    return Exercise(**values)
+
+
+class CourseArchive:
+    """A course stored as the inputs that regenerate it, plus manual edits.
+
+    Instead of every session and description, an archive keeps the spec
+    (name, days, template, seed), the generator settings and version,
+    hashes of the template and the exercises it references, and a list of
+    overrides for sections that were edited after generation. If days were
+    added or removed, ``session_count`` records how many the course has;
+    added days are stored in full as overrides.
+    """
+
+    def __init__(self, spec: CourseSpec, template_hash: str, vocabulary_hash: str,
+                 no_repeat_window: int = 1, overrides: Optional[List[Dict]] = None,
+                 generator_version: int = GENERATOR_VERSION, session_count: Optional[int] = None):
+        if spec.seed is None:
+            raise ValueError("Only seeded courses can be archived")
+        self.spec = spec
+        self.template_hash = template_hash
+        self.vocabulary_hash = vocabulary_hash
+        self.no_repeat_window = no_repeat_window
+        self.overrides = overrides or []
+        self.generator_version = generator_version
+        self.session_count = session_count
+
+    @classmethod
+    def from_course(cls, generator: CourseGenerator, spec: CourseSpec,
+                    course: Optional[Course] = None) -> 'CourseArchive':
+        """Archive a course generated from ``spec``.
+
+        If ``course`` is given, every section that differs from a fresh
+        regeneration is recorded as an override.
+        """
+        snapshot = generator.snapshot
+        template = generator.get_template(spec.template_name, snapshot)
+        archive = cls(
+            spec,
+            template_hash(template),
+            vocabulary_hash(generator, template, snapshot),
+            generator.no_repeat_window
+        )
+        if course is not None:
+            baseline = generator.iter_sessions(spec.days, spec.template_name, spec.seed, snapshot)
+            archive.overrides, count = archive._diff(snapshot.vocabulary, baseline, course.iter_sessions())
+            if count != spec.days:
+                archive.session_count = count
+            if course.name != spec.name:
+                archive.spec = CourseSpec(course.name, spec.days, spec.template_name, spec.seed)
+        return archive
+
+    def restore(self, generator: CourseGenerator, verify: bool = True) -> Course:
+        """Regenerate the full course and re-apply its overrides.
+
+        Raises ArchiveMismatchError if the generator version, the template or
+        the exercises it uses changed since the course was archived, unless
+        ``verify`` is False.
+        """
+        # One snapshot throughout, so a reload can't slip in between checking and generating
+        snapshot = generator.snapshot
+        template = generator.get_template(self.spec.template_name, snapshot)
+        if verify:
+            if self.generator_version != GENERATOR_VERSION:
+                raise ArchiveMismatchError(
+                    f"Archived by generator version {self.generator_version}, this is version {GENERATOR_VERSION}")
+            if template_hash(template) != self.template_hash:
+                raise ArchiveMismatchError(f"Template '{self.spec.template_name}' changed since archiving")
+            if vocabulary_hash(generator, template, snapshot) != self.vocabulary_hash:
+                raise ArchiveMismatchError(f"Exercises used by '{self.spec.template_name}' changed since archiving")
+            if generator.no_repeat_window != self.no_repeat_window:
+                raise ArchiveMismatchError(
+                    f"Archived with no_repeat_window={self.no_repeat_window}, generator uses {generator.no_repeat_window}")
+
+        course = generator.generate_from_spec(self.spec, snapshot)
+        if self.session_count is not None:
+            del course.sessions[self.session_count:]
+            while len(course.sessions) < self.session_count:
+                # Filled in by the day's overrides
+                course.add_session(Session("", {}))
+        by_day = {}
+        for override in self.overrides:
+            by_day.setdefault(override["day"], []).append(override)
+        if by_day:
+            override_ids = [entry["id"] for override in self.overrides for entry in override.get("exercises") or []]
+            bases = snapshot.vocabulary.get_many(override_ids)
+            for day, day_overrides in by_day.items():
+                session = course.sessions[day - 1]
+                for override in day_overrides:
+                    self._apply(session, override, bases)
+        return course
+
+    def _diff(self, vocabulary: ExerciseStore, baseline: Iterator[Session],
+              edited: Iterator[Session]) -> Tuple[List[Dict], int]:
+        """Return the overrides that turn ``baseline`` into ``edited``, and the number of edited sessions."""
+        overrides = []
+        count = 0
+        # A day past the end of the baseline is diffed against an empty session
+        empty = Session("", {})
+        for day, (original, session) in enumerate(itertools.zip_longest(baseline, edited, fillvalue=None), start=1):
+            if session is None:
+                # Days removed from the end
+                break
+            count = day
+            original = original or empty
+            if session.name != original.name:
+                overrides.append({"day": day, "name": session.name})
+            for section in list(original.sections) + [s for s in session.sections if s not in original.sections]:
+                old = original.sections.get(section)
+                new = session.sections.get(section)
+                if new is None:
+                    overrides.append({"day": day, "section": section, "exercises": None})
+                elif old is None or [e.to_dict() for e in old] != [e.to_dict() for e in new]:
+                    bases = vocabulary.get_many(e.exercise_id for e in new)
+                    overrides.append({
+                        "day": day,
+                        "section": section,
+                        "exercises": [_compact_exercise(e, bases.get(e.exercise_id)) for e in new]
+                    })
+        return overrides, count
+
+    @staticmethod
+    def _apply(session: Session, override: Dict, bases: Dict[str, Exercise]):
+        if "name" in override:
+            session.name = override["name"]
+        if "section" not in override:
+            return
+        if override["exercises"] is None:
+            session.sections.pop(override["section"], None)
+        else:
+            session.sections[override["section"]] = [
+                _expand_exercise(entry, bases.get(entry["id"])) for entry in override["exercises"]
+            ]
+
+    def to_dict(self):
+        data = {
+            "format": ARCHIVE_FORMAT,
+            "generator_version": self.generator_version,
+            "spec": self.spec.to_dict(),
+            "template_hash": self.template_hash,
+            "vocabulary_hash": self.vocabulary_hash,
+            "no_repeat_window": self.no_repeat_window,
+            "overrides": self.overrides
+        }
+        if self.session_count is not None:
+            data["session_count"] = self.session_count
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CourseArchive':
+        if data.get("format") != ARCHIVE_FORMAT:
+            raise ValueError(f"Unsupported archive format: {data.get('format')}")
+        return cls(
+            CourseSpec.from_dict(data["spec"]),
+            data["template_hash"],
+            data["vocabulary_hash"],
+            data.get("no_repeat_window", 1),
+            data.get("overrides", []),
+            # Archives from before the field existed were made by version 1
+            data.get("generator_version", 1),
+            data.get("session_count")
+        )
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(',', ':'), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'CourseArchive':
+        return cls.from_dict(json.loads(text))
+
+
+def write_archives(path: str, archives: Iterable[CourseArchive]):
+    """Append archives to a JSON Lines file, one course per line."""
+    with open(path, 'a', encoding='utf-8') as f:
+        for archive in archives:
+            f.write(archive.to_json() + '\n')
+
+
+def read_archives(path: str) -> Iterator[CourseArchive]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield CourseArchive.from_json(line)
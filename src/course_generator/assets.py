@@ -0,0 +1,268 @@
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from .batch import atomic_output, file_digest
+from .validation import CATEGORIES
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'}
+
+# Longest edge in pixels of the pre-generated renditions: small previews,
+# phone screens (HTML at 2x) and print (PDF image column at 300 dpi)
+THUMBNAIL_SIZES = (160, 480, 1200)
+
+# Pillow format used to save each source type; vector SVGs are kept as is
+_SAVE_FORMATS = {'.jpg': 'JPEG', '.png': 'PNG', '.gif': 'PNG', '.webp': 'WEBP'}
+# Thumbnails are named after the format they are saved in, not their source
+_FORMAT_EXTENSIONS = {'JPEG': '.jpg', 'PNG': '.png', 'WEBP': '.webp'}
+
+MANIFEST_VERSION = 1
+
+
+def _normalized_extension(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    return '.jpg' if extension == '.jpeg' else extension
+
+
+def find_images(base_dir: str, categories: Sequence[str] = CATEGORIES) -> Dict[str, List[str]]:
+    """Map each exercise folder to the images in it, as paths relative to ``base_dir``."""
+    found = {}
+    for category in categories:
+        category_path = os.path.join(base_dir, category)
+        if not os.path.isdir(category_path):
+            continue
+        for exercise_dir in sorted(os.listdir(category_path)):
+            exercise_path = os.path.join(category_path, exercise_dir)
+            if not os.path.isfile(os.path.join(exercise_path, "exercise.json")):
+                continue
+            found[os.path.join(category, exercise_dir)] = [
+                os.path.join(category, exercise_dir, name)
+                for name in sorted(os.listdir(exercise_path))
+                if _normalized_extension(name) in IMAGE_EXTENSIONS
+            ]
+    return found
+
+
+def _make_thumbnail(source_path: str, dest_path: str, size: int, save_format: str) -> Tuple[int, int]:
+    from PIL import Image
+
+    with Image.open(source_path) as image:
+        image.thumbnail((size, size))
+        if save_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        with atomic_output(dest_path) as tmp_path:
+            image.save(tmp_path, format=save_format)
+        return image.size
+
+
+def _image_size(path: str) -> Optional[Tuple[int, int]]:
+    if _normalized_extension(path) == '.svg':
+        return None
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return image.size
+
+
+class IngestReport:
+    """What one ingestion run did."""
+
+    def __init__(self):
+        self.images = 0
+        self.hashed = 0
+        self.new_assets = 0
+        self.duplicates = 0
+        self.thumbnails = 0
+        self.pruned = 0
+        self.errors: List[str] = []
+
+
+class AssetStore:
+    """Content-addressed store of exercise images, with a manifest.
+
+    Each distinct image is kept once under ``assets/<xx>/<sha256>.<ext>``
+    together with its thumbnails, however many exercise folders contain a
+    copy. ``assets/manifest.json`` records every asset and, for every source
+    file, the size and mtime it had when it was hashed, so later runs only
+    read files that changed and only process content they have not seen.
+    Asset paths are relative to the exercises directory, like the ``image``
+    field of ``exercise.json``.
+    """
+
+    def __init__(self, base_dir: str, store_name: str = "assets",
+                 sizes: Sequence[int] = THUMBNAIL_SIZES, workers: Optional[int] = None):
+        self.base_dir = base_dir
+        self.store_name = store_name
+        self.sizes = tuple(sizes)
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4)
+        self.manifest_path = os.path.join(base_dir, store_name, "manifest.json")
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = None
+        if not manifest or manifest.get("version") != MANIFEST_VERSION:
+            manifest = {"version": MANIFEST_VERSION, "assets": {}, "sources": {}}
+        return manifest
+
+    def save_manifest(self):
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        with atomic_output(self.manifest_path) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, indent=4, sort_keys=True)
+
+    def _abs(self, relative_path: str) -> str:
+        return os.path.join(self.base_dir, relative_path)
+
+    def asset_path(self, digest: str, extension: str, size: Optional[int] = None) -> str:
+        suffix = f"_{size}" if size else ""
+        return os.path.join(self.store_name, digest[:2], f"{digest}{suffix}{extension}")
+
+    def _source_record(self, relative_path: str) -> Tuple[str, Union[Dict, OSError], bool]:
+        """Return (path, record, hashed); unchanged files reuse the recorded digest.
+
+        A file that can't be read (say, removed since it was listed) gets the
+        error in place of its record.
+        """
+        try:
+            stat = os.stat(self._abs(relative_path))
+            known = self.manifest["sources"].get(relative_path)
+            if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+                return relative_path, known, False
+            record = {"sha256": file_digest(self._abs(relative_path)), "size": stat.st_size,
+                      "mtime_ns": stat.st_mtime_ns}
+        except OSError as e:
+            return relative_path, e, False
+        return relative_path, record, True
+
+    def ingest(self, images: Dict[str, List[str]]) -> IngestReport:
+        """Hash, deduplicate and thumbnail the given images and update the manifest."""
+        report = IngestReport()
+        sources = [path for paths in images.values() for path in paths]
+        report.images = len(sources)
+        old_assets = self.manifest["assets"]
+        assets = {}
+        new_sources = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for relative_path, record, hashed in pool.map(self._source_record, sources):
+                if isinstance(record, Exception):
+                    report.errors.append(f"{relative_path}: {record}")
+                    continue
+                report.hashed += hashed
+                new_sources[relative_path] = record
+                digest = record["sha256"]
+                if digest in assets:
+                    report.duplicates += 1
+                    continue
+                entry = old_assets.get(digest)
+                if entry is None or not os.path.isfile(self._abs(entry["path"])):
+                    entry = self._store(relative_path, digest, report)
+                    if entry is None:
+                        continue
+                assets[digest] = entry
+
+            # Thumbnails are only made for sizes an asset doesn't have yet
+            jobs = [(digest, entry, size) for digest, entry in assets.items()
+                    for size in self._missing_sizes(digest, entry)]
+            for digest, size, result in pool.map(lambda job: self._thumbnail(*job), jobs):
+                if isinstance(result, Exception):
+                    report.errors.append(f"{assets[digest]['path']}: {result}")
+                    continue
+                assets[digest]["thumbnails"][str(size)] = result
+                report.thumbnails += 1
+
+        for digest, entry in old_assets.items():
+            if digest not in assets:
+                report.pruned += self._remove(entry)
+        self.manifest = {"version": MANIFEST_VERSION, "assets": assets, "sources": new_sources}
+        self.save_manifest()
+        return report
+
+    def _store(self, relative_path: str, digest: str, report: IngestReport) -> Optional[Dict]:
+        extension = _normalized_extension(relative_path)
+        path = self.asset_path(digest, extension)
+        try:
+            dimensions = _image_size(self._abs(relative_path))
+        except OSError as e:
+            report.errors.append(f"{relative_path}: {e}")
+            return None
+        os.makedirs(os.path.dirname(self._abs(path)), exist_ok=True)
+        with atomic_output(self._abs(path)) as tmp_path:
+            shutil.copyfile(self._abs(relative_path), tmp_path)
+        report.new_assets += 1
+        return {
+            "path": path,
+            "bytes": os.path.getsize(self._abs(path)),
+            "width": dimensions[0] if dimensions else None,
+            "height": dimensions[1] if dimensions else None,
+            "thumbnails": {}
+        }
+
+    def _thumbnail_path(self, digest: str, entry: Dict, size: int) -> str:
+        save_format = _SAVE_FORMATS[_normalized_extension(entry["path"])]
+        return self.asset_path(digest, _FORMAT_EXTENSIONS[save_format], size)
+
+    def _missing_sizes(self, digest: str, entry: Dict) -> List[int]:
+        if _normalized_extension(entry["path"]) not in _SAVE_FORMATS:
+            return []
+        missing = []
+        for size in self.sizes:
+            path = entry["thumbnails"].get(str(size))
+            # Also redo thumbnails stored under another name, like GIF thumbnails once named .gif
+            if (path is None or not os.path.isfile(self._abs(path))
+                    or path not in (entry["path"], self._thumbnail_path(digest, entry, size))):
+                missing.append(size)
+        return missing
+
+    def _thumbnail(self, digest: str, entry: Dict, size: int):
+        # Never upscale: images already this small use the original
+        if entry["width"] is not None and max(entry["width"], entry["height"]) <= size:
+            return digest, size, entry["path"]
+        path = self._thumbnail_path(digest, entry, size)
+        try:
+            _make_thumbnail(self._abs(entry["path"]), self._abs(path), size,
+                            _SAVE_FORMATS[_normalized_extension(entry["path"])])
+        except OSError as e:
+            return digest, size, e
+        old_path = entry["thumbnails"].get(str(size))
+        if old_path not in (None, path, entry["path"]) and os.path.isfile(self._abs(old_path)):
+            os.remove(self._abs(old_path))
+        return digest, size, path
+
+    def _remove(self, entry: Dict) -> int:
+        removed = 0
+        for path in {entry["path"], *entry["thumbnails"].values()}:
+            if os.path.isfile(self._abs(path)):
+                os.remove(self._abs(path))
+                removed += 1
+        return removed
+
+    def exercise_images(self, images: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Map each exercise folder to the store paths of its images, without duplicates."""
+        result = {}
+        for exercise_dir, paths in images.items():
+            store_paths = []
+            for path in paths:
+                source = self.manifest["sources"].get(path)
+                asset = self.manifest["assets"].get(source["sha256"]) if source else None
+                if asset and asset["path"] not in store_paths:
+                    store_paths.append(asset["path"])
+            result[exercise_dir] = store_paths
+        return result
+
+    def thumbnail(self, asset_path: str, size: int) -> str:
+        """Return the path of the smallest rendition at least ``size`` pixels wide (or the original)."""
+        digest = os.path.basename(asset_path).split('.')[0]
+        entry = self.manifest["assets"].get(digest)
+        if entry is None:
+            return asset_path
+        for available in sorted(int(s) for s in entry["thumbnails"]):
+            if available >= size:
+                return entry["thumbnails"][str(available)]
+        return entry["path"]
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Sequence, TextIO
+
+# Suffix of outputs that are still being written; never treated as complete
+PARTIAL_SUFFIX = '.part'
+
+
+def file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextmanager
+def atomic_output(path: str, suffix: str = PARTIAL_SUFFIX) -> Iterator[str]:
+    """Yield a temporary path to write ``path`` to, and publish it only on success.
+
+    The file is flushed to disk and renamed over ``path`` when the block
+    finishes; if it raises (or is interrupted), the partial file is removed.
+    Writers that may race for the same ``path`` must pass different suffixes.
+    """
+    tmp_path = path + suffix
+    try:
+        yield tmp_path
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class Checkpoint:
+    """An append-only journal of completed outputs.
+
+    Each line records a job's fingerprint and the size and SHA-256 of its
+    output. A job counts as done only while its output still matches, so
+    deleted, truncated or stale files are produced again. A line torn by a
+    crash is ignored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._entries[entry['job']] = entry
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def __len__(self):
+        return len(self._entries)
+
+    def is_complete(self, job_id: str, fingerprint: str, output_path: str) -> bool:
+        entry = self._entries.get(job_id)
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return False
+        try:
+            if os.path.getsize(output_path) != entry['size']:
+                return False
+        except OSError:
+            return False
+        return file_digest(output_path) == entry['sha256']
+
+    def record(self, job_id: str, fingerprint: str, output_path: str):
+        entry = {
+            'job': job_id,
+            'fingerprint': fingerprint,
+            'size': os.path.getsize(output_path),
+            'sha256': file_digest(output_path)
+        }
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._entries[job_id] = entry
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> 'Checkpoint':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BatchJob:
+    """One output file: ``render(path)`` writes it to the given path."""
+
+    def __init__(self, job_id: str, output_path: str, fingerprint: str, render: Callable[[str], None]):
+        self.job_id = job_id
+        self.output_path = output_path
+        self.fingerprint = fingerprint
+        self.render = render
+
+
+class BatchProgress:
+    """Counts and timing of a running batch."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.completed = 0
+        self.skipped = 0
+        self.cancelled = False
+        self.started = time.monotonic()
+
+    @property
+    def done(self) -> int:
+        return self.completed + self.skipped
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Outputs rendered per second; skipped jobs don't count."""
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until the batch is finished, once a rate is known."""
+        if not self.completed:
+            return None
+        return (self.total - self.done) / self.rate
+
+
+class BatchRunner:
+    """Run jobs in order, skipping those the checkpoint shows as complete.
+
+    Outputs are written through ``atomic_output`` and recorded only after
+    they are in place, so killing the run at any point leaves either a
+    complete, recorded file or nothing. Setting ``cancel_event`` stops the
+    run after the job in progress.
+    """
+
+    def __init__(self, checkpoint: Checkpoint, progress_callback: Callable[[BatchProgress], None] = None,
+                 cancel_event: threading.Event = None):
+        self.checkpoint = checkpoint
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event or threading.Event()
+
+    def run(self, jobs: Sequence[BatchJob]) -> BatchProgress:
+        progress = BatchProgress(len(jobs))
+        for job in jobs:
+            if self.cancel_event.is_set():
+                progress.cancelled = True
+                break
+            if self.checkpoint.is_complete(job.job_id, job.fingerprint, job.output_path):
+                progress.skipped += 1
+            else:
+                with atomic_output(job.output_path) as tmp_path:
+                    job.render(tmp_path)
+                self.checkpoint.record(job.job_id, job.fingerprint, job.output_path)
+                progress.completed += 1
+            if self.progress_callback:
+                self.progress_callback(progress)
+        return progress
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m" if hours else f"{minutes}m{seconds:02d}s"
+
+
+class ProgressBar:
+    """A one-line progress bar with rate and ETA, for use as a progress callback."""
+
+    def __init__(self, stream: TextIO = None, width: int = 30, interval: float = 0.2):
+        self.stream = stream or sys.stderr
+        self.width = width
+        self.interval = interval
+        self._last = 0.0
+
+    def __call__(self, progress: BatchProgress):
+        now = time.monotonic()
+        if progress.done < progress.total and now - self._last < self.interval:
+            return
+        self._last = now
+        filled = self.width * progress.done // max(progress.total, 1)
+        eta = progress.eta
+        self.stream.write(
+            f"\r[{'#' * filled}{'.' * (self.width - filled)}] {progress.done}/{progress.total}"
+            f"  {progress.rate:.1f}/s  ETA {_format_duration(eta) if eta is not None else '--'}"
+            f"  ({progress.skipped} skipped)"
+        )
+        if progress.done == progress.total:
+            self.stream.write("\n")
+        self.stream.flush()
@@ -0,0 +1,322 @@
+import hashlib
+import json
+import os
+import re
+import tarfile
+import threading
+import zipfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .batch import PARTIAL_SUFFIX, BatchJob, BatchProgress, file_digest
+
+INDEX_NAME = "index.jsonl"
+
+ARCHIVE_FORMATS = ("zip", "tar")
+
+
+def shard_path(course_id: str, levels: int = 2, width: int = 2) -> str:
+    """Subdirectory of a course, e.g. "3f/a9", from the hash of its id.
+
+    Two levels of 256 directories keep every directory small up to tens of
+    millions of documents.
+    """
+    digest = hashlib.sha256(course_id.encode('utf-8')).hexdigest()
+    return os.path.join(*(digest[level * width:(level + 1) * width] for level in range(levels)))
+
+
+def _fsync_directory(path: str):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class BulkIndex:
+    """Append-only JSONL index mapping course ids to where their document is.
+
+    Entries have ``course``, ``fingerprint``, ``size`` and ``sha256``, and
+    either ``path`` (a file under the output root) or ``archive`` and
+    ``member``. Later lines for a course replace earlier ones; a line torn
+    by a crash is ignored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.commits = 0
+        self._entries: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._entries[entry['course']] = entry
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self._entries.values())
+
+    def get(self, course_id: str) -> Optional[Dict]:
+        return self._entries.get(course_id)
+
+    def append(self, entries: Sequence[Dict]):
+        """Write entries and fsync once for all of them."""
+        if not entries:
+            return
+        self._file.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.commits += 1
+        for entry in entries:
+            self._entries[entry['course']] = entry
+
+    def close(self):
+        self._file.close()
+
+
+class OutputSink(ABC):
+    """Where a bulk run puts its documents, recorded in ``<root>/index.jsonl``.
+
+    ``add`` renders one document to a file on disk (never into memory) and
+    stores it. Index entries are only written once the document is durable,
+    so after a crash the index never points at a missing or torn document.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self.index = BulkIndex(os.path.join(root, INDEX_NAME))
+        self.fsyncs = 0
+
+    def is_complete(self, course_id: str, fingerprint: str) -> bool:
+        """True if the index has this course with the same fingerprint (and, for files, size)."""
+        entry = self.index.get(course_id)
+        if entry is None or entry.get('fingerprint') != fingerprint:
+            return False
+        if 'path' in entry:
+            try:
+                return os.path.getsize(os.path.join(self.root, entry['path'])) == entry['size']
+            except OSError:
+                return False
+        return os.path.exists(os.path.join(self.root, entry['archive']))
+
+    @abstractmethod
+    def add(self, course_id: str, member_name: str, render: Callable[[str], None], fingerprint: str = None):
+        """Render one course with ``render(path)`` and store it as ``member_name``."""
+
+    @abstractmethod
+    def flush(self):
+        """Make everything added so far durable and indexed."""
+
+    def close(self):
+        self.flush()
+        self.index.close()
+
+    def __enter__(self) -> 'OutputSink':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _fsync(self, path: str):
+        with open(path, 'rb') as f:
+            os.fsync(f.fileno())
+        self.fsyncs += 1
+
+
+class ShardedDirectorySink(OutputSink):
+    """Documents as plain files in hash-sharded subdirectories of ``root``.
+
+    Files are renamed into place as soon as they are rendered, but fsynced
+    (with their directories) and indexed in batches of ``fsync_every``.
+    """
+
+    def __init__(self, root: str, fsync_every: int = 64, levels: int = 2):
+        super().__init__(root)
+        self.fsync_every = fsync_every
+        self.levels = levels
+        self._pending: List[Tuple[Dict, str]] = []
+
+    def add(self, course_id: str, member_name: str, render: Callable[[str], None], fingerprint: str = None):
+        relative_path = os.path.join(shard_path(course_id, self.levels), member_name)
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + PARTIAL_SUFFIX
+        try:
+            render(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        entry = {
+            'course': course_id,
+            'fingerprint': fingerprint,
+            'path': relative_path,
+            'size': os.path.getsize(path),
+            'sha256': file_digest(path)
+        }
+        self._pending.append((entry, path))
+        if len(self._pending) >= self.fsync_every:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        directories = set()
+        for _, path in self._pending:
+            self._fsync(path)
+            directories.add(os.path.dirname(path))
+        for directory in directories:
+            _fsync_directory(directory)
+            self.fsyncs += 1
+        self.index.append([entry for entry, _ in self._pending])
+        self._pending = []
+
+
+class ArchiveSink(OutputSink):
+    """Documents streamed into rolling zip or tar archives of bounded size.
+
+    Archives are named ``<prefix>-00000.zip`` and so on, and are written
+    under a ``.part`` name. A new archive is started before a document
+    would take the current one past ``max_bytes`` (a single larger document
+    gets an archive of its own). An archive is fsynced, renamed and
+    indexed when it is finished, so a crash loses at most the archive being
+    written; a rerun starts after the last finished archive.
+    """
+
+    def __init__(self, root: str, archive_format: str = "zip", max_bytes: int = 256 * 1024 * 1024,
+                 prefix: str = "courses", compression: int = zipfile.ZIP_DEFLATED):
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format '{archive_format}'. Choose from: {', '.join(ARCHIVE_FORMATS)}")
+        super().__init__(root)
+        self.archive_format = archive_format
+        self.max_bytes = max_bytes
+        self.prefix = prefix
+        self.compression = compression
+        self.archives_written = 0
+        self._archive = None
+        self._archive_name = None
+        self._archive_bytes = 0
+        self._pending: List[Dict] = []
+        self._staging_path = os.path.join(root, f".staging{PARTIAL_SUFFIX}")
+        pattern = re.compile(rf'^{re.escape(prefix)}-(\d+)\.{archive_format}$')
+        numbers = [int(match.group(1)) for match in map(pattern.match, os.listdir(root)) if match]
+        self._next_number = max(numbers) + 1 if numbers else 0
+
+    def add(self, course_id: str, member_name: str, render: Callable[[str], None], fingerprint: str = None):
+        try:
+            render(self._staging_path)
+            size = os.path.getsize(self._staging_path)
+            # Tar pads every member to 512 bytes after a 512-byte header; zip headers are smaller
+            needed = size + 1024
+            if self._archive is not None and self._archive_bytes + needed > self.max_bytes:
+                self._finish_archive()
+            if self._archive is None:
+                self._open_archive()
+            digest = file_digest(self._staging_path)
+            if self.archive_format == "zip":
+                self._archive.write(self._staging_path, member_name)
+                self._archive_bytes = self._archive.fp.tell()
+            else:
+                self._archive.add(self._staging_path, member_name)
+                self._archive_bytes = self._archive.fileobj.tell()
+        finally:
+            if os.path.exists(self._staging_path):
+                os.remove(self._staging_path)
+        self._pending.append({
+            'course': course_id,
+            'fingerprint': fingerprint,
+            'archive': self._archive_name,
+            'member': member_name,
+            'size': size,
+            'sha256': digest
+        })
+
+    def flush(self):
+        """Finish the current archive; the next document starts a new one."""
+        if self._archive is not None:
+            self._finish_archive()
+
+    def _open_archive(self):
+        self._archive_name = f"{self.prefix}-{self._next_number:05d}.{self.archive_format}"
+        self._next_number += 1
+        part_path = os.path.join(self.root, self._archive_name + PARTIAL_SUFFIX)
+        if self.archive_format == "zip":
+            self._archive = zipfile.ZipFile(part_path, 'w', compression=self.compression)
+        else:
+            self._archive = tarfile.open(part_path, 'w')
+        self._archive_bytes = 0
+
+    def _finish_archive(self):
+        self._archive.close()
+        self._archive = None
+        path = os.path.join(self.root, self._archive_name)
+        self._fsync(path + PARTIAL_SUFFIX)
+        os.replace(path + PARTIAL_SUFFIX, path)
+        _fsync_directory(self.root)
+        self.fsyncs += 1
+        self.index.append(self._pending)
+        self._pending = []
+        self.archives_written += 1
+
+
+def create_sink(layout: str, root: str, max_bytes: int = 256 * 1024 * 1024) -> OutputSink:
+    """Sink for a bulk layout: "sharded", "zip" or "tar"."""
+    if layout == "sharded":
+        return ShardedDirectorySink(root)
+    return ArchiveSink(root, layout, max_bytes)
+
+
+@contextmanager
+def open_document(root: str, entry: Dict) -> Iterator[BinaryIO]:
+    """Open an indexed document for reading, from its file or its archive member."""
+    if 'path' in entry:
+        with open(os.path.join(root, entry['path']), 'rb') as f:
+            yield f
+    elif entry['archive'].endswith('.zip'):
+        with zipfile.ZipFile(os.path.join(root, entry['archive'])) as archive:
+            with archive.open(entry['member']) as f:
+                yield f
+    else:
+        with tarfile.open(os.path.join(root, entry['archive'])) as archive:
+            with archive.extractfile(entry['member']) as f:
+                yield f
+
+
+class BulkRunner:
+    """Run batch jobs into an output sink, skipping courses it already holds.
+
+    Like ``BatchRunner``, setting ``cancel_event`` stops after the job in
+    progress; whatever was added is flushed to the sink before returning.
+    """
+
+    def __init__(self, sink: OutputSink, progress_callback: Callable[[BatchProgress], None] = None,
+                 cancel_event: threading.Event = None):
+        self.sink = sink
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event or threading.Event()
+
+    def run(self, jobs: Sequence[BatchJob]) -> BatchProgress:
+        progress = BatchProgress(len(jobs))
+        try:
+            for job in jobs:
+                if self.cancel_event.is_set():
+                    progress.cancelled = True
+                    break
+                if self.sink.is_complete(job.job_id, job.fingerprint):
+                    progress.skipped += 1
+                else:
+                    self.sink.add(job.job_id, os.path.basename(job.output_path), job.render, job.fingerprint)
+                    progress.completed += 1
+                if self.progress_callback:
+                    self.progress_callback(progress)
+        finally:
+            self.sink.flush()
+        return progress
@@ -1,107 +1,230 @@
 import json
 import random
 import os
-from typing import List, Dict
-from .models import Exercise, Session, Course
+from typing import Dict, Iterator, List, Optional
+from .models import Session, Course, CourseSpec, StreamingCourse
+from .seeding import SeedSequence
+from .metrics import COURSES_GENERATED, EXERCISES_DROPPED, SESSIONS_PER_COURSE
+from .selection import SectionSelector, WeightedSectionSelector, alias_table
+from .snapshot import DataSnapshot
+from .storage import ExerciseStore, open_store
+from .validation import TemplateError, validate_templates
+
+# Bump whenever the same seed and data would give different sessions, so
+# archived courses refuse to restore into something else
+GENERATOR_VERSION = 1
+
+def section_weights(config: Dict, exercise_ids: List[str]) -> Optional[List[float]]:
+    """Weights of a section's exercises, or None when the section is sampled uniformly."""
+    weights = config.get('weights')
+    if not weights:
+        return None
+    return [float(weights.get(ex_id, 1.0)) for ex_id in exercise_ids]
 
 class CourseGenerator:
-    def __init__(self, vocabulary_path: str, templates_path: str):
+    def __init__(self, vocabulary_path: str, templates_path: str, seed: Optional[int] = None,
+                 no_repeat_window: int = 1):
         self.vocabulary_path = vocabulary_path
         self.templates_path = templates_path
-        self.exercise_vocabulary = self.load_vocabulary()
-        self.program_templates = self.load_templates()
+        # Days an exercise stays out of its section after being picked;
+        # templates can override it per section with "no_repeat_days"
+        self.no_repeat_window = no_repeat_window
+        # Instance stream, only used to draw seeds for calls that don't pass one
+        self.random = random.Random(seed)
+        # Vocabulary and templates live in one immutable snapshot that
+        # reload() replaces as a whole
+        self.snapshot = self.load_snapshot()
 
-    def load_vocabulary(self) -> Dict[str, Exercise]:
-        """Load the exercise vocabulary from a JSON file."""
-        with open(self.vocabulary_path, 'r') as f:
-            data = json.load(f)
+    @property
+    def exercise_vocabulary(self) -> ExerciseStore:
+        return self.snapshot.vocabulary
 
-        vocabulary = {}
-        for ex in data['exercises']:
-            exercise = Exercise(
-                exercise_id=ex['id'],
-                name=ex['name'],
-                description=ex['description'],
-                sets=ex['default_sets'],
-                reps=ex['default_reps'],
-                category=ex.get('category'),
-                difficulty=ex.get('difficulty'),
-                equipment=ex.get('equipment'),
-                primary_muscle_groups=ex.get('primary_muscle_groups', []),
-                image=ex.get('image')
-            )
-            vocabulary[ex['id']] = exercise
-        
-        return vocabulary
+    @exercise_vocabulary.setter
+    def exercise_vocabulary(self, vocabulary: ExerciseStore):
+        self.snapshot = self.snapshot.replace(vocabulary=vocabulary)
+
+    @property
+    def program_templates(self) -> Dict:
+        return self.snapshot.templates
+
+    @program_templates.setter
+    def program_templates(self, templates: Dict):
+        self.snapshot = self.snapshot.replace(templates=templates)
+
+    def load_snapshot(self, version: int = 1) -> DataSnapshot:
+        vocabulary, templates = self.load_vocabulary(), self.load_templates()
+        self.compile_weights(vocabulary, templates)
+        return DataSnapshot(vocabulary, templates, version)
+
+    @staticmethod
+    def compile_weights(vocabulary: ExerciseStore, templates: Dict):
+        """Build the alias tables of weighted sections now rather than on the first course."""
+        for template in templates.values():
+            sections = template['sections']
+            if not any(config.get('weights') for config in sections.values()):
+                continue
+            exercises = vocabulary.get_many(
+                ex_id for config in sections.values() for ex_id in config['exercise_ids'])
+            for config in sections.values():
+                known_ids = list(dict.fromkeys(ex_id for ex_id in config['exercise_ids'] if ex_id in exercises))
+                weights = section_weights(config, known_ids)
+                if weights and known_ids:
+                    alias_table(tuple(known_ids), tuple(weights))
+
+    def reload(self) -> DataSnapshot:
+        """Load and validate the data files again, then swap the new snapshot in.
+
+        Raises (and keeps the current snapshot) if either file is invalid.
+        Courses already being generated finish on the snapshot they started with.
+        """
+        snapshot = self.load_snapshot(self.snapshot.version + 1)
+        self.snapshot = snapshot
+        return snapshot
+
+    def load_vocabulary(self) -> ExerciseStore:
+        """Load the exercise vocabulary from a JSON file or an SQLite store.
+
+        Raises VocabularyError listing every invalid entry, not just the first.
+        """
+        return open_store(self.vocabulary_path)
 
     def load_templates(self) -> Dict:
-        """Load the program templates from a JSON file."""
+        """Load the program templates from a JSON file.
+
+        Raises TemplateError listing every structural problem.
+        """
         with open(self.templates_path, 'r') as f:
             data = json.load(f)
-        return data['program_templates']
+        templates = data.get('program_templates') if isinstance(data, dict) else None
+        issues = validate_templates(templates, source=os.path.basename(self.templates_path))
+        if issues:
+            raise TemplateError(issues)
+        return templates
 
-    def generate_course(self, name: str, days: int, template_name: str = "beginner_handstand") -> Course:
-        """Generate a course with progressive overload."""
-        course = Course(name, days)
-        
-        # Get the template
-        if template_name not in self.program_templates:
-            raise ValueError(f"Template '{template_name}' not found. Available: {list(self.program_templates.keys())}")
-        
-        template = self.program_templates[template_name]
-        sections_config = template['sections']
-        
+    def generate_course(self, name: str, days: int, template_name: str = "beginner_handstand",
+                        seed: Optional[int] = None, snapshot: Optional[DataSnapshot] = None) -> Course:
+        """Generate a course with progressive overload.
+
+        Each call uses its own random stream, seeded from ``seed`` (or from the
+        instance stream when omitted), so the same seed always yields the same
+        course and concurrent calls never share state.
+        """
+        seed = self._resolve_seed(seed)
+        course = Course(name, days, seed)
+        for session in self.iter_sessions(days, template_name, seed, snapshot):
+            course.add_session(session)
+        return course
+
+    def stream_course(self, name: str, days: int, template_name: str = "beginner_handstand",
+                      seed: Optional[int] = None) -> StreamingCourse:
+        """Return a course whose sessions are generated lazily, one day at a time.
+
+        The course stays on the data snapshot current when it was created,
+        even if the generator reloads before it is rendered.
+        """
+        snapshot = self.snapshot
+        self.get_template(template_name, snapshot)
+        seed = self._resolve_seed(seed)
+        return StreamingCourse(name, days, lambda: self.iter_sessions(days, template_name, seed, snapshot), seed)
+
+    def generate_from_spec(self, spec: CourseSpec, snapshot: Optional[DataSnapshot] = None) -> Course:
+        """Generate the course described by ``spec``."""
+        return self.generate_course(spec.name, spec.days, spec.template_name, spec.seed, snapshot)
+
+    def stream_from_spec(self, spec: CourseSpec) -> StreamingCourse:
+        """Stream the course described by ``spec``."""
+        return self.stream_course(spec.name, spec.days, spec.template_name, spec.seed)
+
+    @staticmethod
+    def assign_seeds(specs: List[CourseSpec], master_seed: int) -> List[CourseSpec]:
+        """Give every spec its own seed, spawned from one master seed.
+
+        Seeds depend only on the master seed and the spec's position, so a batch
+        can be split across any number of workers and still reproduce exactly.
+        """
+        children = SeedSequence(master_seed).spawn(len(specs))
+        return [spec.with_seed(child.generate_state()) for spec, child in zip(specs, children)]
+
+    def _resolve_seed(self, seed: Optional[int]) -> int:
+        return self.random.getrandbits(64) if seed is None else seed
+
+    def get_template(self, template_name: str, snapshot: Optional[DataSnapshot] = None) -> Dict:
+        """Look up a program template by name."""
+        templates = (snapshot or self.snapshot).templates
+        if template_name not in templates:
+            raise ValueError(f"Template '{template_name}' not found. Available: {list(templates.keys())}")
+        return templates[template_name]
+
+    def iter_sessions(self, days: int, template_name: str = "beginner_handstand",
+                      seed: Optional[int] = None, snapshot: Optional[DataSnapshot] = None) -> Iterator[Session]:
+        """Yield the sessions of a course with progressive overload, one day at a time."""
+        # Pin the snapshot now, so a reload mid-course can't mix data versions
+        snapshot = snapshot or self.snapshot
+        template = self.get_template(template_name, snapshot)
+        return self.iter_template_sessions(days, template, seed, snapshot)
+
+    def iter_template_sessions(self, days: int, template: Dict, seed: Optional[int] = None,
+                               snapshot: Optional[DataSnapshot] = None) -> Iterator[Session]:
+        """Yield sessions for a template given as a dict, e.g. one filtered per user."""
+        rng = random.Random(self._resolve_seed(seed))
+        vocabulary = (snapshot or self.snapshot).vocabulary
+        return self._iter_sessions(days, template['sections'], rng, template.get('name', 'custom'), vocabulary)
+
+    def _iter_sessions(self, days: int, sections_config: Dict, rng: random.Random,
+                       template_label: str, vocabulary: ExerciseStore) -> Iterator[Session]:
         # Define the sections in the order they should appear in each session
         sections = ["Warmup", "Prehab", "Shoulder Opener", "Handstand", "Conditioning", "Stretching"]
         
+        # Fetch only the exercises this template uses, in one lookup
+        exercises = vocabulary.get_many(
+            ex_id for config in sections_config.values() for ex_id in config['exercise_ids'])
+        
+        # One selector per section, over the exercises that exist, with its
+        # exercise count bounds
+        selectors = {}
+        dropped = 0
+        for section in sections:
+            if section in sections_config:
+                config = sections_config[section]
+                known_ids = [ex_id for ex_id in config['exercise_ids'] if ex_id in exercises]
+                dropped += len(config['exercise_ids']) - len(known_ids)
+                window = config.get('no_repeat_days', self.no_repeat_window)
+                # Weighted sections draw from alias tables; the others rotate evenly
+                weights = section_weights(config, known_ids)
+                if weights and known_ids:
+                    selector = WeightedSectionSelector(known_ids, weights, rng, window)
+                else:
+                    selector = SectionSelector(known_ids, rng, window)
+                selectors[section] = (selector, config.get('min_exercises', 1), config.get('max_exercises', 2))
+        if dropped:
+            EXERCISES_DROPPED.inc(dropped)
+        
         for day in range(1, days + 1):
             session_sections = {}
             
-            for section in sections:
-                if section in sections_config:
-                    config = sections_config[section]
-                    exercise_ids = config['exercise_ids']
-                    min_ex = config.get('min_exercises', 1)
-                    max_ex = config.get('max_exercises', 2)
-                    
-                    # Select random number of exercises
-                    num_exercises = min(len(exercise_ids), random.randint(min_ex, max_ex))
-                    selected_ids = random.sample(exercise_ids, num_exercises)
+            # Calculate the progression factor
+            progression = 1 + (day - 1) / days * 0.5  # Up to 50% increase by the end
+            
+            for section, (selector, min_ex, max_ex) in selectors.items():
+                # Select random number of exercises, avoiding recently used ones
+                selected_ids = selector.pick(rng.randint(min_ex, max_ex))
+                
+                # Apply progressive overload: increase sets and reps as the course progresses
+                modified_exercises = []
+                for ex_id in selected_ids:
+                    base_ex = exercises[ex_id]
                     
-                    # Apply progressive overload: increase sets and reps as the course progresses
-                    modified_exercises = []
-                    for ex_id in selected_ids:
-                        if ex_id not in self.exercise_vocabulary:
-                            continue
-                        
-                        base_ex = self.exercise_vocabulary[ex_id]
-                        
-                        # Calculate the progression factor
-                        progression = 1 + (day - 1) / days * 0.5  # Up to 50% increase by the end
-                        
-                        # Create a new exercise with modified sets
-                        new_sets = max(1, int(base_ex.sets * progression))
-                        
-                        modified_ex = Exercise(
-                            exercise_id=base_ex.exercise_id,
-                            name=base_ex.name,
-                            description=base_ex.description,
-                            sets=new_sets,
-                            category=base_ex.category,
-                            reps=base_ex.reps,
-                            difficulty=base_ex.difficulty,
-                            equipment=base_ex.equipment,
-                            primary_muscle_groups=base_ex.primary_muscle_groups,
-                            image=base_ex.image
-                        )
-                        modified_exercises.append(modified_ex)
+                    # Create a new exercise with modified sets
+                    new_sets = max(1, int(base_ex.sets * progression))
                     
-                    session_sections[section] = modified_exercises
-            
-            session = Session(f"Day {day}", session_sections)
-            course.add_session(session)
+                    modified_exercises.append(base_ex.with_sets(new_sets))
+                
+                session_sections[section] = modified_exercises
         
-        return course
+            yield Session(f"Day {day}", session_sections)
+        
+        COURSES_GENERATED.labels(template=template_label).inc()
+        SESSIONS_PER_COURSE.observe(days)
 
     def save_course_to_json(self, course: Course, output_path: str):
         """Save the course to a JSON file."""
@@ -0,0 +1,189 @@
+import bisect
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Prometheus' default latency buckets, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    if not labels:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"'))
+        for name, value in labels
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+class _Metric:
+    type_name = None
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], '_Metric'] = {}
+
+    def labels(self, *values, **kwargs) -> '_Metric':
+        """Return the child metric for one combination of label values."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> '_Metric':
+        return type(self)(self.name, self.help_text)
+
+    def _series(self) -> List[Tuple[Tuple[Tuple[str, str], ...], '_Metric']]:
+        if not self.labelnames:
+            return [((), self)]
+        return [(tuple(zip(self.labelnames, key)), child) for key, child in sorted(self._children.items())]
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+        for labels, metric in self._series():
+            lines.extend(metric._render_samples(labels))
+        return lines
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    type_name = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self.value = 0
+
+    def inc(self, amount: float = 1):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        with self._lock:
+            self.value += amount
+
+    def _render_samples(self, labels):
+        return [f"{self.name}{_format_labels(labels)} {_format_value(self.value)}"]
+
+
+class Histogram(_Metric):
+    """Counts observations into cumulative buckets."""
+
+    type_name = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def _new_child(self) -> 'Histogram':
+        return Histogram(self.name, self.help_text, buckets=self.buckets)
+
+    def observe(self, value: float):
+        # Per-bucket counts; made cumulative only when rendering
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def _render_samples(self, labels):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self._counts):
+            cumulative += count
+            bucket_labels = tuple(labels) + (('le', _format_value(bound)),)
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(self.sum)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Process-wide collection of metrics, exported in Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric_class, name, help_text, **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, help_text, **kwargs)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.type_name}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames=labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames=labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render a snapshot of every metric in Prometheus text format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path: str):
+        """Write a snapshot for node_exporter's textfile collector, or stdout for '-'.
+
+        The file is replaced atomically so the collector never reads a
+        partial snapshot.
+        """
+        text = self.render()
+        if path == '-':
+            sys.stdout.write(text)
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
+
+COURSES_GENERATED = REGISTRY.counter(
+    'handstand_courses_generated_total', 'Courses fully generated.', ['template'])
+SESSIONS_PER_COURSE = REGISTRY.histogram(
+    'handstand_course_sessions', 'Sessions per generated course.',
+    buckets=(7, 14, 21, 30, 60, 90, 180, 365, 730))
+EXERCISES_DROPPED = REGISTRY.counter(
+    'handstand_exercises_dropped_total', 'Template exercise ids skipped because they are not in the vocabulary.')
+DOCUMENTS_RENDERED = REGISTRY.counter(
+    'handstand_documents_rendered_total', 'Course documents written.', ['format'])
+PDF_PAGES = REGISTRY.counter(
+    'handstand_pdf_pages_total', 'Pages in rendered PDFs.')
+BYTES_WRITTEN = REGISTRY.counter(
+    'handstand_bytes_written_total', 'Bytes of course documents written.', ['format'])
+RENDER_SECONDS = REGISTRY.histogram(
+    'handstand_render_seconds', 'Time to render one course document.', ['format'])
@@ -1,5 +1,9 @@
 import json
-from typing import List, Dict, Optional
+import textwrap
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+from .metrics import BYTES_WRITTEN, DOCUMENTS_RENDERED, RENDER_SECONDS
+from .prescription import Prescription, parse_reps
 
 class Exercise:
     def __init__(self, name: str, description: str, sets: int, reps: str, 
@@ -17,6 +21,28 @@ class Exercise:
         self.primary_muscle_groups = primary_muscle_groups or []
         self.image = image
 
+    @property
+    def reps(self) -> str:
+        return self._reps
+
+    @reps.setter
+    def reps(self, reps: str):
+        self._reps = reps
+        # Parsed when the vocabulary loads (once per distinct text), and again whenever reps change
+        self._prescription = parse_reps(reps)
+
+    @property
+    def prescription(self) -> Prescription:
+        """Structured reps, kept in step with ``reps``."""
+        return self._prescription
+
+    def with_sets(self, sets: int) -> 'Exercise':
+        """Return a copy with a different number of sets, without parsing anything again."""
+        copy = Exercise.__new__(Exercise)
+        copy.__dict__.update(self.__dict__)
+        copy.sets = sets
+        return copy
+
     def to_dict(self):
         return {
             "exercise_id": self.exercise_id,
@@ -42,23 +68,119 @@ class Session:
             "sections": {section: [ex.to_dict() for ex in exercises] for section, exercises in self.sections.items()}
         }
 
+class CourseSpec:
+    """Everything needed to (re)generate one course deterministically."""
+
+    def __init__(self, name: str, days: int, template_name: str = "beginner_handstand",
+                 seed: Optional[int] = None):
+        self.name = name
+        self.days = days
+        self.template_name = template_name
+        self.seed = seed
+
+    def with_seed(self, seed: int) -> 'CourseSpec':
+        return CourseSpec(self.name, self.days, self.template_name, seed)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "days": self.days,
+            "template_name": self.template_name,
+            "seed": self.seed
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CourseSpec':
+        return cls(
+            name=data['name'],
+            days=int(data['days']),
+            template_name=data.get('template_name', "beginner_handstand"),
+            seed=data.get('seed')
+        )
+
+
 class Course:
-    def __init__(self, name: str, days: int):
+    def __init__(self, name: str, days: int, seed: Optional[int] = None):
         self.name = name
         self.days = days
+        self.seed = seed
         self.sessions: List[Session] = []
 
     def add_session(self, session: Session):
         self.sessions.append(session)
 
+    def iter_sessions(self) -> Iterator[Session]:
+        """Iterate over the sessions of the course, one day at a time."""
+        return iter(self.sessions)
+
     def to_dict(self):
         return {
             "name": self.name,
             "days": self.days,
-            "sessions": [session.to_dict() for session in self.sessions]
+            "sessions": [session.to_dict() for session in self.iter_sessions()]
         }
 
     def to_json(self, filename: str):
+        """Write the course to a JSON file, serializing one session at a time."""
+        start = time.perf_counter()
         with open(filename, 'w') as f:
-            json.dump(self.to_dict(), f, indent=4)
+            self.write_json(f)
+            size = f.tell()
+        RENDER_SECONDS.labels(format='json').observe(time.perf_counter() - start)
+        DOCUMENTS_RENDERED.labels(format='json').inc()
+        BYTES_WRITTEN.labels(format='json').inc(size)
+
+    def write_json(self, f):
+        """Stream the course as indented JSON to an open text file.
+
+        The output is identical to ``json.dump(self.to_dict(), f, indent=4)``,
+        but only one session is held in memory at a time.
+        """
+        f.write('{\n')
+        f.write(f'    "name": {json.dumps(self.name)},\n')
+        f.write(f'    "days": {json.dumps(self.days)},\n')
+        f.write('    "sessions": [')
+        empty = True
+        for session in self.iter_sessions():
+            f.write('\n' if empty else ',\n')
+            f.write(textwrap.indent(json.dumps(session.to_dict(), indent=4), ' ' * 8))
+            empty = False
+        f.write(']\n}' if empty else '\n    ]\n}')
+
+
+class StreamingCourse(Course):
+    """A course whose sessions are produced lazily instead of stored.
+
+    ``session_source`` is called each time the sessions are iterated, so the
+    generator, the JSON writer and the PDF renderer only ever hold one day
+    in memory. There is no ``sessions`` list to read or append to.
+    """
+
+    def __init__(self, name: str, days: int, session_source: Callable[[], Iterator[Session]],
+                 seed: Optional[int] = None):
+        # Not Course.__init__, which would assign the sessions list
+        self.name = name
+        self.days = days
+        self.seed = seed
+        self.session_source = session_source
+
+    @property
+    def sessions(self) -> List[Session]:
+        # TypeError, not AttributeError: hasattr() and getattr(course, "sessions", [])
+        # would swallow that and see a course without sessions
+        raise TypeError("A StreamingCourse stores no sessions; "
+                        "iterate iter_sessions() or call materialize() for an in-memory Course")
+
+    def add_session(self, session: Session):
+        raise TypeError("A StreamingCourse generates its sessions; call materialize() to get a Course you can add to")
+
+    def iter_sessions(self) -> Iterator[Session]:
+        return self.session_source()
+
+    def materialize(self) -> Course:
+        """Generate every session and return a regular, in-memory course."""
+        course = Course(self.name, self.days, self.seed)
+        for session in self.iter_sessions():
+            course.add_session(session)
+        return course
 
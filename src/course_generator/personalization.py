@@ -0,0 +1,196 @@
+import csv
+import copy
+import hashlib
+import json
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from .generator import CourseGenerator
+from .models import Course, Exercise, Session
+from .seeding import SeedSequence
+
+# Levels users pick, mapped to the program template that serves them
+LEVEL_TEMPLATES = {
+    "beginner": "beginner_handstand",
+    "intermediate": "intermediate_handstand",
+    "advanced": "advanced_handstand"
+}
+
+# Equipment everyone is assumed to have
+ALWAYS_AVAILABLE = {"none", "floor", "open space"}
+
+
+def parse_equipment(equipment: Optional[str]) -> List[FrozenSet[str]]:
+    """Parse an exercise's free-text equipment into requirements.
+
+    ``"wall, yoga mat"`` needs both items, ``"wall or bar"`` needs either,
+    and anything marked ``optional`` needs nothing.
+    """
+    requirements = []
+    for part in (equipment or "none").lower().split(","):
+        part = part.strip()
+        if not part or part.endswith("optional"):
+            continue
+        alternatives = frozenset(alt.strip() for alt in part.split(" or "))
+        if not alternatives & ALWAYS_AVAILABLE:
+            requirements.append(alternatives)
+    return requirements
+
+
+def _split_list(value) -> List[str]:
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        value = value.replace("|", ";").split(";")
+    return [item.strip().lower() for item in value if item.strip()]
+
+
+class UserProfile:
+    """A single user's course request."""
+
+    def __init__(self, user_id: str, course_name: str, level: str = "beginner", days: int = 21,
+                 equipment: Optional[List[str]] = None,
+                 excluded_muscle_groups: Optional[List[str]] = None):
+        if level not in LEVEL_TEMPLATES:
+            raise ValueError(f"Unknown level '{level}' for user '{user_id}'. Available: {list(LEVEL_TEMPLATES)}")
+        self.user_id = user_id
+        self.course_name = course_name
+        self.level = level
+        self.days = days
+        # None means "no equipment restriction"
+        self.equipment = None if equipment is None else frozenset(equipment)
+        self.excluded_muscle_groups = frozenset(excluded_muscle_groups or [])
+
+    @property
+    def template_name(self) -> str:
+        return LEVEL_TEMPLATES[self.level]
+
+    def template_key(self) -> Tuple:
+        """Key shared by all profiles that filter the template the same way."""
+        equipment = None if self.equipment is None else tuple(sorted(self.equipment))
+        return (self.template_name, equipment, tuple(sorted(self.excluded_muscle_groups)))
+
+    def course_key(self) -> Tuple:
+        """Key shared by all profiles that get the same course structure."""
+        return self.template_key() + (self.days,)
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form that ``from_dict`` reads back."""
+        return {
+            'user_id': self.user_id,
+            'course_name': self.course_name,
+            'level': self.level,
+            'days': self.days,
+            'equipment': None if self.equipment is None else sorted(self.equipment),
+            'excluded_muscle_groups': sorted(self.excluded_muscle_groups)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'UserProfile':
+        equipment = data.get('equipment')
+        return cls(
+            user_id=str(data['user_id']),
+            course_name=data.get('course_name') or data.get('name') or f"{data.get('days', 21)}-Day Handstand Challenge",
+            level=(data.get('level') or "beginner").strip().lower(),
+            days=int(data.get('days') or 21),
+            equipment=None if equipment is None or equipment == "" else _split_list(equipment),
+            excluded_muscle_groups=_split_list(data.get('excluded_muscle_groups'))
+        )
+
+
+def load_profiles(path: str) -> Iterator[UserProfile]:
+    """Stream user profiles from a CSV or JSONL file.
+
+    CSV list columns (``equipment``, ``excluded_muscle_groups``) are separated
+    with ``;`` or ``|``; an empty ``equipment`` cell means no restriction.
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            for row in csv.DictReader(f):
+                yield UserProfile.from_dict(row)
+        else:
+            for line in f:
+                if line.strip():
+                    yield UserProfile.from_dict(json.loads(line))
+
+
+class MassPersonalizer:
+    """Generate courses for many users, sharing work between equivalent profiles.
+
+    Filtered templates are computed once per (level, equipment, exclusions)
+    and course structures once per filtered template and length. Each user
+    then only gets a copy of those sessions that carries their own course
+    name, so editing one user's course never changes another's.
+    """
+
+    def __init__(self, generator: CourseGenerator, master_seed: int = 0):
+        self.generator = generator
+        self.master_seed = master_seed
+        self._templates: Dict[Tuple, Dict] = {}
+        self._courses: Dict[Tuple, Course] = {}
+        self.profiles_seen = 0
+
+    @property
+    def distinct_templates(self) -> int:
+        return len(self._templates)
+
+    @property
+    def distinct_courses(self) -> int:
+        return len(self._courses)
+
+    def filtered_template(self, profile: UserProfile) -> Dict:
+        """Return the profile's template with unusable exercises removed."""
+        key = profile.template_key()
+        if key not in self._templates:
+            template = copy.deepcopy(self.generator.get_template(profile.template_name))
+            exercises = self.generator.exercise_vocabulary.get_many(
+                ex_id for config in template['sections'].values() for ex_id in config['exercise_ids'])
+            for config in template['sections'].values():
+                config['exercise_ids'] = [
+                    ex_id for ex_id in config['exercise_ids']
+                    if self._allowed(exercises.get(ex_id), profile)
+                ]
+            self._templates[key] = template
+        return self._templates[key]
+
+    def course_for(self, profile: UserProfile) -> Course:
+        """Return the shared course structure for the profile's group."""
+        key = profile.course_key()
+        if key not in self._courses:
+            template = self.filtered_template(profile)
+            seed = self.seed_for(key)
+            course = Course(profile.course_name, profile.days, seed)
+            for session in self.generator.iter_template_sessions(profile.days, template, seed):
+                course.add_session(session)
+            self._courses[key] = course
+        return self._courses[key]
+
+    def seed_for(self, course_key: Tuple) -> int:
+        """Derive a group's seed from the master seed and the group itself, not arrival order."""
+        digest = hashlib.blake2b(json.dumps(course_key).encode('utf-8'), digest_size=8).digest()
+        return SeedSequence(self.master_seed).child(int.from_bytes(digest, 'big')).generate_state()
+
+    def personalize(self, profile: UserProfile) -> Course:
+        """Return the user's course, copied from their group's so edits stay with this user."""
+        self.profiles_seen += 1
+        shared = self.course_for(profile)
+        course = Course(profile.course_name, shared.days, shared.seed)
+        course.sessions = [
+            Session(session.name, {section: [copy.copy(exercise) for exercise in exercises]
+                                   for section, exercises in session.sections.items()})
+            for session in shared.sessions
+        ]
+        return course
+
+    def personalize_all(self, profiles: Iterable[UserProfile]) -> Iterator[Tuple[UserProfile, Course]]:
+        for profile in profiles:
+            yield profile, self.personalize(profile)
+
+    @staticmethod
+    def _allowed(exercise: Optional[Exercise], profile: UserProfile) -> bool:
+        if exercise is None:
+            return False
+        if profile.excluded_muscle_groups & {m.lower() for m in exercise.primary_muscle_groups}:
+            return False
+        if profile.equipment is None:
+            return True
+        return all(alternatives & profile.equipment for alternatives in parse_equipment(exercise.equipment))
@@ -0,0 +1,80 @@
+import functools
+import re
+from typing import NamedTuple, Optional
+
+# Units that are durations, with their length in seconds
+_TIME_UNITS = {'second': 1, 'seconds': 1, 'sec': 1, 'secs': 1, 's': 1,
+               'minute': 60, 'minutes': 60, 'min': 60, 'mins': 60}
+
+_NUMBER = re.compile(r'^\s*(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?')
+_PARENTHESES = re.compile(r'\([^)]*\)')
+# "5 steps (3 repeats)": the whole prescription is done that many times
+_REPEATS = re.compile(r'\(\s*(\d+)\s*(?:x|times|repeats?|rounds?)\s*\)')
+# "each side", "each leg", "per arm", ... every one doubles the work
+_PER_SIDE = re.compile(r'\b(?:each|per)\s+(\w+)')
+
+
+class Prescription(NamedTuple):
+    """A parsed ``reps`` value such as "8-12 reps each side" or "30 seconds".
+
+    ``unit`` is "seconds" for durations and "reps" for anything counted
+    (reps, repeats, circles, steps, ...); ``label`` keeps the original noun.
+    ``sides`` is how many times the quantity is done: 2 for "each side",
+    4 for "each direction per arm". ``repeats`` multiplies it again for a
+    count in parentheses, as in "5 steps (3 repeats)"; other parenthesized
+    notes, like "(with 3 sec hold)", are ignored. Unparseable text has no
+    quantity.
+    """
+
+    quantity_min: Optional[float]
+    quantity_max: Optional[float]
+    unit: str
+    sides: int
+    label: str
+    repeats: int = 1
+
+    @property
+    def quantity(self) -> float:
+        """Midpoint of the prescribed range, or 0 when there is none."""
+        if self.quantity_min is None:
+            return 0.0
+        return (self.quantity_min + self.quantity_max) / 2
+
+    @property
+    def per_side(self) -> bool:
+        return self.sides > 1
+
+    @property
+    def times(self) -> int:
+        """How many times the quantity is done in one set."""
+        return self.sides * self.repeats
+
+    @property
+    def is_time(self) -> bool:
+        return self.unit == 'seconds'
+
+
+@functools.lru_cache(maxsize=None)
+def parse_reps(text: str) -> Prescription:
+    """Parse a free-text reps value; each distinct text is parsed once per process."""
+    lowered = (text or '').lower()
+    repeats = 1
+    for count in _REPEATS.findall(lowered):
+        repeats *= int(count)
+    cleaned = _PARENTHESES.sub(' ', lowered)
+    match = _NUMBER.match(cleaned)
+    if match is None:
+        return Prescription(None, None, 'reps', 1, cleaned.strip())
+
+    low = float(match.group(1))
+    high = float(match.group(2)) if match.group(2) else low
+    rest = cleaned[match.end():]
+    sides = 2 ** len(_PER_SIDE.findall(rest))
+    words = _PER_SIDE.sub(' ', rest).replace('total', ' ').split()
+
+    label = ' '.join(words)
+    unit = 'reps'
+    if words and words[0] in _TIME_UNITS:
+        scale = _TIME_UNITS[words[0]]
+        low, high, unit = low * scale, high * scale, 'seconds'
+    return Prescription(low, high, unit, sides, label or 'reps', repeats)
@@ -0,0 +1,103 @@
+import json
+import linecache
+import os
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, List
+
+# Allocations made by the profiler and the import machinery are noise
+_IGNORED = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, linecache.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+class AllocationProfiler:
+    """Measure memory per pipeline stage with tracemalloc.
+
+    Each ``with profiler.stage(name):`` block records the peak traced memory
+    reached inside it, the memory it left allocated, and the source lines
+    that allocated the most while it ran.
+    """
+
+    def __init__(self, top: int = 10, frames: int = 1):
+        self.top = top
+        self.frames = frames
+        self.stages: List[Dict] = []
+
+    def __enter__(self) -> 'AllocationProfiler':
+        # Trace across all stages, so memory kept from earlier stages counts
+        tracemalloc.start(self.frames)
+        return self
+
+    def __exit__(self, *exc_info):
+        tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str):
+        started_here = not tracemalloc.is_tracing()
+        if started_here:
+            tracemalloc.start(self.frames)
+        before = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+        # Only now, so the peak of building that snapshot isn't counted
+        tracemalloc.reset_peak()
+        start_current, _ = tracemalloc.get_traced_memory()
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot().filter_traces(_IGNORED)
+            self.stages.append({
+                "stage": name,
+                "seconds": round(elapsed, 6),
+                "peak_bytes": peak,
+                "peak_increase_bytes": peak - start_current,
+                "retained_bytes": current - start_current,
+                "top_allocations": self._top_sites(after.compare_to(before, 'lineno'))
+            })
+            if started_here:
+                tracemalloc.stop()
+
+    def _top_sites(self, differences) -> List[Dict]:
+        sites = []
+        for stat in differences[:self.top]:
+            frame = stat.traceback[0]
+            sites.append({
+                "file": os.path.relpath(frame.filename) if not frame.filename.startswith('<') else frame.filename,
+                "line": frame.lineno,
+                "size_bytes": stat.size,
+                "size_diff_bytes": stat.size_diff,
+                "count_diff": stat.count_diff
+            })
+        return sites
+
+    def report(self) -> Dict:
+        """Return a machine-readable report that can be compared across releases."""
+        return {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "stages": self.stages,
+            "overall_peak_bytes": max((s["peak_bytes"] for s in self.stages), default=0)
+        }
+
+    def write_json(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=4)
+
+    def format_text(self) -> str:
+        lines = []
+        for stage in self.stages:
+            lines.append(
+                f"{stage['stage']}: peak {stage['peak_bytes'] / 1024:.1f} KiB "
+                f"(+{stage['peak_increase_bytes'] / 1024:.1f} KiB), "
+                f"retained {stage['retained_bytes'] / 1024:+.1f} KiB, {stage['seconds'] * 1000:.1f} ms"
+            )
+            for site in stage["top_allocations"][:5]:
+                lines.append(f"    {site['size_diff_bytes'] / 1024:+9.1f} KiB  {site['file']}:{site['line']}")
+        return "\n".join(lines)
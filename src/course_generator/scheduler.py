@@ -0,0 +1,186 @@
+import asyncio
+import collections
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Deque, Dict, Optional
+
+from .metrics import REGISTRY
+
+# Priority classes, highest first, with the number of jobs each may queue
+DEFAULT_QUEUE_SIZES = {"interactive": 32, "batch": 256}
+
+# Finer than the default buckets at the low end, where interactive waits should be
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    'handstand_scheduler_wait_seconds', 'Time jobs spend queued before a worker starts them.',
+    ['priority'], buckets=WAIT_BUCKETS)
+SCHEDULER_JOBS = REGISTRY.counter(
+    'handstand_scheduler_jobs_total', 'Scheduled jobs by how they ended.', ['priority', 'outcome'])
+
+
+class _Job:
+    __slots__ = ('priority', 'fn', 'args', 'future', 'queued')
+
+    def __init__(self, priority: str, fn: Callable, args: tuple, future: asyncio.Future):
+        self.priority = priority
+        self.fn = fn
+        self.args = args
+        self.future = future
+        self.queued = time.monotonic()
+
+
+class PriorityStats:
+    """Counts and recent queue waits of one priority class."""
+
+    def __init__(self, window: int):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.running = 0
+        self.waits: Deque[float] = collections.deque(maxlen=window)
+
+    def wait_percentile(self, percent: float) -> float:
+        if not self.waits:
+            return 0.0
+        waits = sorted(self.waits)
+        return waits[min(len(waits) - 1, int(len(waits) * percent / 100))]
+
+
+class JobScheduler:
+    """Run blocking jobs on an executor in priority order, from asyncio code.
+
+    Each priority class (``queue_sizes`` maps them, highest first, to their
+    queue size) has a bounded queue; ``submit`` waits while its class's
+    queue is full, which pushes back on the submitter instead of growing
+    memory. One dispatcher per worker hands the executor a job only when
+    a worker is free, always from the highest class with work waiting, so
+    a long batch never holds up an interactive job by more than the job
+    already running on each worker.
+
+    A job's ``timeout`` counts from when it is submitted, including any wait
+    for room in a full queue. A job that times out while queued never runs; one that times out while running can't be
+    stopped in its worker process, so it finishes and its result is
+    dropped.
+    """
+
+    def __init__(self, executor: Executor, workers: int, queue_sizes: Dict[str, int] = None,
+                 window: int = 1000):
+        self.executor = executor
+        self.workers = workers
+        self.queue_sizes = dict(queue_sizes or DEFAULT_QUEUE_SIZES)
+        self.priorities = list(self.queue_sizes)
+        self.stats = {priority: PriorityStats(window) for priority in self.priorities}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._available: Optional[asyncio.Semaphore] = None
+        self._dispatchers = []
+
+    async def __aenter__(self) -> 'JobScheduler':
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def start(self):
+        """Start the dispatchers; needs a running event loop."""
+        self._queues = {priority: asyncio.Queue(size) for priority, size in self.queue_sizes.items()}
+        # Counts queued jobs across all classes
+        self._available = asyncio.Semaphore(0)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def close(self):
+        """Wait for every queued job to finish, then stop the dispatchers."""
+        for queue in self._queues.values():
+            await queue.join()
+        for dispatcher in self._dispatchers:
+            dispatcher.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+
+    async def submit(self, priority: str, fn: Callable, *args, timeout: float = None) -> Any:
+        """Queue ``fn(*args)`` and return its result.
+
+        Raises ``asyncio.TimeoutError`` if it hasn't finished ``timeout``
+        seconds after being submitted, and whatever ``fn`` raised if it failed.
+        """
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority '{priority}'. Choose from: {', '.join(self.priorities)}")
+        job = _Job(priority, fn, args, asyncio.get_running_loop().create_future())
+
+        async def queue_and_wait():
+            await self._queues[priority].put(job)
+            job.queued = time.monotonic()
+            self.stats[priority].submitted += 1
+            self._available.release()
+            return await job.future
+
+        try:
+            # One deadline for waiting for room and for the result. On timeout
+            # wait_for cancels the job's future, which tells the dispatcher to drop it
+            return await asyncio.wait_for(queue_and_wait(), timeout)
+        except asyncio.TimeoutError:
+            self.stats[priority].timed_out += 1
+            SCHEDULER_JOBS.labels(priority, 'timeout').inc()
+            raise
+
+    def queue_depths(self) -> Dict[str, int]:
+        return {priority: queue.qsize() for priority, queue in self._queues.items()}
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Depth, running and finished counts and recent queue waits per class, as plain values."""
+        depths = self.queue_depths()
+        return {
+            priority: {
+                "depth": depths.get(priority, 0),
+                "running": stats.running,
+                "submitted": stats.submitted,
+                "completed": stats.completed,
+                "failed": stats.failed,
+                "timed_out": stats.timed_out,
+                "wait_p50": stats.wait_percentile(50),
+                "wait_p95": stats.wait_percentile(95),
+                "wait_max": max(stats.waits, default=0.0)
+            }
+            for priority, stats in self.stats.items()
+        }
+
+    def _next_job(self) -> _Job:
+        for priority in self.priorities:
+            queue = self._queues[priority]
+            if not queue.empty():
+                return queue.get_nowait()
+        raise RuntimeError("A job was announced but no queue has one")
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._available.acquire()
+            job = self._next_job()
+            stats = self.stats[job.priority]
+            try:
+                if job.future.done():
+                    # Timed out or cancelled while queued
+                    continue
+                wait = time.monotonic() - job.queued
+                stats.waits.append(wait)
+                QUEUE_WAIT_SECONDS.labels(job.priority).observe(wait)
+                stats.running += 1
+                try:
+                    result = await loop.run_in_executor(self.executor, job.fn, *job.args)
+                except Exception as e:
+                    # A job that already timed out was counted as such
+                    if not job.future.done():
+                        stats.failed += 1
+                        SCHEDULER_JOBS.labels(job.priority, 'failed').inc()
+                        job.future.set_exception(e)
+                else:
+                    if not job.future.done():
+                        stats.completed += 1
+                        SCHEDULER_JOBS.labels(job.priority, 'completed').inc()
+                        job.future.set_result(result)
+                finally:
+                    stats.running -= 1
+            finally:
+                self._queues[job.priority].task_done()
+
@@ -0,0 +1,44 @@
+import hashlib
+import random
+import secrets
+from typing import List, Tuple
+
+
+class SeedSequence:
+    """Derive independent, reproducible random streams from one master seed.
+
+    Modelled on ``numpy.random.SeedSequence``: every child is identified by
+    the master entropy plus its position in the spawn tree, so a child's
+    stream does not depend on which process or thread asks for it.
+    """
+
+    def __init__(self, entropy: int = None, spawn_key: Tuple[int, ...] = ()):
+        if entropy is None:
+            entropy = secrets.randbits(128)
+        self.entropy = entropy
+        self.spawn_key = tuple(spawn_key)
+        self.n_children_spawned = 0
+
+    def spawn(self, n_children: int) -> List['SeedSequence']:
+        """Create ``n_children`` new, independent child sequences."""
+        start = self.n_children_spawned
+        self.n_children_spawned += n_children
+        return [self.child(i) for i in range(start, start + n_children)]
+
+    def child(self, index: int) -> 'SeedSequence':
+        """Return the child at ``index`` without advancing the spawn counter."""
+        return SeedSequence(self.entropy, self.spawn_key + (index,))
+
+    def generate_state(self) -> int:
+        """Hash the entropy and spawn key into a 64-bit seed."""
+        key = ":".join(str(part) for part in (self.entropy,) + self.spawn_key)
+        digest = hashlib.blake2b(key.encode("ascii"), digest_size=8).digest()
+        return int.from_bytes(digest, "big")
+
+    def random(self) -> random.Random:
+        """Return a ``random.Random`` seeded from this sequence."""
+        return random.Random(self.generate_state())
+
+    def __repr__(self):
+        return f"SeedSequence(entropy={self.entropy}, spawn_key={self.spawn_key})"
+
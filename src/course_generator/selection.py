@@ -0,0 +1,247 @@
+import bisect
+import functools
+import itertools
+import random
+from collections import deque
+from typing import Deque, Dict, List, Sequence, Tuple
+
+
+class SectionSelector:
+    """Pick exercises for one template section across consecutive days.
+
+    Exercises are rotated evenly: every exercise in the pool is used once per
+    cycle before any is used again. An exercise picked on one day is kept out
+    of the next ``window`` days. When the pool is too small for the window,
+    the oldest cooling day is released early rather than failing.
+
+    Every pick is O(1): the unused exercises of the current cycle live in an
+    array that is sampled with swap-and-pop, and cooling exercises move back
+    in bulk once per day.
+    """
+
+    def __init__(self, exercise_ids: Sequence[str], rng: random.Random, window: int = 1):
+        if window < 0:
+            raise ValueError(f"No-repeat window must be >= 0, got {window}")
+        self.pool = list(dict.fromkeys(exercise_ids))
+        self.rng = rng
+        self.window = window
+        self.cycle = 0
+        # Not used yet in the current cycle and not cooling
+        self._fresh: List[str] = list(self.pool)
+        # Already used in the current cycle, cooled down
+        self._spent: List[str] = []
+        # Picks of the last `window` days, oldest first
+        self._cooling: Deque[List[str]] = deque()
+        self._cycle_of: Dict[str, int] = {}
+
+    def pick(self, count: int) -> List[str]:
+        """Pick ``count`` distinct exercises for the next day."""
+        count = min(count, len(self.pool))
+        today = []
+        for _ in range(count):
+            today.append(self._pick_one())
+        self._cooling.append(today)
+        while len(self._cooling) > self.window:
+            self._release(self._cooling.popleft())
+        return today
+
+    def _pick_one(self) -> str:
+        if not self._fresh:
+            while not self._spent and not self._fresh:
+                # Everything else is cooling: relax the window for the oldest day
+                # (again if that day picked nothing)
+                self._release(self._cooling.popleft())
+            if not self._fresh:
+                self._fresh, self._spent = self._spent, self._fresh
+                self.cycle += 1
+        fresh = self._fresh
+        index = self.rng.randrange(len(fresh))
+        fresh[index], fresh[-1] = fresh[-1], fresh[index]
+        exercise_id = fresh.pop()
+        self._cycle_of[exercise_id] = self.cycle
+        return exercise_id
+
+    def _release(self, exercise_ids: List[str]):
+        for exercise_id in exercise_ids:
+            if self._cycle_of[exercise_id] < self.cycle:
+                self._fresh.append(exercise_id)
+            else:
+                self._spent.append(exercise_id)
+
+
+class AliasTable:
+    """Walker's alias method: O(1) weighted sampling after O(n) setup.
+
+    Every slot holds an item, the probability of keeping it, and an alias
+    taken otherwise. One uniform draw picks the slot (integer part) and
+    decides between the item and its alias (fractional part).
+
+    Tables are shared by every course that uses the same pool, so they also
+    cache the cumulative weights of small pools with some items excluded
+    (keyed by a bit mask of the excluded indexes).
+    """
+
+    # Pools up to this size cache their restricted cumulative weights
+    max_masked_items = 64
+    max_cached_masks = 4096
+
+    def __init__(self, items: Sequence[str], weights: Sequence[float]):
+        if len(items) != len(weights):
+            raise ValueError("Every item needs exactly one weight")
+        if not items or min(weights) <= 0:
+            raise ValueError("Alias tables need at least one item and positive weights")
+        n = len(items)
+        total = float(sum(weights))
+        self.items = tuple(items)
+        self.weights = tuple(float(weight) for weight in weights)
+        scaled = [weight * n / total for weight in weights]
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1.0 up to rounding error and keeps its own item
+        self._masked: Dict[int, Tuple[List[int], List[float]]] = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample_index(self, rng: random.Random) -> int:
+        draw = rng.random() * len(self.items)
+        slot = int(draw)
+        return slot if draw - slot < self.probability[slot] else self.alias[slot]
+
+    def sample(self, rng: random.Random) -> str:
+        return self.items[self.sample_index(rng)]
+
+    def excluding(self, excluded: bytearray) -> Tuple[List[int], List[float]]:
+        """Indexes not flagged in ``excluded`` and their cumulative weights."""
+        indexes = [i for i in range(len(self.items)) if not excluded[i]]
+        return indexes, list(itertools.accumulate(self.weights[i] for i in indexes))
+
+    def excluding_mask(self, mask: int) -> Tuple[List[int], List[float]]:
+        """Like ``excluding`` for indexes given as a bit mask, cached per mask."""
+        entry = self._masked.get(mask)
+        if entry is None:
+            indexes = [i for i in range(len(self.items)) if not mask >> i & 1]
+            entry = (indexes, list(itertools.accumulate(self.weights[i] for i in indexes)))
+            if len(self._masked) < self.max_cached_masks:
+                self._masked[mask] = entry
+        return entry
+
+
+@functools.lru_cache(maxsize=1024)
+def alias_table(items: Tuple[str, ...], weights: Tuple[float, ...]) -> AliasTable:
+    """Build an alias table once per distinct weighted pool and share it."""
+    return AliasTable(items, weights)
+
+
+class WeightedSectionSelector:
+    """Pick exercises for one template section with per-exercise weights.
+
+    Exercises picked today or inside the no-repeat window are blocked. Pools
+    of up to 64 exercises keep the blocked ones as a bit mask and bisect the
+    cumulative weights of the rest, cached per mask in the shared table.
+    Larger pools draw from the alias table in O(1) and redraw on a blocked
+    exercise; when half the pool is blocked, or too many draws in a row
+    fail, they fall back to a linear weighted choice over the rest. As with
+    ``SectionSelector``, the oldest cooling day is released early when
+    nothing else is left.
+    """
+
+    # Redraws before falling back to the weighted choice over the rest
+    max_rejections = 8
+
+    def __init__(self, exercise_ids: Sequence[str], weights: Sequence[float], rng: random.Random,
+                 window: int = 1):
+        if window < 0:
+            raise ValueError(f"No-repeat window must be >= 0, got {window}")
+        # The first weight given for a duplicated id wins
+        first = dict(zip(reversed(exercise_ids), reversed(weights)))
+        self.pool = list(dict.fromkeys(exercise_ids))
+        self.table = alias_table(tuple(self.pool), tuple(float(first[ex_id]) for ex_id in self.pool))
+        self.rng = rng
+        self.window = window
+        small = len(self.pool) <= AliasTable.max_masked_items
+        # Blocked indexes: a bit mask for small pools, flags for the others
+        self._mask = 0 if small else None
+        self._blocked = None if small else bytearray(len(self.pool))
+        self._blocked_count = 0
+        self._cooling: Deque[List[int]] = deque()
+
+    def pick(self, count: int) -> List[str]:
+        """Pick ``count`` distinct exercises for the next day."""
+        count = min(count, len(self.pool))
+        today = self._pick_alias(count) if self._mask is None else self._pick_masked(count)
+        self._cooling.append(today)
+        while len(self._cooling) > self.window:
+            self._release(self._cooling.popleft())
+        items = self.table.items
+        return [items[index] for index in today]
+
+    def _pick_masked(self, count: int) -> List[int]:
+        table, random_draw, bisect_right = self.table, self.rng.random, bisect.bisect_right
+        excluding_mask = table.excluding_mask
+        n = len(self.pool)
+        today = []
+        for _ in range(count):
+            while self._blocked_count == n:
+                # Everything else is cooling: relax the window for the oldest day
+                # (again if that day picked nothing)
+                self._release(self._cooling.popleft())
+            mask = self._mask
+            indexes, cumulative = excluding_mask(mask)
+            position = bisect_right(cumulative, random_draw() * cumulative[-1])
+            index = indexes[position] if position < len(indexes) else indexes[-1]
+            self._mask = mask | 1 << index
+            self._blocked_count += 1
+            today.append(index)
+        return today
+
+    def _pick_alias(self, count: int) -> List[int]:
+        blocked, random_draw = self._blocked, self.rng.random
+        probability, alias = self.table.probability, self.table.alias
+        n = len(blocked)
+        today = []
+        for _ in range(count):
+            draw = random_draw() * n
+            slot = int(draw)
+            index = slot if draw - slot < probability[slot] else alias[slot]
+            if blocked[index]:
+                index = self._redraw()
+            blocked[index] = 1
+            self._blocked_count += 1
+            today.append(index)
+        return today
+
+    def _redraw(self) -> int:
+        """Draw again after hitting a blocked exercise; the result is still exactly weighted."""
+        table, blocked = self.table, self._blocked
+        if self._blocked_count * 2 <= len(blocked):
+            for _ in range(self.max_rejections):
+                index = table.sample_index(self.rng)
+                if not blocked[index]:
+                    return index
+        while self._blocked_count == len(blocked):
+            # Everything else is cooling: relax the window for the oldest day
+            # (again if that day picked nothing)
+            self._release(self._cooling.popleft())
+        indexes, cumulative = table.excluding(blocked)
+        position = bisect.bisect_right(cumulative, self.rng.random() * cumulative[-1])
+        return indexes[min(position, len(indexes) - 1)]
+
+    def _release(self, indexes: List[int]):
+        self._blocked_count -= len(indexes)
+        if self._mask is None:
+            for index in indexes:
+                self._blocked[index] = 0
+            return
+        released = 0
+        for index in indexes:
+            released |= 1 << index
+        self._mask &= ~released
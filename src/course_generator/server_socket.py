@@ -0,0 +1,84 @@
+import os
+import socket
+import stat
+from typing import Optional
+
+# Only the standard library is imported here; submit.py mirrors runtime_dir
+
+
+def runtime_dir() -> str:
+    """Per-user directory for the servers' sockets: under $XDG_RUNTIME_DIR, or /tmp/handstand-course-<uid>."""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        return os.path.join(base, "handstand-course")
+    return os.path.join("/tmp", f"handstand-course-{os.getuid()}")
+
+
+def default_socket_path(name: str) -> str:
+    return os.path.join(runtime_dir(), name)
+
+
+def ensure_private_dir(path: str):
+    """Create ``path`` with mode 0700, or check that an existing one is ours and private.
+
+    Raises PermissionError otherwise: in a shared directory like /tmp,
+    another user could have created it first to sit in front of our socket.
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} must be a directory owned by you with mode 0700")
+
+
+def _is_live(path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+    return True
+
+
+def bind_unix_socket(path: str) -> socket.socket:
+    """Bind a listening Unix socket at ``path`` that only its owner can connect to.
+
+    A socket file left behind by a server that died is replaced. Raises
+    RuntimeError if a server still answers on ``path``, and
+    FileExistsError if ``path`` is something other than a socket.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if directory == runtime_dir():
+        ensure_private_dir(directory)
+    if os.path.lexists(path):
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            raise FileExistsError(f"{path} exists and is not a socket")
+        if _is_live(path):
+            raise RuntimeError(f"A server is already listening on {path}")
+        os.remove(path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # The umask keeps the socket private from the moment it exists; the chmod makes sure of it
+    old_umask = os.umask(0o177)
+    try:
+        listener.bind(path)
+    except BaseException:
+        listener.close()
+        raise
+    finally:
+        os.umask(old_umask)
+    os.chmod(path, 0o600)
+    return listener
+
+
+def check_output_path(path, output_root: Optional[str] = None) -> str:
+    """Return a job's output path, if it is absolute and inside ``output_root`` (when given).
+
+    Symlinks are resolved before comparing, so a link can't lead out of
+    the root. Raises ValueError otherwise.
+    """
+    if not isinstance(path, str) or not os.path.isabs(path):
+        raise ValueError(f"output must be an absolute path, got {path!r}")
+    if output_root is not None:
+        root = os.path.realpath(output_root)
+        if os.path.commonpath([root, os.path.realpath(path)]) != root:
+            raise ValueError(f"output must be inside {output_root}, got {path!r}")
+    return path
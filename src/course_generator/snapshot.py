@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from .storage import ExerciseStore
+
+
+class DataSnapshot:
+    """One consistent version of the vocabulary and the program templates.
+
+    Snapshots are not modified after they are built; reloading builds a
+    new one and replaces the generator's reference to it. A generation reads
+    ``generator.snapshot`` once when it starts and uses that object to the
+    end, so it is unaffected by swaps and needs no lock.
+
+    ``templates`` is a read-only view of a private copy of the mapping it
+    was built from. The template dicts inside are shared, not copied: deep
+    copy one before changing it, as MassPersonalizer does.
+    """
+
+    __slots__ = ('vocabulary', 'templates', 'version', 'loaded_at')
+
+    def __init__(self, vocabulary: ExerciseStore, templates: Mapping, version: int = 1):
+        self.vocabulary = vocabulary
+        self.templates: Mapping[str, Dict] = MappingProxyType(dict(templates))
+        self.version = version
+        self.loaded_at = time.time()
+
+    def replace(self, vocabulary: ExerciseStore = None, templates: Mapping = None) -> 'DataSnapshot':
+        """Return a new snapshot with some parts swapped out."""
+        return DataSnapshot(
+            self.vocabulary if vocabulary is None else vocabulary,
+            self.templates if templates is None else templates,
+            self.version + 1
+        )
+
+    def __repr__(self):
+        return f"DataSnapshot(version={self.version}, exercises={len(self.vocabulary)}, templates={len(self.templates)})"
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SnapshotReloader:
+    """Poll a generator's data files and swap in a new snapshot when they change.
+
+    The new snapshot is loaded and validated on the polling thread while
+    generations keep using the current one. If loading fails (say, an editor
+    saved half a file), the current snapshot stays in place, ``on_error`` is
+    called, and the files are tried again when they next change.
+    """
+
+    def __init__(self, generator, interval: float = 1.0,
+                 on_reload: Callable[[DataSnapshot], None] = None,
+                 on_error: Callable[[Exception], None] = None):
+        self.generator = generator
+        self.interval = interval
+        self.on_reload = on_reload
+        self.on_error = on_error
+        self._signature = self._current_signature()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _current_signature(self):
+        return tuple(_file_signature(path) for path in (self.generator.vocabulary_path, self.generator.templates_path))
+
+    def check(self) -> bool:
+        """Reload if the files changed since the last check; return True if a new snapshot was swapped in."""
+        signature = self._current_signature()
+        if signature == self._signature:
+            return False
+        self._signature = signature
+        try:
+            snapshot = self.generator.reload()
+        except Exception as e:
+            # Anything a bad file can raise (say, a vocabulary saved as null);
+            # the polling thread must survive it to see the next save
+            if self.on_error:
+                self.on_error(e)
+            return False
+        if self.on_reload:
+            self.on_reload(snapshot)
+        return True
+
+    def start(self) -> 'SnapshotReloader':
+        """Poll in a daemon thread until ``stop`` is called."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot-reloader", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def __enter__(self) -> 'SnapshotReloader':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,230 @@
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .models import Exercise
+from .validation import VocabularyError, find_exercise_files, load_exercise_files, validate_vocabulary
+
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+# SQLite's default limit on host parameters in one statement
+_MAX_PARAMS = 999
+
+
+def exercise_from_dict(ex: Dict) -> Exercise:
+    """Build an Exercise from a vocabulary entry."""
+    return Exercise(
+        exercise_id=ex['id'],
+        name=ex['name'],
+        description=ex['description'],
+        sets=ex['default_sets'],
+        reps=ex['default_reps'],
+        category=ex.get('category'),
+        difficulty=ex.get('difficulty'),
+        equipment=ex.get('equipment'),
+        primary_muscle_groups=ex.get('primary_muscle_groups', []),
+        image=ex.get('image')
+    )
+
+
+class ExerciseStore(Mapping):
+    """Read-only mapping of exercise id to Exercise, backed by some storage."""
+
+    def get_many(self, exercise_ids: Iterable[str]) -> Dict[str, Exercise]:
+        """Fetch the given exercises; unknown ids are left out."""
+        return {ex_id: self[ex_id] for ex_id in exercise_ids if ex_id in self}
+
+    def find(self, category: str = None, difficulty: str = None, equipment: str = None) -> List[Exercise]:
+        """Return exercises matching every given attribute, in vocabulary order."""
+        return [
+            ex for ex in self.values()
+            if (category is None or ex.category == category)
+            and (difficulty is None or ex.difficulty == difficulty)
+            and (equipment is None or ex.equipment == equipment)
+        ]
+
+
+class JSONExerciseStore(ExerciseStore):
+    """The whole vocabulary.json parsed and validated into memory (the default)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+        issues = validate_vocabulary(
+            data.get('exercises', []),
+            source=os.path.basename(path),
+            image_root=os.path.dirname(path)
+        )
+        if issues:
+            raise VocabularyError(issues)
+
+        self._exercises = {ex['id']: exercise_from_dict(ex) for ex in data['exercises']}
+
+    def __getitem__(self, exercise_id: str) -> Exercise:
+        return self._exercises[exercise_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._exercises)
+
+    def __len__(self) -> int:
+        return len(self._exercises)
+
+    def __contains__(self, exercise_id) -> bool:
+        return exercise_id in self._exercises
+
+
+class SQLiteExerciseStore(ExerciseStore):
+    """Exercises kept in an indexed SQLite file and fetched on demand.
+
+    Each thread gets its own read-only connection, so a store can be shared
+    by worker threads and passed to worker processes. A forked child opens
+    its own connection instead of using one inherited from its parent.
+    """
+
+    SCHEMA = """
+        CREATE TABLE exercises (
+            id TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            description TEXT NOT NULL,
+            default_sets INTEGER NOT NULL,
+            default_reps TEXT NOT NULL,
+            category TEXT,
+            difficulty TEXT,
+            equipment TEXT,
+            primary_muscle_groups TEXT NOT NULL,
+            image TEXT
+        );
+        CREATE INDEX idx_exercises_category ON exercises (category);
+        CREATE INDEX idx_exercises_difficulty ON exercises (difficulty);
+        CREATE INDEX idx_exercises_equipment ON exercises (equipment);
+    """
+
+    COLUMNS = "id, name, description, default_sets, default_reps, category, difficulty, equipment, primary_muscle_groups, image"
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Exercise store not found: {path}")
+        self.path = path
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # Connections can't cross process boundaries; reopen lazily instead
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.path = state['path']
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def _row_to_exercise(row) -> Exercise:
+        return Exercise(
+            exercise_id=row[0],
+            name=row[1],
+            description=row[2],
+            sets=row[3],
+            reps=row[4],
+            category=row[5],
+            difficulty=row[6],
+            equipment=row[7],
+            primary_muscle_groups=json.loads(row[8]),
+            image=json.loads(row[9])
+        )
+
+    def __getitem__(self, exercise_id: str) -> Exercise:
+        row = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM exercises WHERE id = ?", (exercise_id,)).fetchone()
+        if row is None:
+            raise KeyError(exercise_id)
+        return self._row_to_exercise(row)
+
+    def __contains__(self, exercise_id) -> bool:
+        return self.connection.execute(
+            "SELECT 1 FROM exercises WHERE id = ?", (exercise_id,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for (exercise_id,) in self.connection.execute("SELECT id FROM exercises ORDER BY rowid"):
+            yield exercise_id
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM exercises").fetchone()[0]
+
+    def values(self) -> Iterator[Exercise]:
+        for row in self.connection.execute(f"SELECT {self.COLUMNS} FROM exercises ORDER BY rowid"):
+            yield self._row_to_exercise(row)
+
+    def get_many(self, exercise_ids: Iterable[str]) -> Dict[str, Exercise]:
+        exercise_ids = list(dict.fromkeys(exercise_ids))
+        found = {}
+        for start in range(0, len(exercise_ids), _MAX_PARAMS):
+            chunk = exercise_ids[start:start + _MAX_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self.connection.execute(
+                    f"SELECT {self.COLUMNS} FROM exercises WHERE id IN ({placeholders})", chunk):
+                found[row[0]] = self._row_to_exercise(row)
+        # Keep the caller's order
+        return {ex_id: found[ex_id] for ex_id in exercise_ids if ex_id in found}
+
+    def find(self, category: str = None, difficulty: str = None, equipment: str = None) -> List[Exercise]:
+        clauses = []
+        params = []
+        for column, value in (("category", category), ("difficulty", difficulty), ("equipment", equipment)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.connection.execute(
+            f"SELECT {self.COLUMNS} FROM exercises {where} ORDER BY rowid", params)
+        return [self._row_to_exercise(row) for row in rows]
+
+    @classmethod
+    def build(cls, path: str, exercises: Iterable[Dict]) -> 'SQLiteExerciseStore':
+        """Write validated vocabulary entries to a new store, replacing ``path`` atomically."""
+        tmp_path = f"{path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(cls.SCHEMA)
+            conn.executemany(
+                f"INSERT INTO exercises ({cls.COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (ex['id'], ex['name'], ex['description'], ex['default_sets'], ex['default_reps'],
+                     ex.get('category'), ex.get('difficulty'), ex.get('equipment'),
+                     json.dumps(ex.get('primary_muscle_groups', [])), json.dumps(ex.get('image')))
+                    for ex in exercises
+                )
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        os.replace(tmp_path, path)
+        return cls(path)
+
+    @classmethod
+    def build_from_folders(cls, path: str, base_dir: str, workers: Optional[int] = None) -> 'SQLiteExerciseStore':
+        """Build a store straight from the per-category exercise.json folders."""
+        exercises, issues = load_exercise_files(find_exercise_files(base_dir), base_dir, workers=workers)
+        if issues:
+            raise VocabularyError(issues)
+        return cls.build(path, exercises)
+
+
+def open_store(path: str) -> ExerciseStore:
+    """Open the exercise store at ``path``, choosing the backend by extension."""
+    if path.endswith(SQLITE_EXTENSIONS):
+        return SQLiteExerciseStore(path)
+    return JSONExerciseStore(path)
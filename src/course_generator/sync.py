@@ -0,0 +1,293 @@
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from .batch import atomic_output
+from .validation import CATEGORIES, ExerciseValidator, ValidationIssue, _load_chunk, check_unique_ids
+
+MANIFEST_NAME = ".sync_manifest.json"
+EXERCISE_FILE = "exercise.json"
+SIDES = ("folders", "vocabulary")
+
+
+def entry_hash(exercise: Dict) -> str:
+    """Hash of an exercise's content, independent of key order and formatting."""
+    canonical = json.dumps(exercise, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _stat_key(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _write_json(path: str, data):
+    with atomic_output(path) as tmp_path:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+class SyncReport:
+    """What a sync changed (or, in a dry run, would change), by exercise id."""
+
+    def __init__(self):
+        self.to_folders: List[str] = []
+        self.to_vocabulary: List[str] = []
+        self.removed_from_folders: List[str] = []
+        self.removed_from_vocabulary: List[str] = []
+        self.conflicts: List[str] = []
+        self.issues: List[ValidationIssue] = []
+        self.files_read = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.to_folders or self.to_vocabulary or self.removed_from_folders or self.removed_from_vocabulary)
+
+    @property
+    def ok(self) -> bool:
+        return not self.conflicts and not self.issues
+
+
+class VocabularySync:
+    """Two-way sync between the category folders and vocabulary.json.
+
+    The manifest records, for every exercise, its content hash when both
+    sides last agreed and the size and mtime of its ``exercise.json``, plus
+    those of vocabulary.json. A file whose size and mtime are unchanged is
+    not read again, and an unchanged vocabulary.json is not parsed, so a
+    sync with nothing to do only stats the files.
+
+    An exercise that changed on one side since the last sync is copied to
+    the other; one deleted on one side and unchanged on the other is
+    deleted there too. An exercise changed differently on both sides (or
+    found on both with different content and no manifest entry) is a
+    conflict and is left alone, unless ``prefer`` names the side that wins.
+    Invalid entries are reported and never copied or deleted.
+    """
+
+    def __init__(self, base_dir: str, vocabulary_path: str = None, manifest_path: str = None,
+                 categories: Sequence[str] = CATEGORIES):
+        self.base_dir = base_dir
+        self.vocabulary_path = vocabulary_path or os.path.join(base_dir, "vocabulary.json")
+        self.manifest_path = manifest_path or os.path.join(base_dir, MANIFEST_NAME)
+        self.categories = categories
+
+    def load_manifest(self) -> Dict:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {"vocabulary": None, "exercises": {}}
+
+    def run(self, dry_run: bool = False, prefer: str = None) -> SyncReport:
+        if prefer is not None and prefer not in SIDES:
+            raise ValueError(f"prefer must be one of {SIDES}, got {prefer!r}")
+        report = SyncReport()
+        invalid: Set[str] = set()
+        manifest = self.load_manifest()
+        synced = manifest["exercises"]
+
+        folders, unreadable = self._scan_folders(synced, report, invalid)
+        vocabulary_stat = _stat_key(self.vocabulary_path)
+        vocabulary = raw_vocabulary = None
+        if vocabulary_stat is not None and vocabulary_stat == manifest["vocabulary"]:
+            vocabulary_hashes = {exercise_id: record["hash"] for exercise_id, record in synced.items()}
+        else:
+            raw_vocabulary, vocabulary = self._load_vocabulary(report, invalid)
+            vocabulary_hashes = {exercise_id: entry_hash(entry) for exercise_id, entry in vocabulary.items()}
+
+        new_synced = dict(synced)
+        vocabulary_changes: Dict[str, Optional[Dict]] = {}
+        for exercise_id in sorted(set(synced) | set(folders) | set(vocabulary_hashes)):
+            if exercise_id in invalid:
+                continue
+            base = synced.get(exercise_id, {}).get("hash")
+            folder = folders.get(exercise_id)
+            folder_hash = folder[2] if folder else None
+            vocabulary_hash = vocabulary_hashes.get(exercise_id)
+            if folder_hash == vocabulary_hash:
+                winner = None
+            elif folder_hash == base:
+                winner = "vocabulary"
+            elif vocabulary_hash == base:
+                if folder is None and unreadable:
+                    # Maybe moved into a folder whose file we couldn't read; not a deletion
+                    invalid.add(exercise_id)
+                    continue
+                winner = "folders"
+            elif prefer is not None:
+                winner = prefer
+            else:
+                report.conflicts.append(exercise_id)
+                continue
+
+            if winner == "vocabulary":
+                if vocabulary is None:
+                    raw_vocabulary, vocabulary = self._load_vocabulary(report, invalid)
+                entry = vocabulary.get(exercise_id)
+                if not dry_run:
+                    written = self._write_folder(exercise_id, folder, entry, report)
+                    if entry is not None and (written is None or written[2] != vocabulary_hash):
+                        continue
+                    folder = written
+                (report.to_folders if entry else report.removed_from_folders).append(exercise_id)
+            elif winner == "folders":
+                vocabulary_changes[exercise_id] = self._folder_entry(folder) if folder else None
+                (report.to_vocabulary if folder else report.removed_from_vocabulary).append(exercise_id)
+
+            if folder is None:
+                new_synced.pop(exercise_id, None)
+            else:
+                path, stat, content_hash = folder[:3]
+                new_synced[exercise_id] = {"path": path, "stat": stat, "hash": content_hash}
+
+        if dry_run:
+            return report
+        if vocabulary_changes:
+            if vocabulary is None:
+                raw_vocabulary, vocabulary = self._load_vocabulary(report, invalid)
+            _write_json(self.vocabulary_path, {"exercises": self._apply(raw_vocabulary, vocabulary_changes)})
+            vocabulary_stat = _stat_key(self.vocabulary_path)
+        if report.conflicts or invalid:
+            # Parse vocabulary.json again next time, or its unsynced edits would look synced
+            vocabulary_stat = None
+        new_manifest = {"vocabulary": vocabulary_stat, "exercises": new_synced}
+        if new_manifest != manifest:
+            _write_json(self.manifest_path, new_manifest)
+        return report
+
+    def _scan_folders(self, synced: Dict, report: SyncReport, invalid: Set[str]) -> Tuple[Dict[str, Tuple], bool]:
+        """Map exercise id to (path, stat, hash, data); data is None when the file was not read.
+
+        Also returns whether any file could not be loaded, since its id is then unknown.
+        """
+        by_path = {record["path"]: (exercise_id, record) for exercise_id, record in synced.items()}
+        folders = {}
+        entries = []
+        unreadable = False
+        for category in self.categories:
+            category_dir = os.path.join(self.base_dir, category)
+            if not os.path.isdir(category_dir):
+                continue
+            for exercise_dir in sorted(os.listdir(category_dir)):
+                path = os.path.join(category, exercise_dir, EXERCISE_FILE)
+                stat = _stat_key(os.path.join(self.base_dir, path))
+                if stat is None:
+                    continue
+                known = by_path.get(path)
+                if known is not None and known[1]["stat"] == stat:
+                    exercise_id = known[0]
+                    folders[exercise_id] = (path, stat, known[1]["hash"], None)
+                else:
+                    report.files_read += 1
+                    loaded, issues = _load_chunk([os.path.join(self.base_dir, path)], self.base_dir)
+                    if issues:
+                        report.issues.extend(issues)
+                        unreadable = True
+                        # Don't mistake a broken file for a deleted exercise
+                        if known is not None:
+                            invalid.add(known[0])
+                        continue
+                    data = loaded[0][0]
+                    exercise_id = data["id"]
+                    folders[exercise_id] = (path, stat, entry_hash(data), data)
+                entries.append((exercise_id, path))
+        report.issues.extend(check_unique_ids(entries))
+        counts = Counter(exercise_id for exercise_id, _ in entries)
+        invalid.update(exercise_id for exercise_id, count in counts.items() if count > 1)
+        return folders, unreadable
+
+    def _load_vocabulary(self, report: SyncReport, invalid: Set[str]) -> Tuple[List, Dict[str, Dict]]:
+        """All vocabulary entries, and the valid ones by id."""
+        try:
+            with open(self.vocabulary_path, 'r', encoding='utf-8') as f:
+                exercises = json.load(f)["exercises"]
+        except FileNotFoundError:
+            return [], {}
+        validator = ExerciseValidator(image_root=self.base_dir)
+        source = os.path.basename(self.vocabulary_path)
+        entries = {}
+        for index, exercise in enumerate(exercises):
+            issues = validator.validate(exercise, f"{source}[{index}]")
+            if issues:
+                report.issues.extend(issues)
+                if isinstance(exercise, dict) and isinstance(exercise.get("id"), str):
+                    invalid.add(exercise["id"])
+            elif exercise["id"] in entries:
+                report.issues.append(ValidationIssue(f"{source}[{index}]", "id", f"duplicate id {exercise['id']!r}"))
+                invalid.add(exercise["id"])
+            else:
+                entries[exercise["id"]] = exercise
+        return exercises, entries
+
+    def _folder_entry(self, folder: Tuple) -> Dict:
+        path, _, _, data = folder
+        if data is None:
+            with open(os.path.join(self.base_dir, path), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        return data
+
+    def _write_folder(self, exercise_id: str, folder: Optional[Tuple], entry: Optional[Dict],
+                      report: SyncReport) -> Optional[Tuple]:
+        """Write (or remove) an exercise's file, moving its folder if its name or category changed.
+
+        Returns the folder's new (path, stat, hash, data), or the old one if
+        it could not be written.
+        """
+        old_dir = os.path.join(self.base_dir, os.path.dirname(folder[0])) if folder else None
+        if entry is None:
+            os.remove(os.path.join(old_dir, EXERCISE_FILE))
+            if not os.listdir(old_dir):
+                os.rmdir(old_dir)
+            return None
+        path = os.path.join(entry["category"], entry["name"], EXERCISE_FILE)
+        new_dir = os.path.join(self.base_dir, os.path.dirname(path))
+        if os.sep in entry["name"] or entry["name"] in (".", ".."):
+            report.issues.append(ValidationIssue(exercise_id, "name", f"{entry['name']!r} can't be a folder name"))
+            return folder
+        if old_dir != new_dir:
+            if os.path.exists(os.path.join(new_dir, EXERCISE_FILE)):
+                report.conflicts.append(exercise_id)
+                return folder
+            if old_dir is not None and not os.path.exists(new_dir):
+                # Images and notes in the folder move with it
+                os.rename(old_dir, new_dir)
+            elif old_dir is not None:
+                os.remove(os.path.join(old_dir, EXERCISE_FILE))
+        os.makedirs(new_dir, exist_ok=True)
+        _write_json(os.path.join(self.base_dir, path), entry)
+        return path, _stat_key(os.path.join(self.base_dir, path)), entry_hash(entry), entry
+
+    def _apply(self, vocabulary: List, changes: Dict[str, Optional[Dict]]) -> List:
+        """Replace, delete and add changed entries, keeping the order (and any invalid entries) of the rest.
+
+        New exercises go after the last one of their category, sorted by
+        name, the order build_vocabulary.py uses.
+        """
+        result = []
+        for exercise in vocabulary:
+            exercise_id = exercise.get("id") if isinstance(exercise, dict) else None
+            if exercise_id in changes:
+                entry = changes.pop(exercise_id)
+                if entry is not None:
+                    result.append(entry)
+            else:
+                result.append(exercise)
+        added: Dict[str, List[Dict]] = {}
+        for entry in sorted((entry for entry in changes.values() if entry is not None), key=lambda e: e["name"]):
+            added.setdefault(entry["category"], []).append(entry)
+        last = {exercise.get("category"): index for index, exercise in enumerate(result) if isinstance(exercise, dict)}
+        merged = []
+        for index, exercise in enumerate(result):
+            merged.append(exercise)
+            category = exercise.get("category") if isinstance(exercise, dict) else None
+            if last.get(category) == index:
+                merged.extend(added.pop(category, []))
+        for category in self.categories:
+            merged.extend(added.pop(category, []))
+        return merged
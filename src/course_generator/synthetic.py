@@ -0,0 +1,103 @@
+import json
+import os
+import random
+from typing import Dict, Iterator, List
+
+from .validation import CATEGORIES, DIFFICULTIES
+
+# Template section for each category folder (the generator's section names)
+SECTION_FOR_CATEGORY = {
+    "Warmup": "Warmup",
+    "Prehab": "Prehab",
+    "Shoulder opener": "Shoulder Opener",
+    "Handstand": "Handstand",
+    "Conditioning": "Conditioning",
+    "Stretching": "Stretching",
+}
+
+EQUIPMENT = ["none", "wall", "yoga mat", "resistance band", "parallettes", "blocks"]
+MUSCLE_GROUPS = ["shoulders", "core", "wrists", "forearms", "triceps", "back", "hamstrings",
+                 "hips", "calves", "ankles", "spine", "balance"]
+REPS = ["10 reps", "8-12 reps", "30 seconds", "20 seconds each side", "5 repeats", "45 seconds",
+        "10 repeats each leg", "30-60 seconds", "15 circles each direction"]
+SENTENCES = [
+    "Keep your core tight and your ribs down.",
+    "Stack your shoulders over your wrists.",
+    "Move slowly and breathe through the position.",
+    "Push the floor away and lengthen through your fingertips.",
+    "Squeeze your glutes and point your toes.",
+    "Stop before your form breaks down.",
+    "Keep your gaze between your hands.",
+    "Control the way down as much as the way up.",
+]
+
+
+def generate_exercises(count: int, seed: int = 0) -> Iterator[Dict]:
+    """Yield ``count`` valid vocabulary entries, always the same for the same seed.
+
+    Entries are produced one at a time from a single random stream, so the
+    first N of a larger run equal a run of N.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        category = CATEGORIES[i % len(CATEGORIES)]
+        yield {
+            "id": f"synthetic_{i:07d}",
+            "name": f"Synthetic {category} {i:07d}",
+            "description": " ".join(rng.sample(SENTENCES, rng.randint(2, 4))),
+            "default_sets": rng.randint(1, 4),
+            "default_reps": rng.choice(REPS),
+            "difficulty": rng.choice(DIFFICULTIES),
+            "equipment": rng.choice(EQUIPMENT),
+            "primary_muscle_groups": rng.sample(MUSCLE_GROUPS, rng.randint(1, 3)),
+            "image": None,
+            "category": category
+        }
+
+
+def generate_templates(exercise_count: int, template_count: int, seed: int = 0,
+                       pool_size: int = 20) -> Dict[str, Dict]:
+    """Build ``template_count`` templates drawing on the first ``exercise_count`` synthetic exercises."""
+    rng = random.Random(seed + 1)
+    per_category = {
+        category: range(index, exercise_count, len(CATEGORIES))
+        for index, category in enumerate(CATEGORIES)
+    }
+    templates = {}
+    for t in range(template_count):
+        sections = {}
+        for category, indexes in per_category.items():
+            if not indexes:
+                continue
+            ids = [f"synthetic_{i:07d}" for i in rng.sample(indexes, min(pool_size, len(indexes)))]
+            low = rng.randint(1, 2)
+            sections[SECTION_FOR_CATEGORY[category]] = {
+                "exercise_ids": ids,
+                "min_exercises": low,
+                "max_exercises": low + rng.randint(0, 2)
+            }
+        templates[f"synthetic_template_{t:05d}"] = {
+            "name": f"Synthetic Program {t}",
+            "description": "Generated for scaling tests",
+            "difficulty": rng.choice(DIFFICULTIES),
+            "sections": sections
+        }
+    return templates
+
+
+def write_master_files(output_dir: str, exercises: List[Dict], templates: Dict[str, Dict]):
+    """Write vocabulary.json and program_templates.json, as build_vocabulary.py would."""
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, "vocabulary.json"), 'w', encoding='utf-8') as f:
+        json.dump({"exercises": exercises}, f, indent=2, ensure_ascii=False)
+    with open(os.path.join(output_dir, "program_templates.json"), 'w', encoding='utf-8') as f:
+        json.dump({"program_templates": templates}, f, indent=2, ensure_ascii=False)
+
+
+def write_category_folders(output_dir: str, exercises: List[Dict]):
+    """Write one <Category>/<Exercise Name>/exercise.json per exercise."""
+    for exercise in exercises:
+        exercise_dir = os.path.join(output_dir, exercise["category"], exercise["name"])
+        os.makedirs(exercise_dir, exist_ok=True)
+        with open(os.path.join(exercise_dir, "exercise.json"), 'w', encoding='utf-8') as f:
+            json.dump(exercise, f, indent=4, ensure_ascii=False)
@@ -0,0 +1,266 @@
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Category folders, in the order build_vocabulary.py combines them
+CATEGORIES = ["Warmup", "Prehab", "Shoulder opener", "Handstand", "Conditioning", "Stretching"]
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+
+# Field -> rule. Compiled once into a flat list of checks by ExerciseValidator.
+EXERCISE_SCHEMA = {
+    "id": {"type": str, "required": True, "pattern": r"^[a-z0-9_]+$"},
+    "name": {"type": str, "required": True, "non_empty": True},
+    "description": {"type": str, "required": True},
+    "default_sets": {"type": int, "required": True, "min": 1},
+    "default_reps": {"type": str, "required": True, "non_empty": True},
+    "category": {"type": str, "required": True, "choices": CATEGORIES},
+    "difficulty": {"type": str, "required": True, "choices": DIFFICULTIES},
+    "equipment": {"type": str},
+    "primary_muscle_groups": {"type": list, "items": str},
+    "image": {"type": (str, list, type(None)), "items": str, "image": True}
+}
+
+# Below this many files, starting worker processes costs more than it saves
+PARALLEL_THRESHOLD = 2000
+
+
+class ValidationIssue:
+    """A single problem found in an exercise definition."""
+
+    def __init__(self, source: str, field: Optional[str], message: str):
+        self.source = source
+        self.field = field
+        self.message = message
+
+    def __str__(self):
+        where = f"{self.source}: {self.field}" if self.field else self.source
+        return f"{where}: {self.message}"
+
+    def __repr__(self):
+        return f"ValidationIssue({str(self)!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, ValidationIssue) and str(self) == str(other)
+
+
+class VocabularyError(ValueError):
+    """Raised when exercise definitions fail validation; lists every issue."""
+
+    def __init__(self, issues: List[ValidationIssue]):
+        self.issues = issues
+        lines = "\n".join(f"  - {issue}" for issue in issues)
+        super().__init__(f"{len(issues)} invalid exercise field(s):\n{lines}")
+
+
+class ExerciseValidator:
+    """Validate exercise dicts against a schema compiled into plain checks."""
+
+    def __init__(self, schema: Dict = None, image_root: Optional[str] = None):
+        self.schema = schema or EXERCISE_SCHEMA
+        # Directory image paths are relative to; None skips the existence check
+        self.image_root = image_root
+        self._checks = self._compile(self.schema)
+
+    def validate(self, data, source: str = "<exercise>") -> List[ValidationIssue]:
+        """Return every issue in one exercise definition."""
+        if not isinstance(data, dict):
+            return [ValidationIssue(source, None, f"expected an object, got {type(data).__name__}")]
+        issues = []
+        for check in self._checks:
+            check(data, source, issues)
+        return issues
+
+    def _compile(self, schema: Dict) -> List[Callable]:
+        checks = []
+        for field, rule in schema.items():
+            checks.append(self._compile_field(field, rule))
+        return checks
+
+    def _compile_field(self, field: str, rule: Dict) -> Callable:
+        expected = rule["type"]
+        required = rule.get("required", False)
+        pattern = re.compile(rule["pattern"]) if "pattern" in rule else None
+        choices = frozenset(rule["choices"]) if "choices" in rule else None
+        minimum = rule.get("min")
+        non_empty = rule.get("non_empty", False)
+        item_type = rule.get("items")
+        check_image = rule.get("image", False)
+        type_name = expected.__name__ if isinstance(expected, type) else " or ".join(
+            "null" if t is type(None) else t.__name__ for t in expected)
+
+        def check(data, source, issues):
+            if field not in data:
+                if required:
+                    issues.append(ValidationIssue(source, field, "missing required field"))
+                return
+            value = data[field]
+            # bool is an int subclass, but never a valid count
+            if not isinstance(value, expected) or (isinstance(value, bool) and expected is int):
+                issues.append(ValidationIssue(source, field, f"expected {type_name}, got {type(value).__name__}"))
+                return
+            if non_empty and not value.strip():
+                issues.append(ValidationIssue(source, field, "must not be empty"))
+            if pattern is not None and not pattern.match(value):
+                issues.append(ValidationIssue(source, field, f"{value!r} does not match {pattern.pattern}"))
+            if choices is not None and value not in choices:
+                issues.append(ValidationIssue(source, field, f"{value!r} is not one of {sorted(choices)}"))
+            if minimum is not None and value < minimum:
+                issues.append(ValidationIssue(source, field, f"must be >= {minimum}, got {value}"))
+            if item_type is not None and isinstance(value, list):
+                for item in value:
+                    if not isinstance(item, item_type):
+                        issues.append(ValidationIssue(source, field, f"items must be {item_type.__name__}, got {type(item).__name__}"))
+                        return
+            if check_image and self.image_root is not None and value:
+                for image in value if isinstance(value, list) else [value]:
+                    if not os.path.isfile(os.path.join(self.image_root, image)):
+                        issues.append(ValidationIssue(source, field, f"image not found: {image}"))
+
+        return check
+
+
+def check_unique_ids(entries: Iterable[Tuple[str, str]]) -> List[ValidationIssue]:
+    """Report every exercise id used by more than one (id, source) entry."""
+    first_seen = {}
+    issues = []
+    for exercise_id, source in entries:
+        if exercise_id in first_seen:
+            issues.append(ValidationIssue(source, "id", f"duplicate id {exercise_id!r}, also in {first_seen[exercise_id]}"))
+        else:
+            first_seen[exercise_id] = source
+    return issues
+
+
+def validate_vocabulary(exercises: List[Dict], source: str = "vocabulary.json",
+                        image_root: Optional[str] = None) -> List[ValidationIssue]:
+    """Validate the entries of a master vocabulary file."""
+    validator = ExerciseValidator(image_root=image_root)
+    issues = []
+    entries = []
+    for index, data in enumerate(exercises):
+        entry_source = f"{source}[{index}]"
+        issues.extend(validator.validate(data, entry_source))
+        if isinstance(data, dict) and isinstance(data.get("id"), str):
+            entries.append((data["id"], entry_source))
+    issues.extend(check_unique_ids(entries))
+    return issues
+
+
+class TemplateError(ValueError):
+    """Raised when program templates fail validation; lists every issue."""
+
+    def __init__(self, issues: List[ValidationIssue]):
+        self.issues = issues
+        lines = "\n".join(f"  - {issue}" for issue in issues)
+        super().__init__(f"{len(issues)} invalid template field(s):\n{lines}")
+
+
+def validate_templates(templates, source: str = "program_templates.json") -> List[ValidationIssue]:
+    """Check the structure of the program templates.
+
+    Exercise ids missing from the vocabulary are not an error here; the
+    generator skips them and counts them in its metrics.
+    """
+    if not isinstance(templates, dict):
+        return [ValidationIssue(source, "program_templates", "expected an object")]
+    issues = []
+    for name, template in templates.items():
+        template_source = f"{source}[{name}]"
+        sections = template.get("sections") if isinstance(template, dict) else None
+        if not isinstance(sections, dict):
+            issues.append(ValidationIssue(template_source, "sections", "expected an object"))
+            continue
+        for section, config in sections.items():
+            field = f"sections.{section}"
+            if not isinstance(config, dict):
+                issues.append(ValidationIssue(template_source, field, "expected an object"))
+                continue
+            ids = config.get("exercise_ids")
+            if not isinstance(ids, list) or not all(isinstance(ex_id, str) for ex_id in ids):
+                issues.append(ValidationIssue(template_source, f"{field}.exercise_ids", "expected a list of ids"))
+            weights = config.get("weights")
+            if weights is not None:
+                if not isinstance(weights, dict) or not all(
+                        isinstance(weight, (int, float)) and not isinstance(weight, bool) and weight > 0
+                        for weight in weights.values()):
+                    issues.append(ValidationIssue(template_source, f"{field}.weights",
+                                                  "expected an object of positive numbers"))
+                elif isinstance(ids, list) and set(weights) - set(ids):
+                    issues.append(ValidationIssue(template_source, f"{field}.weights",
+                                                  f"weights for ids not in exercise_ids: {sorted(set(weights) - set(ids))}"))
+            bounds = [config.get(key, default) for key, default in (("min_exercises", 1), ("max_exercises", 2))]
+            if not all(isinstance(bound, int) and not isinstance(bound, bool) and bound >= 0 for bound in bounds):
+                issues.append(ValidationIssue(template_source, field, "min/max_exercises must be non-negative integers"))
+            elif bounds[0] > bounds[1]:
+                issues.append(ValidationIssue(template_source, field, "min_exercises is larger than max_exercises"))
+    return issues
+
+
+def find_exercise_files(base_dir: str, categories: Sequence[str] = CATEGORIES) -> List[str]:
+    """List exercise.json files in category order, sorted within each category."""
+    paths = []
+    for category in categories:
+        category_path = os.path.join(base_dir, category)
+        if not os.path.isdir(category_path):
+            continue
+        for exercise_dir in sorted(os.listdir(category_path)):
+            exercise_file = os.path.join(category_path, exercise_dir, "exercise.json")
+            if os.path.isfile(exercise_file):
+                paths.append(exercise_file)
+    return paths
+
+
+def _load_chunk(paths: List[str], base_dir: str) -> Tuple[List[Tuple[Dict, str]], List[ValidationIssue]]:
+    validator = ExerciseValidator(image_root=base_dir)
+    loaded = []
+    issues = []
+    for path in paths:
+        source = os.path.relpath(path, base_dir)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            issues.append(ValidationIssue(source, None, f"unreadable: {e}"))
+            continue
+        file_issues = validator.validate(data, source)
+        if not file_issues:
+            # The folder a file lives in must match its declared category
+            folder = os.path.basename(os.path.dirname(os.path.dirname(path)))
+            if data["category"] != folder:
+                file_issues.append(ValidationIssue(source, "category", f"{data['category']!r} does not match folder {folder!r}"))
+        if file_issues:
+            issues.extend(file_issues)
+        else:
+            loaded.append((data, source))
+    return loaded, issues
+
+
+def load_exercise_files(paths: List[str], base_dir: str,
+                        workers: Optional[int] = None) -> Tuple[List[Dict], List[ValidationIssue]]:
+    """Load and validate exercise files, in parallel for large libraries.
+
+    Returns the valid exercises (in input order) and every issue found,
+    including duplicate ids across files.
+    """
+    if workers is None:
+        workers = 1 if len(paths) < PARALLEL_THRESHOLD else os.cpu_count() or 1
+    if workers <= 1:
+        results = [_load_chunk(paths, base_dir)]
+    else:
+        chunk_size = max(1, -(-len(paths) // (workers * 4)))
+        chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_load_chunk, chunks, [base_dir] * len(chunks)))
+
+    exercises = []
+    issues = []
+    entries = []
+    for loaded, chunk_issues in results:
+        issues.extend(chunk_issues)
+        for data, source in loaded:
+            exercises.append(data)
+            entries.append((data["id"], source))
+    issues.extend(check_unique_ids(entries))
+    return exercises, issues
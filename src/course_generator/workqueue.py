@@ -0,0 +1,283 @@
+import json
+import os
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+# A job moves pending -> running -> done (or failed), one rename at a time
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+STATES = (PENDING, RUNNING, DONE, FAILED)
+
+# Separates job id, worker id and expiry in the name of a running job's lease file
+_SEPARATOR = "~"
+_VALID_NAME = re.compile(r'^[A-Za-z0-9_.@+-]+$')
+
+
+def _check_name(kind: str, name: str):
+    if not _VALID_NAME.match(name) or name.startswith('.'):
+        raise ValueError(f"Invalid {kind} '{name}': use letters, digits and _ . @ + -")
+
+
+def default_worker_id() -> str:
+    """Host name, process id and a random suffix, unique across the nodes sharing a queue."""
+    host = re.sub(r'[^A-Za-z0-9_.-]', '-', socket.gethostname()) or "host"
+    return f"{host}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class LeaseLost(Exception):
+    """The lease expired and the job was handed to another worker."""
+
+
+class Lease:
+    """A worker's claim on one running job, valid until ``expires`` (a Unix time)."""
+
+    def __init__(self, job_id: str, spec: Dict, worker_id: str, expires: float, attempt: int):
+        self.job_id = job_id
+        self.spec = spec
+        self.worker_id = worker_id
+        self.expires = expires
+        self.attempt = attempt
+        # Held while the lease file is renamed, so a heartbeat never races completion
+        self.lock = threading.Lock()
+
+    @property
+    def file_name(self) -> str:
+        return _SEPARATOR.join((self.job_id, self.worker_id, f"{self.expires:.3f}"))
+
+
+class WorkQueue:
+    """A job queue kept in a directory that several nodes share, e.g. over NFS.
+
+    Every job has an immutable spec in ``jobs/<id>.json`` and a small state
+    file that moves between the ``pending``, ``running``, ``done`` and
+    ``failed`` directories by ``rename``, which is atomic on one file
+    system: when two workers claim the same job, exactly one rename
+    succeeds. A running job's file is its lease. It is named
+    ``<job id>~<worker id>~<expiry>`` and renamed to a later expiry by
+    ``renew``. Once it has expired, ``recover`` moves it back to pending,
+    or to failed after ``max_attempts`` claims. A worker whose lease was
+    taken over finds out on its next rename and gets ``LeaseLost``.
+
+    Every job is completed exactly once, but a worker that stalls past its
+    lease may process a job that is also processed elsewhere, so handlers
+    should write their output atomically. Expiry times are wall-clock
+    times, so the nodes' clocks must agree to well within ``lease_seconds``.
+    """
+
+    def __init__(self, root: str, lease_seconds: float = 300.0, max_attempts: int = 3):
+        self.root = root
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        for directory in ("jobs", "tmp") + STATES:
+            os.makedirs(os.path.join(root, directory), exist_ok=True)
+        # Pending jobs this process has listed but not tried yet, shuffled so
+        # that workers don't all race for the same file
+        self._candidates: List[str] = []
+        self._rng = random.Random()
+
+    def _path(self, directory: str, name: str) -> str:
+        return os.path.join(self.root, directory, name)
+
+    def _write_tmp(self, data: Dict) -> str:
+        path = self._path("tmp", uuid.uuid4().hex)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        return path
+
+    @staticmethod
+    def _read_state(path: str) -> Dict:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.loads(f.read() or '{}')
+
+    def _write_state(self, directory: str, name: str, state: Dict):
+        """Replace a state file in one rename, so a crash never leaves it half written."""
+        os.replace(self._write_tmp(state), self._path(directory, name))
+
+    def submit(self, job_id: str, spec: Dict) -> bool:
+        """Add a job; returns False if a job with this id was already submitted.
+
+        The spec is the job's claim on its id: once it exists, submitting
+        the id again is refused whatever state the job is in, so a job is
+        never queued twice or has its attempts reset.
+        """
+        _check_name("job id", job_id)
+        tmp_path = self._write_tmp(spec)
+        try:
+            # Unlike rename, link refuses to replace an existing spec
+            os.link(tmp_path, self._path("jobs", f"{job_id}.json"))
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(tmp_path)
+        self._write_state(PENDING, job_id, {"attempts": 0})
+        return True
+
+    def state(self, job_id: str) -> Optional[str]:
+        """The job's state, or None if it was never submitted."""
+        for state in (DONE, FAILED, PENDING):
+            if os.path.exists(self._path(state, job_id)):
+                return state
+        prefix = job_id + _SEPARATOR
+        if any(name.startswith(prefix) for name in os.listdir(os.path.join(self.root, RUNNING))):
+            return RUNNING
+        return None
+
+    def counts(self) -> Dict[str, int]:
+        return {state: len(os.listdir(os.path.join(self.root, state))) for state in STATES}
+
+    def claim(self, worker_id: str) -> Optional[Lease]:
+        """Lease the next pending job, or return None if there is none."""
+        _check_name("worker id", worker_id)
+        listed = False
+        while True:
+            if not self._candidates:
+                if listed:
+                    return None
+                self._candidates = os.listdir(os.path.join(self.root, PENDING))
+                self._rng.shuffle(self._candidates)
+                listed = True
+                continue
+            lease = self._try_claim(self._candidates.pop(), worker_id)
+            if lease is not None:
+                return lease
+
+    def _try_claim(self, job_id: str, worker_id: str) -> Optional[Lease]:
+        lease = Lease(job_id, {}, worker_id, time.time() + self.lease_seconds, 0)
+        running_path = self._path(RUNNING, lease.file_name)
+        try:
+            os.rename(self._path(PENDING, job_id), running_path)
+        except FileNotFoundError:
+            return None
+        # The job is ours now; nobody else writes its state file until the lease expires
+        state = self._read_state(running_path)
+        state["attempts"] = lease.attempt = state.get("attempts", 0) + 1
+        self._write_state(RUNNING, lease.file_name, state)
+        with open(self._path("jobs", f"{job_id}.json"), 'r', encoding='utf-8') as f:
+            lease.spec = json.load(f)
+        return lease
+
+    def _move(self, lease: Lease, directory: str, name: str):
+        with lease.lock:
+            try:
+                os.rename(self._path(RUNNING, lease.file_name), self._path(directory, name))
+            except FileNotFoundError:
+                raise LeaseLost(f"Lease on job '{lease.job_id}' expired and was taken over") from None
+
+    def renew(self, lease: Lease):
+        """Extend the lease by ``lease_seconds`` from now."""
+        with lease.lock:
+            old_path = self._path(RUNNING, lease.file_name)
+            expires = lease.expires
+            lease.expires = time.time() + self.lease_seconds
+            try:
+                os.rename(old_path, self._path(RUNNING, lease.file_name))
+            except FileNotFoundError:
+                lease.expires = expires
+                raise LeaseLost(f"Lease on job '{lease.job_id}' expired and was taken over") from None
+
+    def complete(self, lease: Lease):
+        self._move(lease, DONE, lease.job_id)
+
+    def fail(self, lease: Lease, error: str):
+        """Put the job back for another attempt, or mark it failed after ``max_attempts``."""
+        if lease.attempt < self.max_attempts:
+            self._move(lease, PENDING, lease.job_id)
+        else:
+            self._move(lease, FAILED, lease.job_id)
+            self._write_state(FAILED, lease.job_id, {"attempts": lease.attempt, "error": error})
+
+    def recover(self, now: float = None) -> int:
+        """Requeue the jobs whose leases have expired; returns how many."""
+        now = time.time() if now is None else now
+        recovered = 0
+        for name in os.listdir(os.path.join(self.root, RUNNING)):
+            try:
+                job_id, _, expires = name.rsplit(_SEPARATOR, 2)
+                if float(expires) > now:
+                    continue
+                path = self._path(RUNNING, name)
+                attempts = self._read_state(path).get("attempts", 0)
+                target = PENDING if attempts < self.max_attempts else FAILED
+                # Only one of several recovering workers wins this rename
+                os.rename(path, self._path(target, job_id))
+            except (FileNotFoundError, ValueError):
+                continue
+            if target == FAILED:
+                self._write_state(FAILED, job_id, {"attempts": attempts, "error": "lease expired"})
+            recovered += 1
+        return recovered
+
+
+class QueueWorker:
+    """Claim jobs and run ``handler(job_id, spec)`` on each until the queue is finished.
+
+    A background thread renews the lease every third of ``lease_seconds``
+    while the handler runs. A handler that raises fails the job (it is
+    retried up to ``max_attempts``). With ``exit_when_idle`` the worker
+    returns once nothing is pending or running; otherwise it polls until
+    ``stop_event`` is set. Idle workers recover expired leases, so jobs of
+    crashed workers are picked up by the survivors.
+    """
+
+    def __init__(self, queue: WorkQueue, handler: Callable[[str, Dict], None], worker_id: str = None,
+                 poll_interval: float = 1.0):
+        self.queue = queue
+        self.handler = handler
+        self.worker_id = worker_id or default_worker_id()
+        self.poll_interval = poll_interval
+        self.completed = 0
+        self.failed = 0
+        self.lost = 0
+
+    def run(self, stop_event: threading.Event = None, exit_when_idle: bool = True):
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set():
+            lease = self.queue.claim(self.worker_id)
+            if lease is not None:
+                self.process(lease)
+            elif self.queue.recover():
+                continue
+            elif exit_when_idle and not any(self.queue.counts()[state] for state in (PENDING, RUNNING)):
+                return
+            else:
+                stop_event.wait(self.poll_interval)
+
+    def process(self, lease: Lease):
+        done = threading.Event()
+        lost = threading.Event()
+
+        def heartbeat():
+            while not done.wait(self.queue.lease_seconds / 3):
+                try:
+                    self.queue.renew(lease)
+                except LeaseLost:
+                    lost.set()
+                    return
+
+        thread = threading.Thread(target=heartbeat, daemon=True)
+        thread.start()
+        error = None
+        try:
+            self.handler(lease.job_id, lease.spec)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            done.set()
+            thread.join()
+        try:
+            if lost.is_set():
+                raise LeaseLost(lease.job_id)
+            if error is None:
+                self.queue.complete(lease)
+                self.completed += 1
+            else:
+                self.queue.fail(lease, error)
+                self.failed += 1
+        except LeaseLost:
+            self.lost += 1
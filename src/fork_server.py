@@ -0,0 +1,176 @@
+import argparse
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from course_generator.assets import AssetStore
+from course_generator.batch import atomic_output
+from course_generator.generator import CourseGenerator
+from course_generator.server_socket import bind_unix_socket, check_output_path, default_socket_path
+from course_generator.snapshot import SnapshotReloader
+from main import LEVEL_CHOICES
+from pdf_generator.fonts import HELVETICA
+from pdf_generator.generator import course_styles
+from pdf_generator.profiles import PROFILES
+from pdf_generator.renderer import FORMATS, create_renderer
+
+# Keep in sync with submit.py, which avoids importing this module
+DEFAULT_SOCKET = default_socket_path("fork-server.sock")
+
+class ForkServer:
+    """Serve course jobs from a process that has already paid the startup cost.
+
+    The parent imports reportlab, loads the vocabulary and templates, builds
+    the styles and renders a throwaway course to warm reportlab's lazy caches.
+    Each job is then handled by a forked child that inherits all of it
+    copy-on-write, writes one document and exits.
+
+    Requests and responses are single JSON lines over a Unix socket that
+    only the server's user can connect to. A job's ``output`` must be an
+    absolute path, inside ``output_root`` when one is given.
+    """
+
+    def __init__(self, socket_path, vocabulary_path, templates_path, max_jobs=None, watch=False,
+                 output_root=None):
+        self.socket_path = socket_path
+        self.output_root = output_root
+        self.max_jobs = max_jobs or os.cpu_count() or 1
+        self.children = set()
+        self.generator = CourseGenerator(vocabulary_path, templates_path)
+        self.asset_store = AssetStore(os.path.dirname(os.path.abspath(vocabulary_path)))
+        self.listener = None
+        # Polled from the accept loop rather than a thread: forking while
+        # another thread holds a lock can deadlock the child
+        self.reloader = SnapshotReloader(
+            self.generator,
+            on_reload=lambda snapshot: print(f"✓ Reloaded data (version {snapshot.version})", flush=True),
+            on_error=lambda error: print(f"❌ Data not reloaded: {error}", flush=True)
+        ) if watch else None
+
+    def preload(self):
+        """Build everything the children would otherwise build per job."""
+        course_styles(HELVETICA)
+        for template_name in self.generator.program_templates:
+            course = self.generator.generate_course("Warm-up", 1, template_name, seed=0)
+            for format_name in FORMATS:
+                if format_name != "pdf":
+                    create_renderer(format_name, io.StringIO()).render(course)
+                    continue
+                for profile in PROFILES:
+                    create_renderer(format_name, io.BytesIO(), profile=profile,
+                                    asset_store=self.asset_store).render(course)
+
+    def serve_forever(self):
+        self.listener = bind_unix_socket(self.socket_path)
+        self.listener.listen(64)
+        print(f"🤸 Fork server ready on {self.socket_path}", flush=True)
+        # Wake up now and then to reap children even when no jobs arrive
+        self.listener.settimeout(1.0)
+        try:
+            while True:
+                self.reap(block=len(self.children) >= self.max_jobs)
+                if self.reloader:
+                    self.reloader.check()
+                try:
+                    conn, _ = self.listener.accept()
+                except socket.timeout:
+                    continue
+                pid = os.fork()
+                if pid == 0:
+                    self.run_child(conn)
+                conn.close()
+                self.children.add(pid)
+        finally:
+            self.listener.close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            while self.children:
+                self.reap(block=True)
+
+    def reap(self, block=False):
+        while self.children:
+            pid, _ = os.waitpid(-1, 0 if block else os.WNOHANG)
+            if pid == 0:
+                return
+            self.children.discard(pid)
+            block = False
+
+    def run_child(self, conn):
+        """Handle one job in a forked child; never returns."""
+        status = 0
+        try:
+            self.listener.close()
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            # Children share the parent's random state; without this, every
+            # unseeded job would get the same course
+            self.generator.random.seed()
+            conn.settimeout(None)
+            with conn, conn.makefile('r', encoding='utf-8') as reader:
+                try:
+                    response = self.handle(json.loads(reader.readline()))
+                except Exception as e:
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                conn.sendall((json.dumps(response) + "\n").encode('utf-8'))
+        except BaseException:
+            status = 1
+        finally:
+            os._exit(status)
+
+    def handle(self, request):
+        start = time.perf_counter()
+        level = str(request.get("level") or "beginner")
+        if level not in LEVEL_CHOICES:
+            raise ValueError(f"Unknown level '{level}'. Choose from: {', '.join(sorted(LEVEL_CHOICES))}")
+        format_name = request.get("format") or "pdf"
+        output_path = check_output_path(request.get("output"), self.output_root)
+        course = self.generator.stream_course(
+            request.get("name") or "21-Day Handstand Challenge",
+            int(request.get("days") or 21),
+            LEVEL_CHOICES[level],
+            request.get("seed")
+        )
+        with atomic_output(output_path) as tmp_path:
+            create_renderer(format_name, tmp_path, profile=request.get("profile"),
+                            asset_store=self.asset_store, appendix=bool(request.get("appendix"))).render(course)
+        return {
+            "ok": True,
+            "output": output_path,
+            "seed": course.seed,
+            "seconds": round(time.perf_counter() - start, 6)
+        }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Preload the generator and fork a child per job. Submit jobs with submit.py.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"Unix socket to listen on (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--max-jobs", type=int, help="Jobs running at once (default: CPU count)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Reload the vocabulary and templates when the files change")
+    parser.add_argument("--output-root", help="Only write jobs' output files inside this directory")
+    args = parser.parse_args(argv)
+
+    # Get the absolute paths
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    vocabulary_path = os.path.join(project_root, "data", "exercises", "vocabulary.json")
+    templates_path = os.path.join(project_root, "data", "exercises", "program_templates.json")
+
+    server = ForkServer(args.socket, vocabulary_path, templates_path, args.max_jobs, args.watch, args.output_root)
+    server.preload()
+    # SIGTERM shuts down like Ctrl-C: stop accepting, wait for running jobs
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    except (OSError, RuntimeError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print("✓ Fork server stopped")
+
+if __name__ == "__main__":
+    sys.exit(main())
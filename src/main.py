@@ -1,11 +1,42 @@
+import argparse
 import os
+from course_generator.assets import AssetStore
 from course_generator.generator import CourseGenerator
+from course_generator.metrics import REGISTRY
+from course_generator.profiling import AllocationProfiler
 from pdf_generator.generator import PDFGenerator
+from pdf_generator.profiles import DEFAULT_PROFILE, PROFILES
+from pdf_generator.renderer import FORMATS, create_renderer
 
-def main():
-    print("🤸 Handstand Course Generator 🤸")
-    print("=" * 50)
-    
+LEVEL_CHOICES = {
+    "1": "beginner_handstand",
+    "2": "intermediate_handstand",
+    "3": "advanced_handstand",
+    "beginner": "beginner_handstand",
+    "intermediate": "intermediate_handstand",
+    "advanced": "advanced_handstand"
+}
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate a handstand course document. Without course options, asks interactively.")
+    parser.add_argument("--name", help="Course name")
+    parser.add_argument("--days", type=int, help="Number of days")
+    parser.add_argument("--level", choices=sorted(LEVEL_CHOICES), help="Difficulty level")
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible course")
+    parser.add_argument("--format", choices=FORMATS, default="pdf",
+                        help="Output format: PDF for print, HTML or Markdown for phones (default: pdf)")
+    parser.add_argument("--output-profile", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                        help=f"PDF size/speed trade-off: draft, screen or print (default: {DEFAULT_PROFILE})")
+    parser.add_argument("--appendix", action="store_true",
+                        help="PDF only: describe each exercise once in a linked appendix instead of in every session")
+    parser.add_argument("--output", help="Output file (default: handstand_course.<format> in the project root)")
+    parser.add_argument("--metrics-file", help="Write Prometheus metrics here when done ('-' for stdout)")
+    parser.add_argument("--profile-memory", metavar="REPORT",
+                        help="Trace allocations per stage with tracemalloc and write a JSON report")
+    return parser.parse_args(argv)
+
+def prompt_course_options():
     # Get user input
     course_name = input("Enter course name (default: '21-Day Handstand Challenge'): ").strip()
     if not course_name:
@@ -24,12 +55,46 @@ def main():
     print("3. Advanced (advanced_handstand)")
     difficulty_choice = input("Enter choice (default: 1): ").strip() or "1"
     
-    difficulty_map = {
-        "1": "beginner_handstand",
-        "2": "intermediate_handstand",
-        "3": "advanced_handstand"
-    }
-    template_name = difficulty_map.get(difficulty_choice, "beginner_handstand")
+    template_name = LEVEL_CHOICES.get(difficulty_choice, "beginner_handstand")
+    return course_name, days, template_name
+
+def profile_run(vocabulary_path, templates_path, course_name, days, template_name, seed, renderer, report_path):
+    """Run each pipeline stage separately under tracemalloc and report per stage.
+
+    Generation and rendering normally overlap (sessions are streamed into the
+    document), so here the course and the PDF story are materialized to tell
+    them apart.
+    """
+    profiler = AllocationProfiler()
+    with profiler:
+        with profiler.stage("load"):
+            generator = CourseGenerator(vocabulary_path, templates_path)
+        with profiler.stage("generate"):
+            course = generator.generate_course(course_name, days, template_name, seed)
+        if isinstance(renderer, PDFGenerator):
+            with profiler.stage("build story"):
+                story = list(renderer.course_flowables(course))
+            with profiler.stage("doc.build"):
+                renderer.build(story)
+        else:
+            with profiler.stage("render"):
+                renderer.render(course)
+    
+    print(profiler.format_text())
+    profiler.write_json(report_path)
+    print(f"✓ Memory report: {report_path}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    print("🤸 Handstand Course Generator 🤸")
+    print("=" * 50)
+    
+    if args.name is None and args.days is None and args.level is None:
+        course_name, days, template_name = prompt_course_options()
+    else:
+        course_name = args.name or "21-Day Handstand Challenge"
+        days = args.days or 21
+        template_name = LEVEL_CHOICES[args.level or "beginner"]
     
     print(f"\nGenerating {days}-day course: '{course_name}' (Level: {template_name})...")
     
@@ -38,19 +103,26 @@ def main():
     project_root = os.path.dirname(current_dir)
     vocabulary_path = os.path.join(project_root, "data", "exercises", "vocabulary.json")
     templates_path = os.path.join(project_root, "data", "exercises", "program_templates.json")
+    output_path = args.output or os.path.join(project_root, f"handstand_course.{args.format}")
+    renderer = create_renderer(args.format, output_path, profile=args.output_profile,
+                               asset_store=AssetStore(os.path.join(project_root, "data", "exercises")),
+                               appendix=args.appendix)
     
-    # Generate the course
-    generator = CourseGenerator(vocabulary_path, templates_path)
-    course = generator.generate_course(course_name, days, template_name)
-    
-    print(f"✓ Course generated with {len(course.sessions)} sessions")
-    
-    # Generate PDF
-    output_path = os.path.join(project_root, "handstand_course.pdf")
-    pdf_generator = PDFGenerator(output_path)
-    pdf_generator.generate_pdf(course)
+    if args.profile_memory:
+        profile_run(vocabulary_path, templates_path, course_name, days, template_name,
+                    args.seed, renderer, args.profile_memory)
+    else:
+        # Generate the course lazily: sessions are produced while the document is written
+        generator = CourseGenerator(vocabulary_path, templates_path)
+        course = generator.stream_course(course_name, days, template_name, args.seed)
+        
+        renderer.render(course)
+        
+        print(f"✓ Course generated with {course.days} sessions")
+    print(f"✓ {args.format.upper()} generated: {output_path}")
     
-    print(f"✓ PDF generated: {output_path}")
+    if args.metrics_file:
+        REGISTRY.write_textfile(args.metrics_file)
     print("\n✨ Course generation complete! ✨")
 
 if __name__ == "__main__":
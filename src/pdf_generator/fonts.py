@@ -0,0 +1,92 @@
+import functools
+import os
+import threading
+from typing import Dict, Optional
+
+import reportlab
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+
+# Bitstream Vera ships with reportlab and covers Latin-1 (e.g. "Relevé")
+REPORTLAB_FONTS_DIR = os.path.join(os.path.dirname(reportlab.__file__), "fonts")
+
+_registry_lock = threading.Lock()
+_families: Dict[str, 'FontFamily'] = {}
+
+
+class FontFamily:
+    """Names of the registered regular and bold faces of one font family."""
+
+    def __init__(self, name: str, regular: str, bold: str, embedded: bool = True):
+        self.name = name
+        self.regular = regular
+        self.bold = bold
+        # Standard PDF fonts are never embedded; TTF families always are
+        self.embedded = embedded
+
+    def __repr__(self):
+        return f"FontFamily({self.name!r}, regular={self.regular!r}, bold={self.bold!r})"
+
+
+HELVETICA = FontFamily("Helvetica", "Helvetica", "Helvetica-Bold", embedded=False)
+
+
+class SubsetCachingTTFont(TTFont):
+    """A TTFont that remembers the glyph subsets it has already built.
+
+    reportlab re-subsets every font for every document. Courses in a batch use
+    nearly the same characters, so the subset bytes are cached by the exact
+    code points they contain and reused by later documents.
+    """
+
+    def __init__(self, name: str, filename: str, subset_cache_size: int = 256):
+        super().__init__(name, filename)
+        make_subset = self.face.makeSubset
+
+        @functools.lru_cache(maxsize=subset_cache_size)
+        def cached_subset(codes):
+            return make_subset(list(codes))
+
+        self.subset_cache = cached_subset
+        self.face.makeSubset = lambda subset: cached_subset(tuple(subset))
+
+
+def register_font_family(name: str, regular_path: str, bold_path: Optional[str] = None) -> FontFamily:
+    """Register a TrueType family once per process and return it.
+
+    The parsed font tables live in reportlab's global font registry and are
+    shared by every ``PDFGenerator``; registering the same name again is a
+    cheap lookup. Without ``bold_path`` the regular face is used for bold text.
+    """
+    family = _families.get(name)
+    if family is not None:
+        return family
+    with _registry_lock:
+        family = _families.get(name)
+        if family is None:
+            regular = name
+            bold = f"{name}-Bold" if bold_path else name
+            pdfmetrics.registerFont(SubsetCachingTTFont(regular, regular_path))
+            if bold_path:
+                pdfmetrics.registerFont(SubsetCachingTTFont(bold, bold_path))
+            # Let <b> markup in paragraphs find the bold face
+            addMapping(name, 0, 0, regular)
+            addMapping(name, 1, 0, bold)
+            addMapping(name, 0, 1, regular)
+            addMapping(name, 1, 1, bold)
+            family = _families[name] = FontFamily(name, regular, bold)
+    return family
+
+
+def default_unicode_family() -> FontFamily:
+    """Register and return the Vera family bundled with reportlab."""
+    return register_font_family(
+        "Vera",
+        os.path.join(REPORTLAB_FONTS_DIR, "Vera.ttf"),
+        os.path.join(REPORTLAB_FONTS_DIR, "VeraBd.ttf")
+    )
+
+
+def registered_families() -> Dict[str, FontFamily]:
+    return dict(_families)
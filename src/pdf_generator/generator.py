@@ -1,78 +1,354 @@
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle, Image, Flowable
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from typing import Dict, Iterable, Iterator, Optional
+import re
+from xml.sax.saxutils import escape
+import functools
 import sys
 import os
+import time
 
 # Add parent directory to path to import from course_generator
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from course_generator.metrics import BYTES_WRITTEN, DOCUMENTS_RENDERED, PDF_PAGES, RENDER_SECONDS
 from course_generator.models import Course
+from .fonts import FontFamily, HELVETICA, default_unicode_family
+from .layout_cache import DESCRIPTION_LAYOUT_CACHE, ParagraphLayoutCache
+from .profiles import OutputProfile, get_profile
+from .renderer import CourseRenderer
 
-class PDFGenerator:
-    def __init__(self, output_path: str):
-        self.output_path = output_path
-        self.doc = SimpleDocTemplate(output_path, pagesize=letter)
-        self.styles = getSampleStyleSheet()
+
+class StreamingStory(list):
+    """A story list that pulls flowables from an iterator as the build consumes them.
+
+    ``doc.build`` checks ``len(story)`` before handling each flowable, so the
+    buffer is topped up there and never holds more than a few sessions' worth
+    of flowables.
+    """
+
+    def __init__(self, flowables: Iterable, buffer_size: int = 64):
+        super().__init__()
+        self._source = iter(flowables)
+        self.buffer_size = buffer_size
+
+    def __len__(self):
+        while self._source is not None and super().__len__() < self.buffer_size:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+        return super().__len__()
+
+
+class Bookmark(Flowable):
+    """An invisible flowable that marks a link destination and an outline entry."""
+
+    def __init__(self, key: str, title: str, level: int = 0):
+        super().__init__()
+        self.key = key
+        self.title = title
+        self.level = level
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkHorizontal(self.key, 0, 0)
+        self.canv.addOutlineEntry(self.title, self.key, self.level)
+        self.canv.showOutline()
+
+
+class LinkedTable(Table):
+    """A table whose first-column cells link to named destinations.
+
+    The cells stay plain strings, which draw far faster than paragraphs, and
+    each link is a single annotation covering the whole cell.
+    """
+
+    def __init__(self, data, links: Dict[int, str] = None, **kwargs):
+        super().__init__(data, **kwargs)
+        self.links = links or {}
+
+    def split(self, availWidth, availHeight):
+        # reportlab splits into new tables of consecutive rows; renumber the links
+        parts = super().split(availWidth, availHeight)
+        first_row = 0
+        for part in parts:
+            part.links = {row - first_row: anchor for row, anchor in self.links.items()
+                          if first_row <= row < first_row + len(part._cellvalues)}
+            first_row += len(part._cellvalues)
+        return parts
+
+    def draw(self):
+        super().draw()
+        left, right = self._colpositions[0], self._colpositions[1]
+        for row, anchor in self.links.items():
+            top, bottom = self._rowpositions[row], self._rowpositions[row + 1]
+            self.canv.linkRect("", anchor, (left, bottom, right, top), relative=1, thickness=0)
+
+
+def anchor_name(exercise) -> str:
+    """Name of the appendix destination of an exercise."""
+    return "exercise-" + re.sub(r'[^A-Za-z0-9_-]', '_', exercise.exercise_id or exercise.name)
+
+
+@functools.lru_cache(maxsize=None)
+def course_styles(font_family: FontFamily) -> Dict[str, ParagraphStyle]:
+    """Build the paragraph styles for one font family, once per process."""
+    sample = getSampleStyleSheet()
+    styles = {'sample': sample}
+    
+    styles['body'] = ParagraphStyle(
+        'CustomBody',
+        parent=sample['Normal'],
+        fontName=font_family.regular
+    )
+    
+    # Create custom styles
+    styles['title'] = ParagraphStyle(
+        'CustomTitle',
+        parent=sample['Heading1'],
+        fontName=font_family.bold,
+        fontSize=24,
+        textColor=colors.HexColor('#2C3E50'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    
+    styles['heading'] = ParagraphStyle(
+        'CustomHeading',
+        parent=sample['Heading2'],
+        fontName=font_family.bold,
+        fontSize=18,
+        textColor=colors.HexColor('#34495E'),
+        spaceAfter=12,
+        spaceBefore=12
+    )
+    
+    styles['description'] = ParagraphStyle(
+        'ExerciseDescription',
+        parent=sample['Normal'],
+        fontName=font_family.regular,
+        fontSize=10,
+        leading=12
+    )
+    
+    styles['section'] = ParagraphStyle(
+        'SectionHeading',
+        parent=sample['Heading3'],
+        fontName=font_family.bold,
+        fontSize=14,
+        textColor=colors.HexColor('#16A085'),
+        spaceAfter=8,
+        spaceBefore=8
+    )
+    return styles
+
+
+# Side of the box exercise thumbnails are fitted into
+IMAGE_BOX = 1.2 * inch
+
+# Exercise names that link to their appendix entry
+LINK_COLOR = colors.HexColor('#1F5F99')
+
+# Formats reportlab can draw; vector images are left out of PDFs
+_DRAWABLE_IMAGES = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+
+
+def resolve_font_family(profile: OutputProfile, font_family: Optional[FontFamily]) -> FontFamily:
+    """Pick the font family a profile renders with.
+
+    An explicit family is never swapped for the standard fonts, which would
+    lose every glyph outside Latin-1.
+    """
+    if profile.embed_fonts is False and font_family is None:
+        return HELVETICA
+    if profile.embed_fonts and (font_family is None or not font_family.embedded):
+        return default_unicode_family()
+    return font_family or HELVETICA
+
+
+class PDFGenerator(CourseRenderer):
+    format_name = 'pdf'
+    extension = 'pdf'
+
+    def __init__(self, output_path: str, font_family: FontFamily = None, full_descriptions: bool = None,
+                 layout_cache: ParagraphLayoutCache = None, profile=None, asset_store=None,
+                 appendix: bool = False):
+        super().__init__(output_path)
+        # In appendix mode session tables only name the exercises and link to
+        # one entry per unique exercise at the end, with its description and
+        # image; sessions and entries are also added to the PDF outline
+        self.appendix = appendix
+        self.appendix_exercises = {}
+        # A profile name ("draft", "screen", "print") or an OutputProfile;
+        # explicit arguments override what the profile says
+        self.profile = get_profile(profile)
+        # Full descriptions are wrapped paragraphs laid out once per process
+        # through the shared cache; otherwise they are cut to 50 characters
+        self.full_descriptions = self.profile.full_descriptions if full_descriptions is None else full_descriptions
+        self.layout_cache = layout_cache if layout_cache is not None else DESCRIPTION_LAYOUT_CACHE
+        # Exercise images are asset paths; the store maps them to the
+        # thumbnail the profile asks for. Without a store there are no images
+        self.asset_store = asset_store
+        self.doc = SimpleDocTemplate(output_path, pagesize=letter,
+                                     pageCompression=int(self.profile.page_compression))
         self.story = []
+        # Register TTF families once with fonts.register_font_family and pass
+        # them in; the default Helvetica only covers Latin-1
+        self.font_family = resolve_font_family(self.profile, font_family)
         
-        # Create custom styles
-        self.title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2C3E50'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        
-        self.heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=self.styles['Heading2'],
-            fontSize=18,
-            textColor=colors.HexColor('#34495E'),
-            spaceAfter=12,
-            spaceBefore=12
-        )
-        
-        self.section_style = ParagraphStyle(
-            'SectionHeading',
-            parent=self.styles['Heading3'],
-            fontSize=14,
-            textColor=colors.HexColor('#16A085'),
-            spaceAfter=8,
-            spaceBefore=8
-        )
+        styles = course_styles(self.font_family)
+        self.styles = styles['sample']
+        self.body_style = styles['body']
+        self.title_style = styles['title']
+        self.heading_style = styles['heading']
+        self.description_style = styles['description']
+        self.section_style = styles['section']
+
+    def render(self, course: Course):
+        self.generate_pdf(course)
 
     def generate_pdf(self, course: Course):
-        """Generate a PDF from the course."""
+        """Generate a PDF from the course.
+
+        Sessions are pulled from ``course.iter_sessions()`` while the document
+        is being built, so streamed courses are rendered with bounded memory.
+        """
+        self.build(StreamingStory(self.course_flowables(course)))
+
+    def build(self, story: list):
+        """Build the PDF from a prepared story and record render metrics."""
+        start = time.perf_counter()
+        self.story = story
         
+        # Build the PDF
+        self.doc.build(self.story)
+        
+        RENDER_SECONDS.labels(format='pdf').observe(time.perf_counter() - start)
+        DOCUMENTS_RENDERED.labels(format='pdf').inc()
+        PDF_PAGES.inc(self.doc.page)
+        if isinstance(self.output_path, str):
+            BYTES_WRITTEN.labels(format='pdf').inc(os.path.getsize(self.output_path))
+        else:
+            BYTES_WRITTEN.labels(format='pdf').inc(self.output_path.tell())
+
+    def course_flowables(self, course: Course) -> Iterator:
+        """Yield the flowables for the whole course, session by session."""
+        self.appendix_exercises = {}
         # Title page
-        self.story.append(Paragraph(course.name, self.title_style))
-        self.story.append(Spacer(1, 0.5 * inch))
-        self.story.append(Paragraph(f"{course.days}-Day Program", self.styles['Normal']))
-        self.story.append(PageBreak())
+        yield Paragraph(course.name, self.title_style)
+        yield Spacer(1, 0.5 * inch)
+        yield Paragraph(f"{course.days}-Day Program", self.body_style)
+        yield PageBreak()
         
         # Add each session
-        for session in course.sessions:
-            self.add_session(session)
-            self.story.append(PageBreak())
+        for index, session in enumerate(course.iter_sessions()):
+            if self.appendix:
+                yield Bookmark(f"session-{index + 1}", session.name)
+            yield from self.session_flowables(session)
+            yield PageBreak()
         
-        # Build the PDF
-        self.doc.build(self.story)
+        if self.appendix:
+            yield from self.appendix_flowables()
 
     def add_session(self, session):
         """Add a session to the PDF."""
+        self.story.extend(self.session_flowables(session))
+
+    def description_cell(self, description: str):
+        """Return the table cell content for an exercise description."""
+        if self.full_descriptions:
+            return self.layout_cache.paragraph(description, self.description_style)
+        return description[:50] + '...' if len(description) > 50 else description
+
+    def image_path(self, exercise) -> Optional[str]:
+        """Return the file of the thumbnail to print for an exercise, if any."""
+        if self.asset_store is None or not self.profile.image_size or not exercise.image:
+            return None
+        image = exercise.image[0] if isinstance(exercise.image, list) else exercise.image
+        if os.path.splitext(image)[1].lower() not in _DRAWABLE_IMAGES:
+            return None
+        path = os.path.join(self.asset_store.base_dir, self.asset_store.thumbnail(image, self.profile.image_size))
+        return path if os.path.isfile(path) else None
+
+    def exercise_cell(self, exercise):
+        """Return the table cell content for an exercise name, with its thumbnail."""
+        path = self.image_path(exercise)
+        if path is None:
+            return exercise.name
+        image = Image(path, width=IMAGE_BOX, height=IMAGE_BOX, kind='proportional')
+        return [image, Spacer(1, 4), Paragraph(escape(exercise.name), self.description_style)]
+
+    def appendix_flowables(self) -> Iterator:
+        """Yield one entry per unique exercise used in the sessions, by name."""
+        yield Bookmark("appendix", "Exercise Appendix")
+        yield Paragraph("Exercise Appendix", self.heading_style)
+        for anchor, exercise in sorted(self.appendix_exercises.items(), key=lambda item: item[1].name):
+            yield Bookmark(anchor, exercise.name, level=1)
+            yield Paragraph(escape(exercise.name), self.section_style)
+            path = self.image_path(exercise)
+            if path is not None:
+                yield Image(path, width=IMAGE_BOX, height=IMAGE_BOX, kind='proportional', hAlign='LEFT')
+                yield Spacer(1, 4)
+            yield self.layout_cache.paragraph(exercise.description, self.description_style)
+            details = [f"Equipment: {exercise.equipment}"] if exercise.equipment else []
+            if exercise.primary_muscle_groups:
+                details.append(f"Muscles: {', '.join(exercise.primary_muscle_groups)}")
+            if details:
+                yield Spacer(1, 2)
+                yield self.layout_cache.paragraph(" · ".join(details), self.description_style)
+            yield Spacer(1, 0.15 * inch)
+
+    def table_style(self) -> TableStyle:
+        """Style of the exercise tables; undecorated tables skip fills and use a hairline grid."""
+        commands = [
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), self.font_family.bold),
+            ('FONTNAME', (0, 1), (-1, -1), self.font_family.regular),
+            ('FONTSIZE', (0, 1), (-1, -1), 10),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]
+        if not self.profile.decorated:
+            return TableStyle(commands + [('GRID', (0, 0), (-1, -1), 0.25, colors.black)])
+        return TableStyle(commands + [
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ])
+
+    def session_flowables(self, session) -> Iterator:
+        """Yield the flowables for a single session."""
         # Session title
-        self.story.append(Paragraph(session.name, self.heading_style))
-        self.story.append(Spacer(1, 0.2 * inch))
+        yield Paragraph(session.name, self.heading_style)
+        yield Spacer(1, 0.2 * inch)
         
         # Add each section
         for section_name, exercises in session.sections.items():
-            self.story.append(Paragraph(section_name, self.section_style))
+            yield Paragraph(section_name, self.section_style)
+            
+            if self.appendix:
+                table_data = [['Exercise', 'Sets', 'Reps']]
+                links = {}
+                for row, exercise in enumerate(exercises, start=1):
+                    anchor = anchor_name(exercise)
+                    self.appendix_exercises.setdefault(anchor, exercise)
+                    links[row] = anchor
+                    table_data.append([exercise.name, str(exercise.sets), exercise.reps])
+                table = LinkedTable(table_data, links, colWidths=[4.6*inch, 0.8*inch, 1.6*inch])
+                table.setStyle(self.table_style())
+                table.setStyle([('TEXTCOLOR', (0, 1), (0, -1), LINK_COLOR)])
+                yield table
+                yield Spacer(1, 0.3 * inch)
+                continue
             
             # Create a table for exercises
             table_data = []
@@ -80,27 +356,15 @@ class PDFGenerator:
             
             for exercise in exercises:
                 table_data.append([
-                    exercise.name,
-                    exercise.description[:50] + '...' if len(exercise.description) > 50 else exercise.description,
+                    self.exercise_cell(exercise),
+                    self.description_cell(exercise.description),
                     str(exercise.sets),
                     exercise.reps
                 ])
             
             # Create and style the table
             table = Table(table_data, colWidths=[2*inch, 3*inch, 0.7*inch, 1.3*inch])
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 10),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ]))
+            table.setStyle(self.table_style())
             
-            self.story.append(table)
-            self.story.append(Spacer(1, 0.3 * inch))
+            yield table
+            yield Spacer(1, 0.3 * inch)
@@ -0,0 +1,119 @@
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Tuple
+
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
+from xml.sax.saxutils import escape
+
+# Style attributes that change how text is parsed or broken into lines
+_LAYOUT_ATTRIBUTES = (
+    'fontName', 'fontSize', 'leading', 'leftIndent', 'rightIndent', 'firstLineIndent',
+    'alignment', 'wordWrap', 'splitLongWords', 'autoLeading', 'textColor', 'textTransform',
+    'allowWidows', 'allowOrphans', 'hyphenationLang', 'embeddedHyphenation', 'uriWasteReduce',
+    'justifyLastLine', 'justifyBreaks', 'spaceShrinkage'
+)
+
+
+def style_key(style: ParagraphStyle) -> Tuple:
+    """Identify a style by the attributes that affect layout, not by object identity."""
+    return tuple(repr(getattr(style, name, None)) for name in _LAYOUT_ATTRIBUTES)
+
+
+class CachedParagraph(Paragraph):
+    """A Paragraph whose line breaking is looked up in a shared cache.
+
+    reportlab re-breaks a paragraph every time it is wrapped, and tables wrap
+    each cell more than once. Identical text in the same style and width is
+    laid out once per process; later copies only borrow the result.
+    """
+
+    def __init__(self, text: str, style: ParagraphStyle, cache: 'ParagraphLayoutCache',
+                 key: Tuple, frags=None):
+        super().__init__(text, style, frags=frags)
+        self._layout_cache = cache
+        self._layout_key = key
+
+    def wrap(self, availWidth, availHeight):
+        key = self._layout_key + (round(availWidth, 3),)
+        layout = self._layout_cache._get_layout(key)
+        if layout is None:
+            width, height = super().wrap(availWidth, availHeight)
+            self._layout_cache._put_layout(
+                key, (self.blPara, height, self._wrapWidths, getattr(self, '_width_max', None)))
+            return width, height
+        self.width = availWidth
+        self.blPara, self.height, self._wrapWidths, self._width_max = layout
+        return self.width, self.height
+
+
+class ParagraphLayoutCache:
+    """Process-wide, size-bounded cache of parsed and wrapped paragraphs.
+
+    Parsed markup is keyed by (text, style) and line breaks by
+    (text, style, width), so each unique description is parsed and measured
+    once however many sessions and courses repeat it.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._frags: 'OrderedDict[Tuple, list]' = OrderedDict()
+        self._layouts: 'OrderedDict[Tuple, tuple]' = OrderedDict()
+        # Dropped with their style, so styles built per generator don't pile up
+        self._style_keys: 'weakref.WeakKeyDictionary[ParagraphStyle, Tuple]' = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def paragraph(self, text: str, style: ParagraphStyle) -> CachedParagraph:
+        """Return a paragraph for plain ``text`` (markup characters are escaped)."""
+        key = (text, self._style_key(style))
+        with self._lock:
+            frags = self._frags.get(key)
+            if frags is not None:
+                self._frags.move_to_end(key)
+        paragraph = CachedParagraph(escape(text), style, self, key, frags=frags)
+        if frags is None:
+            self._remember(self._frags, key, paragraph.frags)
+        return paragraph
+
+    def clear(self):
+        with self._lock:
+            self._frags.clear()
+            self._layouts.clear()
+            self._style_keys.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._layouts)
+
+    def _style_key(self, style: ParagraphStyle) -> Tuple:
+        # Styles are long-lived, so their key is worked out once per object
+        with self._lock:
+            key = self._style_keys.get(style)
+            if key is None:
+                key = self._style_keys[style] = style_key(style)
+            return key
+
+    def _get_layout(self, key: Tuple):
+        with self._lock:
+            layout = self._layouts.get(key)
+            if layout is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._layouts.move_to_end(key)
+            return layout
+
+    def _put_layout(self, key: Tuple, layout: tuple):
+        self._remember(self._layouts, key, layout)
+
+    def _remember(self, entries: OrderedDict, key: Tuple, value):
+        with self._lock:
+            entries[key] = value
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+
+DESCRIPTION_LAYOUT_CACHE = ParagraphLayoutCache()
@@ -0,0 +1,117 @@
+import functools
+import html
+import re
+from string import Formatter
+from typing import Callable, TextIO
+
+from .renderer import TextRenderer
+
+
+def compile_template(source: str) -> Callable[..., str]:
+    """Compile a ``str.format``-style template into a function of its fields.
+
+    The template is parsed once, at import time, into a function that only
+    joins literals and values, so rendering a row does no parsing at all.
+    Values are converted with ``str``; renderers escape them first.
+    """
+    parts = []
+    fields = []
+    for literal, field, _, _ in Formatter().parse(source):
+        if literal:
+            parts.append(repr(literal))
+        if field:
+            parts.append(f"str({field})")
+            if field not in fields:
+                fields.append(field)
+    code = f"def render({', '.join(fields)}):\n    return ''.join(({', '.join(parts)},))\n"
+    namespace = {}
+    exec(compile(code, f"<template {source[:30]!r}>", 'exec'), namespace)
+    return namespace['render']
+
+
+HTML_HEAD = compile_template(
+    '<!DOCTYPE html>\n'
+    '<html lang="en">\n'
+    '<head>\n'
+    '<meta charset="utf-8">\n'
+    '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+    '<title>{title}</title>\n'
+    '<style>\n'
+    'body{{font-family:-apple-system,Helvetica,Arial,sans-serif;max-width:40em;margin:0 auto;padding:1em;'
+    'color:#2C3E50;line-height:1.4}}\n'
+    'h1{{text-align:center}} h2{{color:#34495E;border-bottom:2px solid #3498DB}} h3{{color:#16A085}}\n'
+    'ul{{list-style:none;padding:0}} li{{background:#F5F5DC;border-radius:6px;margin:.5em 0;padding:.6em}}\n'
+    '.dose{{float:right;font-weight:bold}} li p{{margin:.3em 0 0}}\n'
+    '</style>\n'
+    '</head>\n'
+    '<body>\n'
+    '<h1>{title}</h1>\n'
+    '<p>{days}-Day Program</p>\n'
+)
+HTML_SESSION = compile_template('<section>\n<h2>{name}</h2>\n')
+HTML_SECTION = compile_template('<h3>{name}</h3>\n<ul>\n')
+HTML_EXERCISE = compile_template(
+    '<li><strong>{name}</strong> <span class="dose">{sets} &times; {reps}</span><p>{description}</p></li>\n')
+HTML_SECTION_END = '</ul>\n'
+HTML_SESSION_END = '</section>\n'
+HTML_FOOT = '</body>\n</html>\n'
+
+MARKDOWN_HEAD = compile_template('# {title}\n\n*{days}-Day Program*\n')
+MARKDOWN_SESSION = compile_template('\n## {name}\n')
+MARKDOWN_SECTION = compile_template('\n### {name}\n\n')
+MARKDOWN_EXERCISE = compile_template('- **{name}** — {sets} × {reps}  \n  {description}\n')
+
+_MARKDOWN_SPECIAL = re.compile(r'([\\`*_\[\]<>#|])')
+
+
+def escape_markdown(text: str) -> str:
+    return _MARKDOWN_SPECIAL.sub(r'\\\1', text)
+
+
+# The same exercises repeat across sessions and courses, so each distinct
+# row is rendered once per process
+@functools.lru_cache(maxsize=4096)
+def _html_exercise(name: str, description: str, sets: int, reps: str) -> str:
+    return HTML_EXERCISE(name=html.escape(name), sets=sets, reps=html.escape(reps),
+                         description=html.escape(description))
+
+
+@functools.lru_cache(maxsize=4096)
+def _markdown_exercise(name: str, description: str, sets: int, reps: str) -> str:
+    return MARKDOWN_EXERCISE(name=escape_markdown(name), sets=sets, reps=escape_markdown(reps),
+                             description=escape_markdown(description))
+
+
+class HTMLRenderer(TextRenderer):
+    """A single self-contained, phone-friendly HTML page."""
+
+    format_name = 'html'
+    extension = 'html'
+
+    def write(self, course, f: TextIO):
+        f.write(HTML_HEAD(title=html.escape(course.name), days=course.days))
+        for session in course.iter_sessions():
+            f.write(HTML_SESSION(name=html.escape(session.name)))
+            for section_name, exercises in session.sections.items():
+                f.write(HTML_SECTION(name=html.escape(section_name)))
+                f.write(''.join(
+                    _html_exercise(ex.name, ex.description, ex.sets, ex.reps) for ex in exercises))
+                f.write(HTML_SECTION_END)
+            f.write(HTML_SESSION_END)
+        f.write(HTML_FOOT)
+
+
+class MarkdownRenderer(TextRenderer):
+    """The course as Markdown, one heading per day and section."""
+
+    format_name = 'md'
+    extension = 'md'
+
+    def write(self, course, f: TextIO):
+        f.write(MARKDOWN_HEAD(title=escape_markdown(course.name), days=course.days))
+        for session in course.iter_sessions():
+            f.write(MARKDOWN_SESSION(name=escape_markdown(session.name)))
+            for section_name, exercises in session.sections.items():
+                f.write(MARKDOWN_SECTION(name=escape_markdown(section_name)))
+                f.write(''.join(
+                    _markdown_exercise(ex.name, ex.description, ex.sets, ex.reps) for ex in exercises))
@@ -0,0 +1,57 @@
+from typing import Dict, Optional, Union
+
+
+class OutputProfile:
+    """How much a PDF trades file size and fidelity against render time.
+
+    ``image_size`` is the longest edge, in pixels, of the thumbnail printed
+    next to each exercise (``None`` leaves images out). ``embed_fonts`` is
+    True to always embed the fonts (the bundled Vera family when none is
+    given), False to use the standard PDF fonts, which are never embedded,
+    unless the caller passes a family, and None to use whichever family the
+    caller passes.
+    ``decorated`` adds the coloured table fills and heavy grid.
+    """
+
+    def __init__(self, name: str, description: str, page_compression: bool, image_size: Optional[int],
+                 embed_fonts: Optional[bool], full_descriptions: bool, decorated: bool):
+        self.name = name
+        self.description = description
+        self.page_compression = page_compression
+        self.image_size = image_size
+        self.embed_fonts = embed_fonts
+        self.full_descriptions = full_descriptions
+        self.decorated = decorated
+
+    def __repr__(self):
+        return f"OutputProfile({self.name!r})"
+
+
+PROFILES: Dict[str, OutputProfile] = {
+    profile.name: profile for profile in (
+        # Quick previews in the app: nothing that costs time to draw or encode
+        OutputProfile("draft", "Fast preview: uncompressed, no images, standard fonts, one-line descriptions",
+                      page_compression=False, image_size=None, embed_fonts=False,
+                      full_descriptions=False, decorated=False),
+        # Phones and e-mail: the current default look, with small thumbnails
+        OutputProfile("screen", "Compressed, 160 px thumbnails, fonts as given",
+                      page_compression=True, image_size=160, embed_fonts=None,
+                      full_descriptions=True, decorated=True),
+        # Archive and print shops: 480 px thumbnails are 400 dpi in the 1.2" image box
+        OutputProfile("print", "Compressed, 480 px thumbnails, embedded fonts",
+                      page_compression=True, image_size=480, embed_fonts=True,
+                      full_descriptions=True, decorated=True),
+    )
+}
+
+DEFAULT_PROFILE = "screen"
+
+
+def get_profile(profile: Union[str, OutputProfile, None]) -> OutputProfile:
+    """Return the profile with this name (or the profile itself); None is the default."""
+    if isinstance(profile, OutputProfile):
+        return profile
+    name = DEFAULT_PROFILE if profile is None else profile
+    if name not in PROFILES:
+        raise ValueError(f"Unknown output profile '{name}'. Choose from: {', '.join(PROFILES)}")
+    return PROFILES[name]
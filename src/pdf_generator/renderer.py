@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, TextIO, Type
+
+# Add parent directory to path to import from course_generator
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from course_generator.metrics import BYTES_WRITTEN, DOCUMENTS_RENDERED, RENDER_SECONDS
+from course_generator.models import Course
+
+
+class CourseRenderer(ABC):
+    """Turns a Course into one document at ``output_path``.
+
+    ``output_path`` is a file name or an open file. Renderers read sessions
+    through ``course.iter_sessions()``, so streamed courses are rendered one
+    day at a time.
+    """
+
+    format_name: str = None
+    extension: str = None
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+
+    @abstractmethod
+    def render(self, course: Course):
+        """Write the whole course to ``output_path``."""
+
+
+class TextRenderer(CourseRenderer):
+    """Base for renderers that write text; subclasses implement ``write``."""
+
+    def render(self, course: Course):
+        start = time.perf_counter()
+        if isinstance(self.output_path, str):
+            with open(self.output_path, 'w', encoding='utf-8') as f:
+                self.write(course, f)
+                size = f.tell()
+        else:
+            offset = self.output_path.tell()
+            self.write(course, self.output_path)
+            size = self.output_path.tell() - offset
+
+        RENDER_SECONDS.labels(format=self.format_name).observe(time.perf_counter() - start)
+        DOCUMENTS_RENDERED.labels(format=self.format_name).inc()
+        BYTES_WRITTEN.labels(format=self.format_name).inc(size)
+
+    @abstractmethod
+    def write(self, course: Course, f: TextIO):
+        """Write the course as text to the open file ``f``."""
+
+
+class JSONRenderer(TextRenderer):
+    """The course as indented JSON, identical to ``Course.to_json``."""
+
+    format_name = 'json'
+    extension = 'json'
+
+    def write(self, course: Course, f: TextIO):
+        course.write_json(f)
+
+
+def renderer_classes() -> Dict[str, Type[CourseRenderer]]:
+    """Map each output format name to its renderer class."""
+    from .generator import PDFGenerator
+    from .markup import HTMLRenderer, MarkdownRenderer
+    return {cls.format_name: cls for cls in (PDFGenerator, HTMLRenderer, MarkdownRenderer, JSONRenderer)}
+
+
+FORMATS = ('pdf', 'html', 'md', 'json')
+
+
+def create_renderer(format_name: str, output_path, **options) -> CourseRenderer:
+    """Create the renderer for ``format_name``.
+
+    ``options`` (font family, description mode, output profile, asset store,
+    appendix layout) only apply to PDFs and are ignored by the text renderers.
+    """
+    classes = renderer_classes()
+    if format_name not in classes:
+        raise ValueError(f"Unknown output format '{format_name}'. Choose from: {', '.join(FORMATS)}")
+    if format_name != 'pdf':
+        return classes[format_name](output_path)
+    return classes[format_name](output_path, **options)
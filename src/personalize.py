@@ -0,0 +1,110 @@
+import argparse
+import os
+import signal
+import threading
+from course_generator.assets import AssetStore
+from course_generator.archive import content_hash, template_hash, vocabulary_hash
+from course_generator.batch import BatchJob, BatchRunner, Checkpoint, ProgressBar
+from course_generator.bulk import BulkRunner, create_sink
+from course_generator.generator import CourseGenerator
+from course_generator.metrics import REGISTRY
+from course_generator.personalization import MassPersonalizer, load_profiles
+from pdf_generator.fonts import register_font_family
+from pdf_generator.profiles import DEFAULT_PROFILE, PROFILES
+from pdf_generator.renderer import FORMATS, create_renderer
+
+def data_fingerprints(generator):
+    """Hash each template and the exercises it uses, so edits invalidate finished outputs."""
+    cache = {}
+    def fingerprint(template_name):
+        if template_name not in cache:
+            template = generator.get_template(template_name)
+            cache[template_name] = (template_hash(template), vocabulary_hash(generator, template))
+        return cache[template_name]
+    return fingerprint
+
+def make_jobs(profiles, personalizer, output_dir, format_name, pdf_options, run_settings):
+    data_fingerprint = data_fingerprints(personalizer.generator)
+    jobs = []
+    for profile in profiles:
+        fingerprint = content_hash([profile.course_name, profile.course_key(), run_settings,
+                                    data_fingerprint(profile.template_name)])
+        def render(path, profile=profile):
+            create_renderer(format_name, path, **pdf_options).render(personalizer.personalize(profile))
+        file_name = f"{profile.user_id}.{format_name}"
+        jobs.append(BatchJob(file_name, os.path.join(output_dir, file_name), fingerprint, render))
+    return jobs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a personalized course for every user profile.")
+    parser.add_argument("profiles", help="CSV or JSONL file with one user profile per row")
+    parser.add_argument("--output-dir", default="courses", help="Directory for the generated files")
+    parser.add_argument("--format", choices=FORMATS, default="pdf", help="Output format")
+    parser.add_argument("--seed", type=int, default=0, help="Master seed for reproducible courses")
+    parser.add_argument("--font", help="TrueType font for localized PDFs (registered once for the whole run)")
+    parser.add_argument("--bold-font", help="Bold TrueType face to pair with --font")
+    parser.add_argument("--output-profile", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                        help=f"PDF size/speed trade-off (default: {DEFAULT_PROFILE})")
+    parser.add_argument("--appendix", action="store_true",
+                        help="Describe each exercise once in a linked appendix (PDF only)")
+    parser.add_argument("--layout", choices=["files", "sharded", "zip", "tar"], default="files",
+                        help="files: one flat directory; sharded: hash-sharded subdirectories; "
+                             "zip/tar: rolling archives. All but files keep an index.jsonl (default: files)")
+    parser.add_argument("--archive-size", type=int, default=256, metavar="MB",
+                        help="Maximum size of each zip/tar archive (default: 256)")
+    parser.add_argument("--metrics-file", help="Write Prometheus metrics here when done ('-' for stdout)")
+    parser.add_argument("--no-progress", action="store_true", help="Don't draw the progress bar")
+    args = parser.parse_args(argv)
+
+    # Get the absolute paths
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    vocabulary_path = os.path.join(project_root, "data", "exercises", "vocabulary.json")
+    templates_path = os.path.join(project_root, "data", "exercises", "program_templates.json")
+
+    generator = CourseGenerator(vocabulary_path, templates_path)
+    personalizer = MassPersonalizer(generator, master_seed=args.seed)
+    os.makedirs(args.output_dir, exist_ok=True)
+    font_family = None
+    if args.font:
+        font_name = os.path.splitext(os.path.basename(args.font))[0]
+        font_family = register_font_family(font_name, args.font, args.bold_font)
+
+    pdf_options = {
+        "font_family": font_family,
+        "profile": args.output_profile,
+        "asset_store": AssetStore(os.path.join(project_root, "data", "exercises")),
+        "appendix": args.appendix
+    }
+
+    run_settings = [args.seed, args.format, args.font, args.bold_font, args.output_profile, args.appendix]
+    jobs = make_jobs(load_profiles(args.profiles), personalizer, args.output_dir, args.format,
+                     pdf_options, run_settings)
+
+    # Ctrl-C or SIGTERM finish the course being written, then stop; a rerun
+    # picks up from the checkpoint
+    cancel = threading.Event()
+    def request_stop(signum, frame):
+        cancel.set()
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    progress_bar = None if args.no_progress else ProgressBar()
+    if args.layout == "files":
+        with Checkpoint(os.path.join(args.output_dir, ".checkpoint.jsonl")) as checkpoint:
+            progress = BatchRunner(checkpoint, progress_bar, cancel).run(jobs)
+    else:
+        # The sink's index doubles as the checkpoint
+        with create_sink(args.layout, args.output_dir, args.archive_size * 1024 * 1024) as sink:
+            progress = BulkRunner(sink, progress_bar, cancel).run(jobs)
+
+    if progress.cancelled:
+        print(f"\n⚠️  Stopped after {progress.done}/{progress.total} courses; run again to resume")
+    print(f"✓ {progress.completed} courses written to {args.output_dir} in {progress.elapsed:.1f}s"
+          f" ({progress.skipped} already complete)")
+    print(f"  {personalizer.distinct_templates} distinct templates, {personalizer.distinct_courses} distinct course structures")
+    if args.metrics_file:
+        REGISTRY.write_textfile(args.metrics_file)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import uuid
+from course_generator.assets import AssetStore
+from course_generator.batch import PARTIAL_SUFFIX, atomic_output
+from course_generator.generator import CourseGenerator
+from course_generator.personalization import MassPersonalizer, UserProfile, load_profiles
+from course_generator.workqueue import DONE, FAILED, PENDING, RUNNING, QueueWorker, WorkQueue
+from pdf_generator.profiles import DEFAULT_PROFILE, PROFILES
+from pdf_generator.renderer import FORMATS, create_renderer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class CourseJobHandler:
+    """Render one queued course spec into the output directory.
+
+    The vocabulary is loaded once per worker process; personalizers are kept
+    per seed so equivalent profiles still share their generated course.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = output_dir
+        self.generator = CourseGenerator(os.path.join(PROJECT_ROOT, "data", "exercises", "vocabulary.json"),
+                                         os.path.join(PROJECT_ROOT, "data", "exercises", "program_templates.json"))
+        self.asset_store = AssetStore(os.path.join(PROJECT_ROOT, "data", "exercises"))
+        self.personalizers = {}
+
+    def __call__(self, job_id, spec):
+        seed = spec.get("seed", 0)
+        if seed not in self.personalizers:
+            self.personalizers[seed] = MassPersonalizer(self.generator, master_seed=seed)
+        course = self.personalizers[seed].personalize(UserProfile.from_dict(spec["profile"]))
+        pdf_options = {
+            "profile": spec.get("output_profile", DEFAULT_PROFILE),
+            "asset_store": self.asset_store,
+            "appendix": spec.get("appendix", False)
+        }
+        # A worker that outlived its lease may render the same job as its successor
+        suffix = f".{uuid.uuid4().hex[:8]}{PARTIAL_SUFFIX}"
+        with atomic_output(os.path.join(self.output_dir, job_id), suffix) as tmp_path:
+            create_renderer(spec.get("format", "pdf"), tmp_path, **pdf_options).render(course)
+
+def submit_profiles(args):
+    queue = WorkQueue(args.queue)
+    submitted = skipped = 0
+    for profile in load_profiles(args.profiles):
+        spec = {
+            "profile": profile.to_dict(),
+            "format": args.format,
+            "seed": args.seed,
+            "output_profile": args.output_profile,
+            "appendix": args.appendix
+        }
+        if queue.submit(f"{profile.user_id}.{args.format}", spec):
+            submitted += 1
+        else:
+            skipped += 1
+    print(f"✓ {submitted} jobs queued in {args.queue} ({skipped} already submitted)")
+
+def run_worker(queue_dir, output_dir, lease_seconds, exit_when_idle):
+    """Body of one worker process."""
+    os.makedirs(output_dir, exist_ok=True)
+    # SIGINT/SIGTERM finish the job in progress, then stop
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    worker = QueueWorker(WorkQueue(queue_dir, lease_seconds), CourseJobHandler(output_dir))
+    worker.run(stop, exit_when_idle)
+    print(f"  {worker.worker_id}: {worker.completed} completed, {worker.failed} failed, {worker.lost} lost leases")
+
+def work(args):
+    worker_args = (args.queue, args.output_dir, args.lease, not args.forever)
+    if args.processes == 1:
+        run_worker(*worker_args)
+        return
+    processes = [multiprocessing.Process(target=run_worker, args=worker_args) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+def status(args):
+    queue = WorkQueue(args.queue)
+    recovered = queue.recover() if args.recover else 0
+    counts = queue.counts()
+    print(f"{counts[PENDING]} pending, {counts[RUNNING]} running, {counts[DONE]} done, {counts[FAILED]} failed"
+          + (f" ({recovered} expired leases requeued)" if recovered else ""))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Spread course generation over workers that share a queue directory.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    submit_parser = subparsers.add_parser("submit", help="Queue one job per user profile")
+    submit_parser.add_argument("profiles", help="CSV or JSONL file with one user profile per row")
+    submit_parser.add_argument("--queue", required=True, help="Queue directory on the shared file system")
+    submit_parser.add_argument("--format", choices=FORMATS, default="pdf", help="Output format")
+    submit_parser.add_argument("--seed", type=int, default=0, help="Master seed for reproducible courses")
+    submit_parser.add_argument("--output-profile", choices=sorted(PROFILES), default=DEFAULT_PROFILE,
+                               help=f"PDF size/speed trade-off (default: {DEFAULT_PROFILE})")
+    submit_parser.add_argument("--appendix", action="store_true",
+                               help="Describe each exercise once in a linked appendix (PDF only)")
+    submit_parser.set_defaults(func=submit_profiles)
+
+    work_parser = subparsers.add_parser("work", help="Process queued jobs")
+    work_parser.add_argument("--queue", required=True, help="Queue directory on the shared file system")
+    work_parser.add_argument("--output-dir", default="courses", help="Directory for the generated files")
+    work_parser.add_argument("--processes", type=int, default=1, help="Worker processes on this node (default: 1)")
+    work_parser.add_argument("--lease", type=float, default=300.0, metavar="SECONDS",
+                             help="How long a job stays claimed without a heartbeat (default: 300)")
+    work_parser.add_argument("--forever", action="store_true", help="Keep polling for new jobs instead of exiting when the queue is empty")
+    work_parser.set_defaults(func=work)
+
+    status_parser = subparsers.add_parser("status", help="Show how many jobs are in each state")
+    status_parser.add_argument("--queue", required=True, help="Queue directory on the shared file system")
+    status_parser.add_argument("--recover", action="store_true", help="Requeue jobs whose leases have expired")
+    status_parser.set_defaults(func=status)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
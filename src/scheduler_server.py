@@ -0,0 +1,147 @@
+import argparse
+import asyncio
+import io
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from course_generator.assets import AssetStore
+from course_generator.batch import atomic_output
+from course_generator.generator import CourseGenerator
+from course_generator.scheduler import DEFAULT_QUEUE_SIZES, JobScheduler
+from course_generator.server_socket import bind_unix_socket, check_output_path, default_socket_path
+from main import LEVEL_CHOICES
+from pdf_generator.renderer import create_renderer
+
+# Keep in sync with submit.py, which avoids importing this module
+DEFAULT_SOCKET = default_socket_path("scheduler-server.sock")
+
+# Set up once per worker process by init_worker
+_generator = None
+_asset_store = None
+
+def init_worker(vocabulary_path, templates_path):
+    """Load the data and warm reportlab once per worker, not per job."""
+    global _generator, _asset_store
+    # Ctrl-C reaches the whole process group; the server decides when workers stop
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _generator = CourseGenerator(vocabulary_path, templates_path)
+    _asset_store = AssetStore(os.path.dirname(os.path.abspath(vocabulary_path)))
+    course = _generator.generate_course("Warm-up", 1, seed=0)
+    create_renderer("pdf", io.BytesIO(), asset_store=_asset_store).render(course)
+
+def render_job(request):
+    """Generate and render one course in a worker process."""
+    start = time.perf_counter()
+    course = _generator.stream_course(
+        request.get("name") or "21-Day Handstand Challenge",
+        int(request.get("days") or 21),
+        request["template"],
+        request.get("seed")
+    )
+    with atomic_output(request["output"]) as tmp_path:
+        create_renderer(request.get("format") or "pdf", tmp_path, profile=request.get("profile"),
+                        asset_store=_asset_store, appendix=bool(request.get("appendix"))).render(course)
+    return {"output": request["output"], "seed": course.seed, "seconds": round(time.perf_counter() - start, 6)}
+
+class SchedulerServer:
+    """Serve course jobs from a process pool, interactive requests first.
+
+    Speaks the fork server's protocol (one JSON line each way over a Unix
+    socket), so submit.py works with either. Requests may add ``priority``
+    ("interactive", the default, or "batch") and ``timeout`` in seconds;
+    ``{"stats": true}`` returns the scheduler's queue statistics. A
+    client whose priority queue is full waits for room before its job is
+    accepted. As with the fork server, only the server's user can connect,
+    and ``output`` must be an absolute path, inside ``output_root`` when
+    one is given.
+    """
+
+    def __init__(self, socket_path, vocabulary_path, templates_path, workers=None, queue_sizes=None,
+                 default_timeout=None, output_root=None):
+        self.socket_path = socket_path
+        self.output_root = output_root
+        self.vocabulary_path = vocabulary_path
+        self.templates_path = templates_path
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_sizes = queue_sizes or DEFAULT_QUEUE_SIZES
+        self.default_timeout = default_timeout
+        self.scheduler = None
+
+    async def serve_forever(self):
+        # Bind before starting the workers, so a second server fails fast
+        listener = bind_unix_socket(self.socket_path)
+        with ProcessPoolExecutor(self.workers, initializer=init_worker,
+                                 initargs=(self.vocabulary_path, self.templates_path)) as executor:
+            async with JobScheduler(executor, self.workers, self.queue_sizes) as self.scheduler:
+                server = await asyncio.start_unix_server(self.handle_connection, sock=listener)
+                # Ctrl-C or SIGTERM stop accepting jobs; the queued ones still finish
+                stop = asyncio.Event()
+                loop = asyncio.get_running_loop()
+                for signum in (signal.SIGINT, signal.SIGTERM):
+                    loop.add_signal_handler(signum, stop.set)
+                print(f"🤸 Scheduler server ready on {self.socket_path} with {self.workers} workers", flush=True)
+                try:
+                    async with server:
+                        await stop.wait()
+                finally:
+                    if os.path.exists(self.socket_path):
+                        os.remove(self.socket_path)
+
+    async def handle_connection(self, reader, writer):
+        try:
+            response = await self.handle(json.loads(await reader.readline()))
+        except asyncio.TimeoutError:
+            response = {"ok": False, "error": "Timed out"}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        writer.write((json.dumps(response) + "\n").encode('utf-8'))
+        await writer.drain()
+        writer.close()
+
+    async def handle(self, request):
+        if request.get("stats"):
+            return {"ok": True, "stats": self.scheduler.snapshot()}
+        level = str(request.get("level") or "beginner")
+        if level not in LEVEL_CHOICES:
+            raise ValueError(f"Unknown level '{level}'. Choose from: {', '.join(sorted(LEVEL_CHOICES))}")
+        request = dict(request, template=LEVEL_CHOICES[level],
+                       output=check_output_path(request.get("output"), self.output_root))
+        timeout = request.get("timeout") or self.default_timeout
+        result = await self.scheduler.submit(request.get("priority") or "interactive", render_job, request,
+                                             timeout=timeout)
+        return {"ok": True, **result}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render courses on a process pool, interactive jobs ahead of batches. Submit jobs with submit.py.")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"Unix socket to listen on (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--interactive-queue", type=int, default=DEFAULT_QUEUE_SIZES["interactive"],
+                        help=f"Interactive jobs that may wait at once (default: {DEFAULT_QUEUE_SIZES['interactive']})")
+    parser.add_argument("--batch-queue", type=int, default=DEFAULT_QUEUE_SIZES["batch"],
+                        help=f"Batch jobs that may wait at once (default: {DEFAULT_QUEUE_SIZES['batch']})")
+    parser.add_argument("--timeout", type=float, help="Default per-job timeout in seconds, counted from submission")
+    parser.add_argument("--output-root", help="Only write jobs' output files inside this directory")
+    args = parser.parse_args(argv)
+
+    # Get the absolute paths
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    vocabulary_path = os.path.join(project_root, "data", "exercises", "vocabulary.json")
+    templates_path = os.path.join(project_root, "data", "exercises", "program_templates.json")
+
+    server = SchedulerServer(args.socket, vocabulary_path, templates_path, args.workers,
+                             {"interactive": args.interactive_queue, "batch": args.batch_queue}, args.timeout,
+                             args.output_root)
+    try:
+        asyncio.run(server.serve_forever())
+    except (OSError, RuntimeError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    print("✓ Scheduler server stopped")
+
+if __name__ == "__main__":
+    sys.exit(main())
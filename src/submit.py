@@ -0,0 +1,71 @@
+import argparse
+import json
+import os
+import socket
+import sys
+
+# Only the standard library is imported here, so submitting a job costs a
+# bare Python start; the fork server does the heavy lifting
+
+def runtime_dir():
+    """Keep in sync with course_generator.server_socket.runtime_dir."""
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        return os.path.join(base, "handstand-course")
+    return os.path.join("/tmp", f"handstand-course-{os.getuid()}")
+
+DEFAULT_SOCKET = os.path.join(runtime_dir(), "fork-server.sock")
+SCHEDULER_SOCKET = os.path.join(runtime_dir(), "scheduler-server.sock")
+
+def submit(request, socket_path=DEFAULT_SOCKET, timeout=None):
+    """Send one job to the fork server and return its JSON response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(timeout)
+        conn.connect(socket_path)
+        conn.sendall((json.dumps(request) + "\n").encode('utf-8'))
+        with conn.makefile('r', encoding='utf-8') as reader:
+            line = reader.readline()
+    if not line:
+        return {"ok": False, "error": "The server closed the connection without answering"}
+    return json.loads(line)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Submit a course job to a running fork_server.py.")
+    parser.add_argument("--socket", help=f"Server socket (default: {DEFAULT_SOCKET})")
+    parser.add_argument("--scheduler", action="store_true",
+                        help=f"Submit to scheduler_server.py's default socket ({SCHEDULER_SOCKET})")
+    parser.add_argument("--name", help="Course name")
+    parser.add_argument("--days", type=int, help="Number of days")
+    parser.add_argument("--level", help="Difficulty level (1/2/3 or beginner/intermediate/advanced)")
+    parser.add_argument("--seed", type=int, help="Seed for a reproducible course")
+    parser.add_argument("--format", default="pdf", help="Output format: pdf, html, md or json (default: pdf)")
+    parser.add_argument("--output-profile", help="PDF profile: draft, screen or print (default: screen)")
+    parser.add_argument("--appendix", action="store_true", help="PDF only: describe exercises once in a linked appendix")
+    parser.add_argument("--priority", choices=["interactive", "batch"],
+                        help="scheduler_server.py only: queue to wait in (default: interactive)")
+    parser.add_argument("--timeout", type=float, help="scheduler_server.py only: give up after this many seconds")
+    parser.add_argument("--output", help="Output file (default: handstand_course.<format> in the current directory)")
+    args = parser.parse_args(argv)
+
+    output_path = os.path.abspath(args.output or f"handstand_course.{args.format}")
+    response = submit({
+        "name": args.name,
+        "days": args.days,
+        "level": args.level,
+        "seed": args.seed,
+        "format": args.format,
+        "profile": args.output_profile,
+        "appendix": args.appendix,
+        "priority": args.priority,
+        "timeout": args.timeout,
+        "output": output_path
+    }, args.socket or (SCHEDULER_SOCKET if args.scheduler else DEFAULT_SOCKET))
+
+    if not response.get("ok"):
+        print(f"❌ {response.get('error')}", file=sys.stderr)
+        return 1
+    print(f"✓ {args.format.upper()} generated: {response['output']} ({response['seconds'] * 1000:.0f} ms)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Sync the exercise folders and the master vocabulary.json in both directions
+Only exercises changed since the last sync are copied; edits to the same
+exercise on both sides are reported as conflicts and left alone
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from course_generator.sync import SIDES, VocabularySync
+
+def sync_exercises(dry_run=False, prefer=None):
+    # Base directory for exercises
+    base_dir = Path(__file__).parent / "data" / "exercises"
+    
+    start = time.perf_counter()
+    report = VocabularySync(str(base_dir)).run(dry_run=dry_run, prefer=prefer)
+    elapsed = time.perf_counter() - start
+    
+    verb = "Would copy" if dry_run else "Copied"
+    for exercise_id in report.to_vocabulary:
+        print(f"{verb} to vocabulary.json: {exercise_id}")
+    for exercise_id in report.to_folders:
+        print(f"{verb} to its folder: {exercise_id}")
+    for exercise_id in report.removed_from_vocabulary:
+        print(f"{'Would remove' if dry_run else 'Removed'} from vocabulary.json: {exercise_id}")
+    for exercise_id in report.removed_from_folders:
+        print(f"{'Would remove' if dry_run else 'Removed'} exercise.json: {exercise_id}")
+    for exercise_id in report.conflicts:
+        print(f"⚠️  Conflict: {exercise_id} changed in its folder and in vocabulary.json (use --prefer)")
+    for issue in report.issues:
+        print(f"❌ {issue}")
+    
+    print(f"\n{'✅ In sync' if report.ok else '❌ Not fully synced'}"
+          f" ({report.files_read} file(s) read in {elapsed * 1000:.0f} ms)")
+    return report.ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Two-way sync between exercise folders and vocabulary.json.")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would change without writing")
+    parser.add_argument("--prefer", choices=SIDES, help="Resolve conflicts in favour of this side")
+    args = parser.parse_args()
+    sys.exit(0 if sync_exercises(args.dry_run, args.prefer) else 1)
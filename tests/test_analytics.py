@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.analytics import CourseAnalytics
+from src.course_generator.generator import CourseGenerator
+from src.course_generator.models import Course, Exercise, Session
+from src.course_generator.prescription import parse_reps
+
+class TestPrescription(unittest.TestCase):
+    def test_parse_reps(self):
+        """Test that free-text reps become quantity, unit and sides."""
+        self.assertEqual(parse_reps("30 seconds each side")[:4], (30, 30, "seconds", 2))
+        self.assertEqual(parse_reps("8-12 reps")[:4], (8, 12, "reps", 1))
+        self.assertEqual(parse_reps("8 reps each direction per arm").sides, 4)
+        self.assertEqual(parse_reps("5 steps (3 repeats)").label, "steps")
+        self.assertEqual(parse_reps("5 steps (3 repeats)").times, 3)
+        self.assertEqual(parse_reps("3 repeats (with 3 sec hold)").times, 1)
+        self.assertEqual(parse_reps("2 minutes").quantity, 120)
+        self.assertEqual(parse_reps("max effort").quantity, 0)
+
+    def test_parsed_once_at_load(self):
+        """Test that vocabulary exercises carry their parsed reps, shared per distinct text."""
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        generator = CourseGenerator(os.path.join(project_root, "data", "exercises", "vocabulary.json"),
+                                    os.path.join(project_root, "data", "exercises", "program_templates.json"))
+        same_reps = [ex for ex in generator.exercise_vocabulary.values() if ex.reps == "30 seconds"]
+
+        self.assertGreater(len(same_reps), 1)
+        parsed = parse_reps.cache_info()
+        self.assertIs(same_reps[0].prescription, same_reps[1].prescription)
+        # Reading prescriptions after loading parses nothing, not even through the cache
+        self.assertEqual(parse_reps.cache_info(), parsed)
+
+class TestCourseAnalytics(unittest.TestCase):
+    def course(self, name, days):
+        course = Course(name, days)
+        for day in range(days):
+            course.add_session(Session(f"Day {day + 1}", {
+                "Handstand": [Exercise("Wall Hold", "", 3, "30 seconds", "h1", primary_muscle_groups=["shoulders", "core"])],
+                "Conditioning": [Exercise("Lunges", "", 2, "10 reps each leg", "c1", primary_muscle_groups=["legs"])]
+            }))
+        return course
+
+    def test_volume_and_time_under_tension(self):
+        """Test per-day, per-week and muscle group totals for a batch of courses."""
+        analytics = CourseAnalytics([self.course("A", 10), self.course("B", 3)], seconds_per_rep=2)
+
+        self.assertEqual(analytics.daily_seconds().shape, (2, 10))
+        self.assertEqual(analytics.daily_seconds()[0, 0], 90)
+        self.assertEqual(analytics.daily_reps()[0, 0], 40)
+        self.assertEqual(analytics.daily_time_under_tension()[1].tolist(), [170] * 3 + [0] * 7)
+        self.assertEqual(analytics.weekly_time_under_tension()[0].tolist(), [7 * 170, 3 * 170])
+        summary = analytics.summary(1)
+        self.assertEqual(summary["time_under_tension_seconds"], 3 * 170)
+        self.assertEqual(summary["muscle_group_load_seconds"], {"core": 270, "legs": 240, "shoulders": 270})
+
+    def test_same_exercise_different_reps(self):
+        """Test that an exercise prescribed with different reps is counted with each prescription."""
+        course = Course("C", 2)
+        course.add_session(Session("Day 1", {"Handstand": [Exercise("Wall Hold", "", 1, "30 seconds", "h1")]}))
+        course.add_session(Session("Day 2", {"Handstand": [Exercise("Wall Hold", "", 1, "45 seconds", "h1")]}))
+        analytics = CourseAnalytics([course])
+
+        self.assertEqual(analytics.daily_seconds()[0].tolist(), [30, 45])
+
+    def test_prescription_follows_reps(self):
+        """Test that changing an exercise's reps changes its prescription."""
+        exercise = Exercise("Wall Hold", "", 3, "30 seconds", "h1")
+        exercise.reps = "10 reps"
+        self.assertEqual(exercise.prescription, parse_reps("10 reps"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import copy
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.archive import ArchiveMismatchError, CourseArchive, read_archives, write_archives
+from src.course_generator.generator import CourseGenerator
+from src.course_generator.models import CourseSpec
+
+class TestCourseArchive(unittest.TestCase):
+    def setUp(self):
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.vocabulary_path = os.path.join(project_root, "data", "exercises", "vocabulary.json")
+        self.templates_path = os.path.join(project_root, "data", "exercises", "program_templates.json")
+        self.generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+        self.spec = CourseSpec("Archive Test", 90, "intermediate_handstand", seed=2024)
+
+    def test_roundtrip_without_overrides(self):
+        """Test that an archive is tiny and restores the identical course."""
+        course = self.generator.generate_from_spec(self.spec)
+        archive = CourseArchive.from_course(self.generator, self.spec, course)
+        text = archive.to_json()
+
+        self.assertLess(len(text.encode("utf-8")), 1024)
+        self.assertEqual(archive.overrides, [])
+        restored = CourseArchive.from_json(text).restore(CourseGenerator(self.vocabulary_path, self.templates_path))
+        self.assertEqual(restored.to_dict(), course.to_dict())
+
+    def test_manual_overrides_are_restored(self):
+        """Test that edits made after generation survive archiving."""
+        course = self.generator.generate_from_spec(self.spec)
+        course.name = "Renamed"
+        handstand = course.sessions[4].sections["Handstand"]
+        handstand[0].sets += 2
+        handstand[0].reps = "5 attempts"
+        course.sessions[9].sections["Stretching"] = [copy.copy(self.generator.exercise_vocabulary["releve_001"])]
+        del course.sessions[20].sections["Conditioning"]
+
+        archive = CourseArchive.from_course(self.generator, self.spec, course)
+        restored = CourseArchive.from_json(archive.to_json()).restore(self.generator)
+
+        self.assertEqual(len(archive.overrides), 3)
+        self.assertEqual(restored.to_dict(), course.to_dict())
+
+    def test_added_and_removed_days_are_restored(self):
+        """Test that days appended to or cut from an edited course survive archiving."""
+        longer = self.generator.generate_from_spec(self.spec)
+        extra = copy.deepcopy(longer.sessions[0])
+        extra.name = "Bonus Day"
+        longer.add_session(extra)
+        shorter = self.generator.generate_from_spec(self.spec)
+        del shorter.sessions[60:]
+
+        for course, count in ((longer, 91), (shorter, 60)):
+            archive = CourseArchive.from_json(CourseArchive.from_course(self.generator, self.spec, course).to_json())
+            restored = archive.restore(self.generator)
+
+            self.assertEqual(archive.session_count, count)
+            self.assertEqual(restored.to_dict(), course.to_dict())
+
+    def test_detects_changed_template(self):
+        """Test that restoring against a modified template is refused."""
+        archive = CourseArchive.from_course(self.generator, self.spec)
+        templates = copy.deepcopy(dict(self.generator.program_templates))
+        templates["intermediate_handstand"]["sections"]["Handstand"]["max_exercises"] = 4
+        self.generator.program_templates = templates
+
+        with self.assertRaises(ArchiveMismatchError):
+            archive.restore(self.generator)
+        self.assertEqual(len(archive.restore(self.generator, verify=False).sessions), 90)
+
+    def test_detects_other_generator_version(self):
+        """Test that an archive made by another generator version is refused, and old archives count as version 1."""
+        data = CourseArchive.from_course(self.generator, self.spec).to_dict()
+        self.assertEqual(data["generator_version"], 1)
+
+        with self.assertRaises(ArchiveMismatchError):
+            CourseArchive.from_dict(dict(data, generator_version=2)).restore(self.generator)
+        del data["generator_version"]
+        self.assertEqual(len(CourseArchive.from_dict(data).restore(self.generator).sessions), 90)
+
+    def test_jsonl_archive_file(self):
+        """Test writing and reading many archives in one file."""
+        specs = CourseGenerator.assign_seeds([CourseSpec(f"Course {i}", 30) for i in range(5)], 7)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "courses.jsonl")
+            write_archives(path, (CourseArchive.from_course(self.generator, spec) for spec in specs))
+            restored = [archive.spec.seed for archive in read_archives(path)]
+
+        self.assertEqual(restored, [spec.seed for spec in specs])
+
+if __name__ == '__main__':
+    unittest.main()
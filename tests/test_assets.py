@@ -0,0 +1,96 @@
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from PIL import Image
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.assets import AssetStore, find_images
+
+class TestAssetStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = self.tmp_dir.name
+        for folder in ("Handstand/Crow Pose", "Handstand/Frog Stand", "Prehab/Wrist Circles"):
+            os.makedirs(os.path.join(self.base_dir, folder))
+            with open(os.path.join(self.base_dir, folder, "exercise.json"), "w") as f:
+                json.dump({"id": folder.split("/")[1].lower().replace(" ", "_")}, f)
+        self.photo = os.path.join(self.base_dir, "Handstand", "Crow Pose", "photo.jpg")
+        Image.new("RGB", (1000, 500), (200, 30, 30)).save(self.photo)
+        shutil.copy(self.photo, os.path.join(self.base_dir, "Handstand", "Frog Stand", "copy.jpg"))
+        Image.new("RGBA", (100, 100)).save(os.path.join(self.base_dir, "Prehab", "Wrist Circles", "icon.png"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def ingest(self):
+        store = AssetStore(self.base_dir, sizes=(160, 480))
+        return store, store.ingest(find_images(self.base_dir))
+
+    def test_identical_images_are_stored_once(self):
+        """Test that copies share one asset and exercises point at the stored file."""
+        store, report = self.ingest()
+        images = store.exercise_images(find_images(self.base_dir))
+
+        self.assertEqual((report.images, report.duplicates, report.new_assets), (3, 1, 2))
+        self.assertEqual(images["Handstand/Crow Pose"], images["Handstand/Frog Stand"])
+        self.assertTrue(os.path.isfile(os.path.join(self.base_dir, images["Handstand/Crow Pose"][0])))
+
+    def test_thumbnails_never_upscale(self):
+        """Test that thumbnails are made per size and small images reuse the original."""
+        store, report = self.ingest()
+        photo, icon = (store.exercise_images(find_images(self.base_dir))[folder][0]
+                       for folder in ("Handstand/Crow Pose", "Prehab/Wrist Circles"))
+
+        with Image.open(os.path.join(self.base_dir, store.thumbnail(photo, 160))) as thumbnail:
+            self.assertEqual(thumbnail.size, (160, 80))
+        self.assertEqual(store.thumbnail(photo, 300), store.thumbnail(photo, 480))
+        self.assertEqual(store.thumbnail(icon, 160), icon)
+        self.assertEqual(report.errors, [])
+
+    def test_gif_thumbnails_are_named_png(self):
+        """Test that GIF thumbnails, saved as PNG, get a .png name that matches their content."""
+        Image.new("P", (800, 400)).save(os.path.join(self.base_dir, "Prehab", "Wrist Circles", "loop.gif"))
+        store, report = self.ingest()
+        gif = [path for path in store.exercise_images(find_images(self.base_dir))["Prehab/Wrist Circles"]
+               if path.endswith(".gif")][0]
+
+        thumbnail_path = store.thumbnail(gif, 160)
+        self.assertTrue(thumbnail_path.endswith("_160.png"))
+        with Image.open(os.path.join(self.base_dir, thumbnail_path)) as thumbnail:
+            self.assertEqual(thumbnail.format, "PNG")
+        self.assertEqual(report.errors, [])
+
+    def test_unreadable_file_is_reported(self):
+        """Test that a file removed after listing is reported and the rest still ingested."""
+        images = find_images(self.base_dir)
+        os.remove(self.photo)
+        store = AssetStore(self.base_dir, sizes=(160,))
+        report = store.ingest(images)
+
+        self.assertEqual(len(report.errors), 1)
+        self.assertIn("photo.jpg", report.errors[0])
+        self.assertEqual(report.new_assets, 2)
+        self.assertTrue(os.path.isfile(store.manifest_path))
+
+    def test_only_changed_files_are_reprocessed(self):
+        """Test that a rerun hashes nothing new and a changed file replaces its old asset."""
+        self.ingest()
+        _, report = self.ingest()
+        self.assertEqual((report.hashed, report.new_assets, report.thumbnails), (0, 0, 0))
+
+        os.remove(os.path.join(self.base_dir, "Handstand", "Frog Stand", "copy.jpg"))
+        Image.new("RGB", (1000, 500), (30, 30, 200)).save(self.photo)
+        os.utime(self.photo, ns=(0, os.stat(self.photo).st_mtime_ns + 1_000_000_000))
+        store, report = self.ingest()
+
+        self.assertEqual((report.hashed, report.new_assets, report.thumbnails, report.pruned), (1, 1, 2, 3))
+        self.assertEqual(len(store.manifest["assets"]), 2)
+
+if __name__ == '__main__':
+    unittest.main()
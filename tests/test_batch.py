@@ -0,0 +1,83 @@
+import unittest
+import os
+import sys
+import tempfile
+import threading
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.batch import BatchJob, BatchRunner, Checkpoint, PARTIAL_SUFFIX
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.tmp_dir.name, ".checkpoint.jsonl")
+        self.rendered = []
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def jobs(self, count, fingerprint="v1", fail_on=None):
+        def render(path, job_id):
+            if job_id == fail_on:
+                with open(path, "w") as f:
+                    f.write("half a docu")
+                raise RuntimeError("renderer crashed")
+            with open(path, "w") as f:
+                f.write(f"course {job_id} {fingerprint}")
+            self.rendered.append(job_id)
+        return [
+            BatchJob(f"job{i}", os.path.join(self.tmp_dir.name, f"job{i}.txt"), fingerprint,
+                     lambda path, job_id=f"job{i}": render(path, job_id))
+            for i in range(count)
+        ]
+
+    def run_batch(self, jobs, **kwargs):
+        with Checkpoint(self.checkpoint_path) as checkpoint:
+            return BatchRunner(checkpoint, **kwargs).run(jobs)
+
+    def test_restart_skips_verified_outputs(self):
+        """Test that a rerun only renders missing, damaged or stale outputs."""
+        self.run_batch(self.jobs(5))
+        os.remove(os.path.join(self.tmp_dir.name, "job1.txt"))
+        with open(os.path.join(self.tmp_dir.name, "job2.txt"), "w") as f:
+            f.write("course job2 v0")
+        self.rendered.clear()
+
+        progress = self.run_batch(self.jobs(5))
+
+        self.assertEqual(self.rendered, ["job1", "job2"])
+        self.assertEqual((progress.completed, progress.skipped), (2, 3))
+        self.rendered.clear()
+        self.run_batch(self.jobs(5, fingerprint="v2"))
+        self.assertEqual(len(self.rendered), 5)
+
+    def test_failed_render_leaves_no_partial_file(self):
+        """Test that a crash mid-render leaves neither a partial nor a recorded output."""
+        with self.assertRaises(RuntimeError):
+            self.run_batch(self.jobs(3, fail_on="job1"))
+
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), [".checkpoint.jsonl", "job0.txt"])
+        self.assertFalse(any(name.endswith(PARTIAL_SUFFIX) for name in os.listdir(self.tmp_dir.name)))
+        with Checkpoint(self.checkpoint_path) as checkpoint:
+            self.assertEqual(len(checkpoint), 1)
+
+    def test_cancel_and_progress(self):
+        """Test that cancelling stops after the current job and progress is reported."""
+        cancel = threading.Event()
+        seen = []
+        def on_progress(progress):
+            seen.append((progress.done, progress.total, progress.eta))
+            if progress.done == 2:
+                cancel.set()
+
+        progress = self.run_batch(self.jobs(5), progress_callback=on_progress, cancel_event=cancel)
+
+        self.assertTrue(progress.cancelled)
+        self.assertEqual(self.rendered, ["job0", "job1"])
+        self.assertEqual([(done, total) for done, total, _ in seen], [(1, 5), (2, 5)])
+        self.assertGreaterEqual(seen[-1][2], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.batch import BatchJob, PARTIAL_SUFFIX
+from src.course_generator.bulk import (ArchiveSink, BulkIndex, BulkRunner, ShardedDirectorySink, INDEX_NAME,
+                                       open_document, shard_path)
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = self.tmp_dir.name
+        self.rendered = []
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def jobs(self, count, fingerprint="v1", size=1000):
+        def render(path, job_id):
+            with open(path, "wb") as f:
+                f.write(job_id.encode() + os.urandom(size))
+            self.rendered.append(job_id)
+        return [BatchJob(f"job{i}.pdf", f"job{i}.pdf", fingerprint, lambda path, job_id=f"job{i}": render(path, job_id))
+                for i in range(count)]
+
+    def read_all(self):
+        index = BulkIndex(os.path.join(self.root, INDEX_NAME))
+        documents = {}
+        for entry in index:
+            with open_document(self.root, entry) as f:
+                documents[entry["course"]] = f.read()
+        index.close()
+        return documents
+
+    def test_sharded_layout_batches_fsyncs(self):
+        """Test that files land in hashed subdirectories and are fsynced and indexed in batches."""
+        with ShardedDirectorySink(self.root, fsync_every=10) as sink:
+            BulkRunner(sink).run(self.jobs(25))
+
+        # Files are indexed (and the index fsynced) once per batch of 10
+        self.assertEqual(sink.index.commits, 3)
+        self.assertEqual(len(open(os.path.join(self.root, INDEX_NAME)).readlines()), 25)
+        self.assertTrue(os.path.isfile(os.path.join(self.root, shard_path("job7.pdf"), "job7.pdf")))
+        self.assertEqual(set(os.listdir(self.root)) - {INDEX_NAME}, {shard_path(f"job{i}.pdf").split(os.sep)[0]
+                                                                    for i in range(25)})
+        documents = self.read_all()
+        self.assertEqual(len(documents), 25)
+        self.assertTrue(documents["job3.pdf"].startswith(b"job3"))
+
+    def test_rolling_archives_are_bounded(self):
+        """Test that archives roll over before exceeding their size and can be read back."""
+        for archive_format in ("zip", "tar"):
+            root = os.path.join(self.root, archive_format)
+            with ArchiveSink(root, archive_format, max_bytes=10000) as sink:
+                BulkRunner(sink).run(self.jobs(20, size=3000))
+
+            archives = sorted(name for name in os.listdir(root) if name != INDEX_NAME)
+            self.assertEqual(sink.archives_written, len(archives))
+            self.assertGreater(len(archives), 5)
+            for name in archives:
+                self.assertTrue(name.endswith("." + archive_format))
+                self.assertLessEqual(os.path.getsize(os.path.join(root, name)), 10000 + 2048)
+            self.root = root
+            documents = self.read_all()
+            self.assertEqual(len(documents), 20)
+            self.assertTrue(documents["job19.pdf"].startswith(b"job19"))
+
+    def test_resume_skips_indexed_and_ignores_partial_archives(self):
+        """Test that a rerun only renders courses that are missing or changed."""
+        with ArchiveSink(self.root, "zip") as sink:
+            BulkRunner(sink).run(self.jobs(5))
+        # A crash left a half-written archive behind
+        with open(os.path.join(self.root, "courses-00001.zip" + PARTIAL_SUFFIX), "wb") as f:
+            f.write(b"PK")
+
+        self.rendered = []
+        jobs = self.jobs(6)
+        jobs[2].fingerprint = "v2"
+        with ArchiveSink(self.root, "zip") as sink:
+            progress = BulkRunner(sink).run(jobs)
+
+        self.assertEqual(sorted(self.rendered), ["job2", "job5"])
+        self.assertEqual(progress.skipped, 4)
+        self.assertIn("courses-00001.zip", os.listdir(self.root))
+        self.assertEqual(len(self.read_all()), 6)
+
+if __name__ == '__main__':
+    unittest.main()
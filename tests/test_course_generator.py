@@ -1,4 +1,6 @@
 import unittest
+import io
+import json
 import os
 import sys
 
@@ -6,7 +8,8 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.course_generator.generator import CourseGenerator
-from src.course_generator.models import Course
+from src.course_generator.models import Course, CourseSpec, StreamingCourse
+from src.course_generator.seeding import SeedSequence
 
 class TestCourseGenerator(unittest.TestCase):
     def setUp(self):
@@ -54,5 +57,73 @@ class TestCourseGenerator(unittest.TestCase):
         # The last session should have more or equal sets than the first
         self.assertGreaterEqual(last_exercise_day10.sets, first_exercise_day1.sets)
 
+    def test_stream_course_is_lazy(self):
+        """Test that a streamed course generates sessions only when iterated."""
+        course = self.generator.stream_course("Stream Test", 5)
+
+        self.assertIsInstance(course, StreamingCourse)
+        with self.assertRaises(TypeError):
+            getattr(course, "sessions", [])
+        sessions = course.iter_sessions()
+        self.assertEqual(next(sessions).name, "Day 1")
+        self.assertEqual(len(list(sessions)), 4)
+
+    def test_stream_course_unknown_template(self):
+        """Test that an unknown template is rejected before streaming starts."""
+        with self.assertRaises(ValueError):
+            self.generator.stream_course("Bad Template", 5, "missing_template")
+
+    def test_write_json_matches_json_dump(self):
+        """Test that the streaming JSON writer produces the same document as json.dump."""
+        course = self.generator.generate_course("JSON Test", 3)
+        buffer = io.StringIO()
+        course.write_json(buffer)
+
+        self.assertEqual(buffer.getvalue(), json.dumps(course.to_dict(), indent=4))
+        empty = io.StringIO()
+        Course("Empty", 0).write_json(empty)
+        self.assertEqual(empty.getvalue(), json.dumps(Course("Empty", 0).to_dict(), indent=4))
+
+    def test_same_seed_same_course(self):
+        """Test that a seed fully determines the generated course."""
+        first = self.generator.generate_course("Seeded", 14, seed=42)
+        other_generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+        second = other_generator.generate_course("Seeded", 14, seed=42)
+
+        self.assertEqual(first.to_dict(), second.to_dict())
+        self.assertEqual(first.seed, 42)
+
+    def test_streamed_course_is_repeatable(self):
+        """Test that iterating a streamed course twice yields the same sessions."""
+        course = self.generator.stream_course("Stream", 7)
+        first = [session.to_dict() for session in course.iter_sessions()]
+        second = [session.to_dict() for session in course.iter_sessions()]
+
+        self.assertEqual(first, second)
+        self.assertEqual(course.materialize().to_dict()["sessions"], first)
+
+    def test_assign_seeds_independent_of_worker_split(self):
+        """Test that spawned seeds depend only on the master seed and spec position."""
+        specs = [CourseSpec(f"Course {i}", 5) for i in range(6)]
+        seeded = CourseGenerator.assign_seeds(specs, master_seed=1234)
+
+        self.assertEqual([s.seed for s in seeded], [s.seed for s in CourseGenerator.assign_seeds(specs, 1234)])
+        self.assertEqual(len({s.seed for s in seeded}), len(specs))
+        # A worker handling only the odd positions regenerates identical courses
+        worker = CourseGenerator(self.vocabulary_path, self.templates_path)
+        for spec in seeded[1::2]:
+            self.assertEqual(worker.generate_from_spec(spec).to_dict(),
+                             self.generator.generate_from_spec(spec).to_dict())
+
+    def test_seed_sequence_spawn(self):
+        """Test that spawning continues where the previous spawn stopped."""
+        sequence = SeedSequence(7)
+        first = sequence.spawn(2)
+        second = sequence.spawn(1)
+
+        self.assertEqual(second[0].spawn_key, (2,))
+        self.assertEqual(first[1].generate_state(), SeedSequence(7).child(1).generate_state())
+        self.assertNotEqual(first[0].generate_state(), first[1].generate_state())
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.server_socket import bind_unix_socket, check_output_path
+from src.submit import submit
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@unittest.skipUnless(hasattr(os, "fork"), "fork server needs os.fork")
+class TestForkServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.socket_path = os.path.join(cls.tmp_dir.name, "server.sock")
+        cls.server = subprocess.Popen(
+            [sys.executable, os.path.join(PROJECT_ROOT, "src", "fork_server.py"),
+             "--socket", cls.socket_path, "--max-jobs", "2"],
+            stdout=subprocess.DEVNULL)
+        deadline = time.monotonic() + 30
+        while not os.path.exists(cls.socket_path):
+            if time.monotonic() > deadline or cls.server.poll() is not None:
+                cls.tearDownClass()
+                raise RuntimeError("fork server did not start")
+            time.sleep(0.05)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+        cls.server.wait(timeout=30)
+        cls.tmp_dir.cleanup()
+
+    def test_jobs_are_rendered_by_children(self):
+        """Test that submitted jobs are written and unseeded jobs get different seeds."""
+        responses = []
+        for i, format_name in enumerate(["pdf", "html", "html"]):
+            output = os.path.join(self.tmp_dir.name, f"course{i}.{format_name}")
+            responses.append(submit({"days": 3, "level": "2", "format": format_name, "output": output},
+                                    self.socket_path, timeout=30))
+            self.assertTrue(responses[-1]["ok"], responses[-1])
+            self.assertGreater(os.path.getsize(output), 0)
+
+        self.assertEqual(len({response["seed"] for response in responses}), 3)
+
+    def test_seeded_jobs_reproduce(self):
+        """Test that forked children give the same course for the same seed."""
+        contents = []
+        for i in range(2):
+            output = os.path.join(self.tmp_dir.name, f"seeded{i}.md")
+            submit({"days": 5, "seed": 9, "format": "md", "output": output}, self.socket_path, timeout=30)
+            with open(output, encoding="utf-8") as f:
+                contents.append(f.read())
+
+        self.assertEqual(contents[0], contents[1])
+
+    def test_bad_request_reports_error(self):
+        """Test that a failing job answers with an error and leaves no file."""
+        output = os.path.join(self.tmp_dir.name, "bad.pdf")
+        response = submit({"level": "expert", "output": output}, self.socket_path, timeout=30)
+
+        self.assertFalse(response["ok"])
+        self.assertIn("Unknown level", response["error"])
+        self.assertFalse(os.path.exists(output))
+
+    def test_socket_is_private(self):
+        """Test that only the server's user can connect, and a second server won't take over the socket."""
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o777, 0o600)
+        with self.assertRaises(RuntimeError):
+            bind_unix_socket(self.socket_path)
+
+    def test_relative_output_refused(self):
+        """Test that jobs must name an absolute output path."""
+        response = submit({"days": 1, "format": "md", "output": "relative.md"}, self.socket_path, timeout=30)
+
+        self.assertFalse(response["ok"])
+        self.assertIn("absolute path", response["error"])
+
+class TestServerSocket(unittest.TestCase):
+    def test_stale_socket_replaced(self):
+        """Test that a socket file nobody listens on is replaced."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "stale.sock")
+            bind_unix_socket(path).close()
+            listener = bind_unix_socket(path)
+            listener.close()
+
+            with open(os.path.join(tmp_dir, "file"), "w") as f:
+                f.write("not a socket")
+            with self.assertRaises(FileExistsError):
+                bind_unix_socket(os.path.join(tmp_dir, "file"))
+
+    def test_output_root(self):
+        """Test that outputs outside the output root are refused, through symlinks too."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = os.path.join(tmp_dir, "courses")
+            os.mkdir(root)
+            os.symlink(tmp_dir, os.path.join(root, "up"))
+
+            self.assertEqual(check_output_path(os.path.join(root, "a.pdf"), root), os.path.join(root, "a.pdf"))
+            for path in [os.path.join(tmp_dir, "a.pdf"), os.path.join(root, "..", "a.pdf"),
+                         os.path.join(root, "up", "a.pdf")]:
+                with self.assertRaises(ValueError):
+                    check_output_path(path, root)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.generator import CourseGenerator
+from src.course_generator.metrics import REGISTRY, MetricsRegistry
+
+class TestMetrics(unittest.TestCase):
+    def test_prometheus_text_format(self):
+        """Test that counters and histograms render in the Prometheus text format."""
+        registry = MetricsRegistry()
+        registry.counter("jobs_total", "Jobs run.", ["kind"]).labels(kind="pdf").inc(3)
+        histogram = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5)
+
+        self.assertEqual(registry.render().splitlines(), [
+            "# HELP jobs_total Jobs run.",
+            "# TYPE jobs_total counter",
+            'jobs_total{kind="pdf"} 3',
+            "# HELP latency_seconds Latency.",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{le="0.1"} 1',
+            'latency_seconds_bucket{le="1"} 2',
+            'latency_seconds_bucket{le="+Inf"} 3',
+            "latency_seconds_sum 5.55",
+            "latency_seconds_count 3",
+        ])
+
+    def test_write_textfile(self):
+        """Test that snapshots are written to a file without leftovers."""
+        registry = MetricsRegistry()
+        registry.counter("written_total", "Written.").inc()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "handstand.prom")
+            registry.write_textfile(path)
+            self.assertEqual(os.listdir(tmp), ["handstand.prom"])
+            with open(path) as f:
+                self.assertIn("written_total 1", f.read())
+
+    def test_generator_records_metrics(self):
+        """Test that generating a course updates the shared registry."""
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        generator = CourseGenerator(
+            os.path.join(project_root, "data", "exercises", "vocabulary.json"),
+            os.path.join(project_root, "data", "exercises", "program_templates.json")
+        )
+        courses = REGISTRY.get("handstand_courses_generated_total").labels(template="Beginner Handstand Program")
+        sessions = REGISTRY.get("handstand_course_sessions")
+        dropped = REGISTRY.get("handstand_exercises_dropped_total")
+        before = (courses.value, sessions.count, dropped.value)
+
+        generator.generate_course("Metrics", 5)
+
+        self.assertEqual(courses.value, before[0] + 1)
+        self.assertEqual(sessions.count, before[1] + 1)
+        # The beginner template references ids missing from the vocabulary
+        self.assertGreater(dropped.value, before[2])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,21 @@
 import unittest
+import gc
+import io
 import os
 import sys
+import tempfile
+
+from reportlab.lib.styles import ParagraphStyle
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.course_generator.generator import CourseGenerator
 from src.pdf_generator.generator import PDFGenerator
+from src.pdf_generator.fonts import default_unicode_family, register_font_family, REPORTLAB_FONTS_DIR
+from src.pdf_generator.layout_cache import ParagraphLayoutCache
+from src.pdf_generator.profiles import get_profile
+from src.course_generator.assets import AssetStore, find_images
 
 class TestPDFGenerator(unittest.TestCase):
     def setUp(self):
@@ -31,6 +40,141 @@ class TestPDFGenerator(unittest.TestCase):
         # Check that the file is not empty
         self.assertGreater(os.path.getsize(self.output_path), 0)
 
+    def test_generate_pdf_from_stream(self):
+        """Test that a lazily generated course can be rendered."""
+        generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+        course = generator.stream_course("Streamed Course", 10, "beginner_handstand")
+
+        pdf_generator = PDFGenerator(self.output_path)
+        pdf_generator.generate_pdf(course)
+
+        self.assertGreater(os.path.getsize(self.output_path), 0)
+        self.assertEqual(len(pdf_generator.story), 0)
+
+    def test_unicode_font_registered_once(self):
+        """Test that a font family is parsed once and reused across generators."""
+        family = default_unicode_family()
+        again = register_font_family("Vera", os.path.join(REPORTLAB_FONTS_DIR, "Vera.ttf"))
+
+        self.assertIs(family, again)
+        self.assertIs(PDFGenerator(self.output_path, family).font_family, PDFGenerator(self.output_path, family).font_family)
+
+    def test_unicode_pdf_reuses_glyph_subsets(self):
+        """Test that a second document with the same characters reuses the cached subset."""
+        from reportlab.pdfbase import pdfmetrics
+
+        family = default_unicode_family()
+        generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+        course = generator.generate_course("Relevé & Plié", 3, "beginner_handstand", seed=11)
+        cache = pdfmetrics.getFont(family.regular).subset_cache
+        PDFGenerator(self.output_path, family).generate_pdf(course)
+        hits = cache.cache_info().hits
+        PDFGenerator(self.output_path, family).generate_pdf(course)
+
+        self.assertGreater(cache.cache_info().hits, hits)
+        self.assertGreater(os.path.getsize(self.output_path), 0)
+
+    def test_descriptions_laid_out_once(self):
+        """Test that repeated descriptions reuse the cached paragraph layout."""
+        generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+        course = generator.generate_course("Test Course", 14, "beginner_handstand", seed=5)
+        cache = ParagraphLayoutCache()
+
+        PDFGenerator(self.output_path, layout_cache=cache).generate_pdf(course)
+        laid_out = len(cache)
+        misses = cache.misses
+        PDFGenerator(self.output_path, layout_cache=cache).generate_pdf(course)
+
+        unique = {exercise.description for session in course.sessions
+                  for exercises in session.sections.values() for exercise in exercises}
+        self.assertEqual(laid_out, len(unique))
+        self.assertEqual(cache.misses, misses)
+        self.assertGreater(cache.hits, 0)
+
+    def test_layout_cache_forgets_dropped_styles(self):
+        """Test that the cache doesn't keep styles alive, and equal styles share layouts."""
+        cache = ParagraphLayoutCache()
+        for _ in range(3):
+            cache.paragraph("Hold the position.", ParagraphStyle("Description", fontSize=9)).wrap(200, 100)
+        gc.collect()
+
+        self.assertEqual(len(cache._style_keys), 0)
+        self.assertEqual((len(cache), cache.misses), (1, 1))
+
+    def test_truncated_descriptions(self):
+        """Test that descriptions can still be cut to a single line."""
+        pdf_generator = PDFGenerator(self.output_path, full_descriptions=False)
+
+        self.assertEqual(pdf_generator.description_cell("x" * 60), "x" * 50 + "...")
+        self.assertEqual(pdf_generator.description_cell("Short"), "Short")
+
+    def test_output_profiles(self):
+        """Test that profiles control compression, font embedding and layout detail."""
+        generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+        course = generator.generate_course("Profiles", 2, "beginner_handstand", seed=1)
+        outputs = {}
+        for name in ("draft", "screen", "print"):
+            outputs[name] = io.BytesIO()
+            PDFGenerator(outputs[name], profile=name).render(course)
+
+        self.assertNotIn(b"/FlateDecode", outputs["draft"].getvalue())
+        self.assertIn(b"/FlateDecode", outputs["screen"].getvalue())
+        self.assertNotIn(b"/FontFile2", outputs["screen"].getvalue())
+        self.assertIn(b"/FontFile2", outputs["print"].getvalue())
+        self.assertEqual(PDFGenerator(io.BytesIO(), profile="draft").font_family.regular, "Helvetica")
+        family = default_unicode_family()
+        self.assertIs(PDFGenerator(io.BytesIO(), font_family=family, profile="draft").font_family, family)
+        self.assertFalse(PDFGenerator(io.BytesIO(), profile="draft").full_descriptions)
+        self.assertTrue(PDFGenerator(io.BytesIO(), profile="draft", full_descriptions=True).full_descriptions)
+        with self.assertRaises(ValueError):
+            get_profile("poster")
+
+    def test_profile_images(self):
+        """Test that exercise thumbnails are drawn at the size the profile asks for."""
+        from PIL import Image
+
+        generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+        course = generator.generate_course("Images", 1, "beginner_handstand", seed=1)
+        with tempfile.TemporaryDirectory() as base_dir:
+            exercise_dir = os.path.join(base_dir, "Handstand", "Wall Walk")
+            os.makedirs(exercise_dir)
+            open(os.path.join(exercise_dir, "exercise.json"), "w").close()
+            Image.new("RGB", (1000, 800), "red").save(os.path.join(exercise_dir, "photo.png"))
+            store = AssetStore(base_dir, sizes=(160, 480))
+            images = find_images(base_dir)
+            store.ingest(images)
+            asset_path = store.exercise_images(images)["Handstand/Wall Walk"][0]
+            exercise = course.sessions[0].sections["Handstand"][0]
+            exercise.image = asset_path
+
+            screen = PDFGenerator(io.BytesIO(), profile="screen", asset_store=store)
+            self.assertTrue(screen.image_path(exercise).endswith("_160.png"))
+            self.assertTrue(PDFGenerator(io.BytesIO(), profile="print", asset_store=store)
+                            .image_path(exercise).endswith("_480.png"))
+            self.assertIsNone(PDFGenerator(io.BytesIO(), profile="draft", asset_store=store).image_path(exercise))
+
+            screen.render(course)
+            self.assertIn(b"/Subtype /Image", screen.output_path.getvalue())
+
+    def test_appendix_layout(self):
+        """Test that appendix mode describes each exercise once and links every row to it."""
+        generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+        course = generator.generate_course("Appendix", 14, "intermediate_handstand", seed=1)
+        rows = [exercise for session in course.sessions
+                for exercises in session.sections.values() for exercise in exercises]
+
+        inline = PDFGenerator(io.BytesIO())
+        inline.render(course)
+        for profile in ("draft", "screen"):
+            appendix = PDFGenerator(io.BytesIO(), profile=profile, appendix=True)
+            appendix.render(course)
+            data = appendix.output_path.getvalue()
+
+            self.assertEqual(len(appendix.appendix_exercises), len({exercise.exercise_id for exercise in rows}))
+            self.assertEqual(data.count(b"/Subtype /Link"), len(rows))
+            self.assertIn(b"/Outlines", data)
+            self.assertLess(appendix.doc.page, inline.doc.page)
+
     def tearDown(self):
         """Clean up test files."""
         if os.path.exists(self.output_path):
@@ -0,0 +1,91 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.generator import CourseGenerator
+from src.course_generator.personalization import MassPersonalizer, UserProfile, load_profiles, parse_equipment
+
+class TestMassPersonalizer(unittest.TestCase):
+    def setUp(self):
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.vocabulary_path = os.path.join(project_root, "data", "exercises", "vocabulary.json")
+        self.templates_path = os.path.join(project_root, "data", "exercises", "program_templates.json")
+        self.generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+
+    def test_parse_equipment(self):
+        """Test that free-text equipment is parsed into requirements."""
+        self.assertEqual(parse_equipment("none"), [])
+        self.assertEqual(parse_equipment("strap optional"), [])
+        self.assertEqual(parse_equipment("wall, yoga mat"), [frozenset({"wall"}), frozenset({"yoga mat"})])
+        self.assertEqual(parse_equipment("wall or bar"), [frozenset({"wall", "bar"})])
+
+    def test_equivalent_profiles_share_course(self):
+        """Test that profiles differing only in name reuse one generated course, each in its own copy."""
+        personalizer = MassPersonalizer(self.generator, master_seed=5)
+        alice = personalizer.personalize(UserProfile("1", "Alice", "beginner", 7, ["wall"]))
+        bob = personalizer.personalize(UserProfile("2", "Bob", "beginner", 7, ["wall"]))
+        personalizer.personalize(UserProfile("3", "Carol", "beginner", 14, ["wall"]))
+
+        self.assertEqual(alice.name, "Alice")
+        self.assertEqual(bob.name, "Bob")
+        self.assertEqual([session.to_dict() for session in alice.sessions],
+                         [session.to_dict() for session in bob.sessions])
+        self.assertEqual(personalizer.distinct_templates, 1)
+        self.assertEqual(personalizer.distinct_courses, 2)
+
+        alice.sessions[0].name = "Rest day"
+        alice.sessions[1].sections["Handstand"][0].sets = 9
+        alice.sessions[2].sections.clear()
+        dan = personalizer.personalize(UserProfile("4", "Dan", "beginner", 7, ["wall"]))
+        self.assertEqual([session.to_dict() for session in dan.sessions],
+                         [session.to_dict() for session in bob.sessions])
+        self.assertNotEqual(bob.sessions[0].name, "Rest day")
+
+    def test_filters_equipment_and_muscle_groups(self):
+        """Test that the filtered template only keeps usable exercises."""
+        personalizer = MassPersonalizer(self.generator)
+        profile = UserProfile("1", "No Wall", "intermediate", 5, equipment=[], excluded_muscle_groups=["wrists"])
+        course = personalizer.personalize(profile)
+
+        for session in course.sessions:
+            for exercises in session.sections.values():
+                for exercise in exercises:
+                    self.assertEqual(parse_equipment(exercise.equipment), [])
+                    self.assertNotIn("wrists", exercise.primary_muscle_groups)
+
+    def test_group_seed_independent_of_order(self):
+        """Test that a group's course does not depend on which profiles came first."""
+        profile = UserProfile("1", "Alice", "advanced", 6)
+        first = MassPersonalizer(self.generator, master_seed=9)
+        second = MassPersonalizer(self.generator, master_seed=9)
+        second.personalize(UserProfile("0", "Zed", "beginner", 3))
+
+        self.assertEqual(first.personalize(profile).to_dict(), second.personalize(profile).to_dict())
+
+    def test_load_profiles_csv_and_jsonl(self):
+        """Test that profiles load from both CSV and JSONL."""
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "profiles.csv")
+            with open(csv_path, "w") as f:
+                f.write("user_id,course_name,level,days,equipment,excluded_muscle_groups\n")
+                f.write("u1,Plan,Intermediate,10,wall;Yoga Mat,wrists|neck\n")
+            jsonl_path = os.path.join(tmp, "profiles.jsonl")
+            with open(jsonl_path, "w") as f:
+                f.write(json.dumps({"user_id": "u2", "level": "advanced", "days": 5, "equipment": ["wall"]}) + "\n")
+
+            from_csv = list(load_profiles(csv_path))[0]
+            from_jsonl = list(load_profiles(jsonl_path))[0]
+
+        self.assertEqual(from_csv.equipment, frozenset({"wall", "yoga mat"}))
+        self.assertEqual(from_csv.excluded_muscle_groups, frozenset({"wrists", "neck"}))
+        self.assertEqual(from_csv.template_name, "intermediate_handstand")
+        self.assertEqual(from_jsonl.days, 5)
+        self.assertIsNone(UserProfile.from_dict({"user_id": "u3"}).equipment)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.profiling import AllocationProfiler
+
+class TestAllocationProfiler(unittest.TestCase):
+    def test_stage_reports(self):
+        """Test that each stage reports peak, retained memory and allocation sites."""
+        profiler = AllocationProfiler(top=3)
+        with profiler:
+            with profiler.stage("allocate"):
+                kept = [bytearray(1024) for _ in range(200)]
+            with profiler.stage("release"):
+                kept.clear()
+
+        allocate, release = profiler.stages
+        self.assertEqual(allocate["stage"], "allocate")
+        self.assertGreater(allocate["peak_increase_bytes"], 200 * 1024)
+        self.assertGreater(allocate["retained_bytes"], 200 * 1024)
+        self.assertLess(release["retained_bytes"], 0)
+        self.assertTrue(allocate["top_allocations"][0]["file"].endswith("test_profiling.py"))
+
+    def test_empty_stage_peak(self):
+        """Test that an empty stage's peak doesn't include the profiler's own snapshot."""
+        profiler = AllocationProfiler()
+        with profiler:
+            kept = [bytearray(1024) for _ in range(2000)]
+            with profiler.stage("empty"):
+                pass
+
+        self.assertLess(profiler.stages[0]["peak_increase_bytes"], 1024)
+        del kept
+
+    def test_write_json(self):
+        """Test that the report is written as JSON."""
+        profiler = AllocationProfiler()
+        with profiler.stage("standalone"):
+            [str(i) for i in range(1000)]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "memory.json")
+            profiler.write_json(path)
+            with open(path) as f:
+                report = json.load(f)
+
+        self.assertEqual([stage["stage"] for stage in report["stages"]], ["standalone"])
+        self.assertGreater(report["overall_peak_bytes"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
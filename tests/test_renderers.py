@@ -0,0 +1,78 @@
+import unittest
+import io
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.generator import CourseGenerator
+from src.course_generator.models import Course, Exercise, Session
+from src.pdf_generator.generator import PDFGenerator
+from src.pdf_generator.markup import HTMLRenderer, MarkdownRenderer, compile_template
+from src.pdf_generator.renderer import FORMATS, CourseRenderer, create_renderer
+
+class TestRenderers(unittest.TestCase):
+    def setUp(self):
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.vocabulary_path = os.path.join(project_root, "data", "exercises", "vocabulary.json")
+        self.templates_path = os.path.join(project_root, "data", "exercises", "program_templates.json")
+
+    def sample_course(self):
+        course = Course("Tom & Jerry's <Course>", 1)
+        course.add_session(Session("Day 1", {
+            "Handstand": [Exercise("Wall *Hold*", "Push <tall> & stay hollow", 3, "30 seconds")]
+        }))
+        return course
+
+    def test_compile_template(self):
+        """Test that a compiled template fills repeated and literal-brace fields."""
+        render = compile_template("{a}-{b}-{a} {{literal}}")
+
+        self.assertEqual(render(a="x", b=2), "x-2-x {literal}")
+
+    def test_every_format_has_a_renderer(self):
+        """Test that the CLI formats map to renderers sharing one interface."""
+        for format_name in FORMATS:
+            renderer = create_renderer(format_name, io.StringIO())
+            self.assertIsInstance(renderer, CourseRenderer)
+            self.assertEqual(renderer.format_name, format_name)
+        self.assertIsInstance(create_renderer("pdf", io.BytesIO()), PDFGenerator)
+        with self.assertRaises(ValueError):
+            create_renderer("docx", io.StringIO())
+        with self.assertRaises(TypeError):
+            CourseRenderer(io.StringIO())
+
+    def test_html_escapes_course_text(self):
+        """Test that names and descriptions are HTML-escaped."""
+        output = io.StringIO()
+        HTMLRenderer(output).render(self.sample_course())
+        page = output.getvalue()
+
+        self.assertIn("<title>Tom &amp; Jerry&#x27;s &lt;Course&gt;</title>", page)
+        self.assertIn("Push &lt;tall&gt; &amp; stay hollow", page)
+        self.assertIn('<span class="dose">3 &times; 30 seconds</span>', page)
+        self.assertTrue(page.rstrip().endswith("</html>"))
+
+    def test_markdown_escapes_course_text(self):
+        """Test that Markdown syntax in course text is escaped."""
+        output = io.StringIO()
+        MarkdownRenderer(output).render(self.sample_course())
+
+        self.assertIn("- **Wall \\*Hold\\*** — 3 × 30 seconds", output.getvalue())
+        self.assertIn("## Day 1", output.getvalue())
+
+    def test_streamed_course_renders_like_stored_course(self):
+        """Test that text renderers give the same output for streamed courses."""
+        generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+        streamed = generator.stream_course("Test Course", 10, "beginner_handstand", seed=4)
+        for format_name in ("html", "md", "json"):
+            stored, lazy = io.StringIO(), io.StringIO()
+            create_renderer(format_name, stored).render(streamed.materialize())
+            create_renderer(format_name, lazy).render(streamed)
+            self.assertEqual(stored.getvalue(), lazy.getvalue())
+        self.assertEqual(len(json.loads(lazy.getvalue())["sessions"]), 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import asyncio
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.scheduler import JobScheduler
+
+class TestJobScheduler(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(1)
+        self.release = threading.Event()
+        self.order = []
+
+    def tearDown(self):
+        self.release.set()
+        self.executor.shutdown()
+
+    def blocker(self):
+        self.release.wait(10)
+        return "blocker"
+
+    def record(self, name):
+        self.order.append(name)
+        return name
+
+    def test_interactive_jobs_run_before_queued_batch_jobs(self):
+        """Test that an interactive job waits only for the job already running."""
+        async def scenario():
+            async with JobScheduler(self.executor, 1) as scheduler:
+                blocker = asyncio.create_task(scheduler.submit("batch", self.blocker))
+                batch = [asyncio.create_task(scheduler.submit("batch", self.record, f"batch{i}")) for i in range(5)]
+                await asyncio.sleep(0.05)
+                interactive = asyncio.create_task(scheduler.submit("interactive", self.record, "interactive"))
+                await asyncio.sleep(0.05)
+                self.assertEqual(scheduler.queue_depths(), {"interactive": 1, "batch": 5})
+                self.release.set()
+                await asyncio.gather(blocker, interactive, *batch)
+                return scheduler.snapshot()
+
+        stats = asyncio.run(scenario())
+
+        self.assertEqual(self.order, ["interactive"] + [f"batch{i}" for i in range(5)])
+        self.assertEqual(stats["batch"]["completed"], 6)
+        self.assertEqual(stats["interactive"]["depth"], 0)
+        self.assertLess(stats["interactive"]["wait_max"], stats["batch"]["wait_max"])
+
+    def test_full_queue_blocks_submitters(self):
+        """Test that submitting to a full queue waits until a job is taken from it."""
+        async def scenario():
+            async with JobScheduler(self.executor, 1, {"interactive": 1, "batch": 2}) as scheduler:
+                tasks = [asyncio.create_task(scheduler.submit("batch", self.blocker))]
+                await asyncio.sleep(0.05)
+                tasks += [asyncio.create_task(scheduler.submit("batch", self.record, f"batch{i}")) for i in range(4)]
+                await asyncio.sleep(0.05)
+                # Two queued, two still waiting to get in
+                self.assertEqual(scheduler.queue_depths()["batch"], 2)
+                self.assertEqual(scheduler.stats["batch"].submitted, 3)
+                self.release.set()
+                await asyncio.gather(*tasks)
+                return scheduler.snapshot()
+
+        stats = asyncio.run(scenario())
+
+        self.assertEqual(self.order, [f"batch{i}" for i in range(4)])
+        self.assertEqual(stats["batch"]["submitted"], 5)
+
+    def test_timed_out_jobs_are_dropped(self):
+        """Test that a job timing out while queued raises and never runs."""
+        async def scenario():
+            async with JobScheduler(self.executor, 1) as scheduler:
+                blocker = asyncio.create_task(scheduler.submit("batch", self.blocker))
+                await asyncio.sleep(0.05)
+                with self.assertRaises(asyncio.TimeoutError):
+                    await scheduler.submit("interactive", self.record, "late", timeout=0.05)
+                self.release.set()
+                await blocker
+                return scheduler.snapshot()
+
+        stats = asyncio.run(scenario())
+
+        self.assertEqual(self.order, [])
+        self.assertEqual(stats["interactive"]["timed_out"], 1)
+        self.assertEqual(stats["interactive"]["completed"], 0)
+
+    def test_timeout_covers_waiting_for_room(self):
+        """Test that a submitter blocked on a full queue times out too."""
+        async def scenario():
+            async with JobScheduler(self.executor, 1, {"interactive": 1, "batch": 1}) as scheduler:
+                blocker = asyncio.create_task(scheduler.submit("batch", self.blocker))
+                await asyncio.sleep(0.05)
+                queued = asyncio.create_task(scheduler.submit("batch", self.record, "queued"))
+                await asyncio.sleep(0.05)
+                with self.assertRaises(asyncio.TimeoutError):
+                    await scheduler.submit("batch", self.record, "blocked", timeout=0.05)
+                self.release.set()
+                await asyncio.gather(blocker, queued)
+                return scheduler.snapshot()
+
+        stats = asyncio.run(scenario())
+
+        self.assertEqual(self.order, ["queued"])
+        self.assertEqual((stats["batch"]["submitted"], stats["batch"]["timed_out"]), (2, 1))
+
+    def test_running_job_that_times_out_then_fails(self):
+        """Test that a job failing after its timeout counts as timed out only."""
+        def fail_later():
+            self.release.wait(10)
+            raise ValueError("too late")
+
+        async def scenario():
+            async with JobScheduler(self.executor, 1) as scheduler:
+                with self.assertRaises(asyncio.TimeoutError):
+                    await scheduler.submit("batch", fail_later, timeout=0.05)
+                self.release.set()
+            return scheduler.snapshot()
+
+        stats = asyncio.run(scenario())
+
+        self.assertEqual((stats["batch"]["timed_out"], stats["batch"]["failed"]), (1, 0))
+
+    def test_process_pool_results_and_errors(self):
+        """Test that jobs run in worker processes and their errors reach the submitter."""
+        async def scenario():
+            with ProcessPoolExecutor(2) as executor:
+                async with JobScheduler(executor, 2) as scheduler:
+                    results = await asyncio.gather(*(scheduler.submit("batch", pow, i, 2) for i in range(10)))
+                    with self.assertRaises(ValueError):
+                        await scheduler.submit("interactive", int, "not a number")
+                    with self.assertRaises(ValueError):
+                        await scheduler.submit("urgent", pow, 2, 2)
+                    return results, scheduler.snapshot()
+
+        results, stats = asyncio.run(scenario())
+
+        self.assertEqual(results, [i * i for i in range(10)])
+        self.assertEqual(stats["batch"]["completed"], 10)
+        self.assertEqual(stats["interactive"]["failed"], 1)
+
+if __name__ == '__main__':
+    unittest.main()
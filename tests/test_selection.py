@@ -0,0 +1,133 @@
+import unittest
+import os
+import random
+import sys
+from collections import Counter
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.generator import CourseGenerator
+from src.course_generator.selection import AliasTable, SectionSelector, WeightedSectionSelector
+from src.course_generator.validation import validate_templates
+
+class TestSectionSelector(unittest.TestCase):
+    def setUp(self):
+        self.pool = [f"ex_{i:03d}" for i in range(12)]
+
+    def test_no_repeat_window(self):
+        """Test that an exercise stays out of the following window days."""
+        selector = SectionSelector(self.pool, random.Random(1), window=3)
+        days = [selector.pick(3) for _ in range(200)]
+
+        for day, picks in enumerate(days):
+            self.assertEqual(len(set(picks)), 3)
+            for previous in days[max(0, day - 3):day]:
+                self.assertFalse(set(picks) & set(previous))
+
+    def test_even_rotation(self):
+        """Test that every exercise is used once per cycle through the pool."""
+        selector = SectionSelector(self.pool, random.Random(2), window=1)
+        picks = [ex_id for _ in range(40) for ex_id in selector.pick(3)]
+        counts = Counter(picks)
+
+        self.assertEqual(set(counts), set(self.pool))
+        self.assertEqual(counts.most_common()[0][1], 10)
+        self.assertEqual(counts.most_common()[-1][1], 10)
+
+    def test_small_pool_relaxes_window(self):
+        """Test that a pool too small for the window still yields distinct daily picks."""
+        selector = SectionSelector(["a", "b", "c"], random.Random(3), window=5)
+        for _ in range(20):
+            picks = selector.pick(2)
+            self.assertEqual(len(set(picks)), 2)
+        self.assertEqual(sorted(selector.pick(10)), ["a", "b", "c"])
+
+    def test_empty_days_in_window(self):
+        """Test that days with no picks don't stop the window from being relaxed."""
+        selector = SectionSelector(["a", "b", "c"], random.Random(8), window=2)
+        for count in [0, 3, 1, 0, 0, 2, 3]:
+            self.assertEqual(len(set(selector.pick(count))), count)
+
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        generator = CourseGenerator(os.path.join(project_root, "data", "exercises", "vocabulary.json"),
+                                    os.path.join(project_root, "data", "exercises", "program_templates.json"))
+        template = generator.get_template("beginner_handstand")
+        sections = {name: dict(config) for name, config in template["sections"].items()}
+        sections["Prehab"].update(min_exercises=0, no_repeat_days=2)
+        sessions = list(generator.iter_template_sessions(30, dict(template, sections=sections), seed=0))
+        self.assertEqual(len(sessions), 30)
+
+class TestWeightedSelection(unittest.TestCase):
+    def test_alias_table_distribution(self):
+        """Test that alias draws follow the weights."""
+        table = AliasTable(["a", "b", "c", "d"], [1, 2, 3, 4])
+        rng = random.Random(4)
+        counts = Counter(table.sample(rng) for _ in range(100000))
+
+        for item, weight in zip("abcd", [1, 2, 3, 4]):
+            self.assertAlmostEqual(counts[item] / 100000, weight / 10, delta=0.01)
+        with self.assertRaises(ValueError):
+            AliasTable(["a"], [0])
+
+    def test_weighted_no_repeat_window(self):
+        """Test that weighted picks are distinct per day and respect the window, small and large pools."""
+        for size in (12, 200):
+            pool = [f"ex_{i:03d}" for i in range(size)]
+            selector = WeightedSectionSelector(pool, [1 + i % 5 for i in range(size)], random.Random(5), window=3)
+            days = [selector.pick(3) for _ in range(300)]
+
+            for day, picks in enumerate(days):
+                self.assertEqual(len(set(picks)), 3)
+                for previous in days[max(0, day - 3):day]:
+                    self.assertFalse(set(picks) & set(previous))
+
+    def test_weighted_empty_days_in_window(self):
+        """Test that days with no picks don't stop the window from being relaxed, small and large pools."""
+        for size in (12, 200):
+            pool = [f"ex_{i:03d}" for i in range(size)]
+            selector = WeightedSectionSelector(pool, [1 + i % 5 for i in range(size)], random.Random(9), window=2)
+            self.assertEqual(selector.pick(0), [])
+            self.assertEqual(len(set(selector.pick(size))), size)
+            self.assertEqual(len(selector.pick(1)), 1)
+
+    def test_weights_favour_staples(self):
+        """Test that heavier exercises are picked more often, and a tight pool still works."""
+        selector = WeightedSectionSelector(["staple", "b", "c", "d", "e", "f"], [10, 1, 1, 1, 1, 1],
+                                           random.Random(6), window=0)
+        counts = Counter(ex_id for _ in range(3000) for ex_id in selector.pick(1))
+        self.assertGreater(counts["staple"], 3 * max(counts[ex_id] for ex_id in "bcdef"))
+
+        selector = WeightedSectionSelector(["a", "b", "c"], [5, 1, 1], random.Random(7), window=5)
+        for _ in range(20):
+            self.assertEqual(len(set(selector.pick(2))), 2)
+        self.assertEqual(sorted(selector.pick(10)), ["a", "b", "c"])
+
+    def test_weighted_template(self):
+        """Test that section weights in a template steer generated courses."""
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        generator = CourseGenerator(os.path.join(project_root, "data", "exercises", "vocabulary.json"),
+                                    os.path.join(project_root, "data", "exercises", "program_templates.json"))
+        template = generator.get_template("intermediate_handstand")
+        sections = {name: dict(config) for name, config in template["sections"].items()}
+        staple = sections["Handstand"]["exercise_ids"][0]
+        sections["Handstand"]["weights"] = {staple: 50}
+        sections["Handstand"]["no_repeat_days"] = 0
+        weighted = dict(template, sections=sections)
+
+        counts = Counter(exercise.exercise_id for session in generator.iter_template_sessions(200, weighted, seed=1)
+                         for exercise in session.sections["Handstand"])
+        self.assertEqual(counts.most_common(1)[0][0], staple)
+        self.assertGreater(counts[staple], 180)
+
+    def test_weight_validation(self):
+        """Test that weights must be positive and belong to listed exercises."""
+        def template(weights):
+            return {"t": {"sections": {"Warmup": {"exercise_ids": ["a", "b"], "weights": weights}}}}
+
+        self.assertEqual(validate_templates(template({"a": 3, "b": 0.5})), [])
+        self.assertEqual(len(validate_templates(template({"a": 0}))), 1)
+        self.assertEqual(len(validate_templates(template({"z": 2}))), 1)
+
+if __name__ == '__main__':
+    unittest.main()
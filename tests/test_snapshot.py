@@ -0,0 +1,107 @@
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.generator import CourseGenerator
+from src.course_generator.snapshot import SnapshotReloader
+from src.course_generator.validation import TemplateError
+
+class TestSnapshotReload(unittest.TestCase):
+    def setUp(self):
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.vocabulary_path = os.path.join(self.tmp_dir.name, "vocabulary.json")
+        self.templates_path = os.path.join(self.tmp_dir.name, "program_templates.json")
+        shutil.copy(os.path.join(project_root, "data", "exercises", "vocabulary.json"), self.vocabulary_path)
+        shutil.copy(os.path.join(project_root, "data", "exercises", "program_templates.json"), self.templates_path)
+        self.generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def edit_templates(self, edit):
+        with open(self.templates_path) as f:
+            data = json.load(f)
+        edit(data["program_templates"])
+        with open(self.templates_path, "w") as f:
+            json.dump(data, f)
+        # Make sure the change is visible even on coarse mtime clocks
+        stat = os.stat(self.templates_path)
+        os.utime(self.templates_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    @staticmethod
+    def only_handstand_wall_hold(templates):
+        templates["beginner_handstand"]["sections"] = {
+            "Handstand": {"exercise_ids": ["handstand_001"], "min_exercises": 1, "max_exercises": 1}
+        }
+
+    def test_in_flight_course_keeps_its_snapshot(self):
+        """Test that a course started before a reload is generated from the old data."""
+        before = self.generator.stream_course("Test Course", 5, "beginner_handstand", seed=3)
+        old_snapshot = self.generator.snapshot
+        reloader = SnapshotReloader(self.generator)
+        self.edit_templates(self.only_handstand_wall_hold)
+
+        self.assertTrue(reloader.check())
+        self.assertIsNot(self.generator.snapshot, old_snapshot)
+        self.assertEqual(self.generator.snapshot.version, old_snapshot.version + 1)
+        after = self.generator.stream_course("Test Course", 5, "beginner_handstand", seed=3)
+        self.assertGreater(len(next(before.iter_sessions()).sections), 1)
+        self.assertEqual(list(next(after.iter_sessions()).sections), ["Handstand"])
+
+    def test_invalid_edit_keeps_current_snapshot(self):
+        """Test that a template that fails validation is reported and not swapped in."""
+        errors = []
+        reloader = SnapshotReloader(self.generator, on_error=errors.append)
+        snapshot = self.generator.snapshot
+        def break_bounds(templates):
+            templates["beginner_handstand"]["sections"]["Handstand"]["min_exercises"] = 9
+        self.edit_templates(break_bounds)
+
+        self.assertFalse(reloader.check())
+        self.assertIs(self.generator.snapshot, snapshot)
+        self.assertIsInstance(errors[0], TemplateError)
+        self.assertFalse(reloader.check())
+        self.assertEqual(len(errors), 1)
+
+    def test_unexpected_error_keeps_polling(self):
+        """Test that a vocabulary saved as null is reported, and a later fix is still picked up."""
+        errors = []
+        reloader = SnapshotReloader(self.generator, on_error=errors.append)
+        with open(self.vocabulary_path) as f:
+            vocabulary = f.read()
+        with open(self.vocabulary_path, "w") as f:
+            f.write("null")
+
+        self.assertFalse(reloader.check())
+        self.assertEqual(len(errors), 1)
+        with open(self.vocabulary_path, "w") as f:
+            f.write(vocabulary + "\n")
+        self.assertTrue(reloader.check())
+
+    def test_templates_are_read_only(self):
+        """Test that a snapshot's templates can't be replaced in place."""
+        with self.assertRaises(TypeError):
+            self.generator.snapshot.templates["beginner_handstand"] = {}
+
+    def test_background_reload(self):
+        """Test that the polling thread picks up a change on its own."""
+        reloaded = []
+        with SnapshotReloader(self.generator, interval=0.02, on_reload=reloaded.append):
+            self.edit_templates(self.only_handstand_wall_hold)
+            deadline = time.monotonic() + 5
+            while not reloaded and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertEqual(len(reloaded), 1)
+        self.assertIs(self.generator.snapshot, reloaded[0])
+
+if __name__ == '__main__':
+    unittest.main()
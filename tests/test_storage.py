@@ -0,0 +1,61 @@
+import unittest
+import os
+import pickle
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.generator import CourseGenerator
+from src.course_generator.storage import JSONExerciseStore, SQLiteExerciseStore, open_store
+
+class TestExerciseStores(unittest.TestCase):
+    def setUp(self):
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.exercises_dir = os.path.join(project_root, "data", "exercises")
+        self.vocabulary_path = os.path.join(self.exercises_dir, "vocabulary.json")
+        self.templates_path = os.path.join(self.exercises_dir, "program_templates.json")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "vocabulary.db")
+        self.sqlite_store = SQLiteExerciseStore.build_from_folders(self.db_path, self.exercises_dir, workers=1)
+        self.json_store = JSONExerciseStore(self.vocabulary_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_backends_agree(self):
+        """Test that the SQLite store built from folders matches vocabulary.json."""
+        self.assertEqual(len(self.sqlite_store), len(self.json_store))
+        self.assertEqual(list(self.sqlite_store), list(self.json_store))
+        self.assertEqual(self.sqlite_store["releve_001"].to_dict(), self.json_store["releve_001"].to_dict())
+        self.assertNotIn("missing_001", self.sqlite_store)
+
+    def test_get_many_and_find(self):
+        """Test batched lookups and indexed filtering."""
+        found = self.sqlite_store.get_many(["plank_hold_001", "missing_001", "crow_pose_001"])
+        self.assertEqual(list(found), ["plank_hold_001", "crow_pose_001"])
+
+        for store in (self.sqlite_store, self.json_store):
+            matches = store.find(category="Handstand", difficulty="advanced")
+            self.assertTrue(matches)
+            self.assertTrue(all(ex.category == "Handstand" and ex.difficulty == "advanced" for ex in matches))
+        self.assertEqual([ex.exercise_id for ex in self.sqlite_store.find(equipment="wall")],
+                         [ex.exercise_id for ex in self.json_store.find(equipment="wall")])
+
+    def test_generator_with_sqlite_backend(self):
+        """Test that a generator on the SQLite store produces the same course as on JSON."""
+        sqlite_generator = CourseGenerator(self.db_path, self.templates_path)
+        json_generator = CourseGenerator(self.vocabulary_path, self.templates_path)
+
+        self.assertIsInstance(open_store(self.db_path), SQLiteExerciseStore)
+        self.assertEqual(sqlite_generator.generate_course("Store", 10, seed=3).to_dict(),
+                         json_generator.generate_course("Store", 10, seed=3).to_dict())
+
+    def test_sqlite_store_pickles(self):
+        """Test that the store can be sent to worker processes."""
+        copy = pickle.loads(pickle.dumps(self.sqlite_store))
+        self.assertEqual(copy["releve_001"].name, "Relevé")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.sync import MANIFEST_NAME, VocabularySync
+from src.course_generator.synthetic import generate_exercises, write_category_folders, write_master_files
+
+class TestVocabularySync(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = self.tmp_dir.name
+        self.exercises = list(generate_exercises(12, seed=3))
+        write_master_files(self.base_dir, self.exercises, {})
+        write_category_folders(self.base_dir, self.exercises)
+        self.sync = VocabularySync(self.base_dir)
+        self.assertTrue(self.sync.run().ok)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def folder_file(self, exercise):
+        return os.path.join(self.base_dir, exercise["category"], exercise["name"], "exercise.json")
+
+    def read_json(self, path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def write_json(self, path, data):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+
+    def vocabulary(self):
+        return self.read_json(os.path.join(self.base_dir, "vocabulary.json"))["exercises"]
+
+    def save_vocabulary(self, exercises):
+        self.write_json(os.path.join(self.base_dir, "vocabulary.json"), {"exercises": exercises})
+
+    def test_unchanged_sync_reads_nothing(self):
+        """Test that a sync with nothing to do neither reads files nor rewrites the manifest."""
+        manifest_mtime = os.stat(os.path.join(self.base_dir, MANIFEST_NAME)).st_mtime_ns
+
+        report = self.sync.run()
+
+        self.assertFalse(report.changed)
+        self.assertEqual(report.files_read, 0)
+        self.assertEqual(os.stat(os.path.join(self.base_dir, MANIFEST_NAME)).st_mtime_ns, manifest_mtime)
+
+    def test_changes_propagate_both_ways(self):
+        """Test that edits, renames, deletions and additions reach the other side."""
+        edited, renamed, deleted = self.exercises[0], self.exercises[1], self.exercises[2]
+        self.write_json(self.folder_file(edited), dict(edited, description="Edited in its folder."))
+        vocabulary = [dict(e, name="Renamed Exercise") if e["id"] == renamed["id"] else e
+                      for e in self.vocabulary() if e["id"] != deleted["id"]]
+        self.save_vocabulary(vocabulary)
+        added = dict(self.exercises[3], id="added_exercise", name="Added Exercise")
+        os.makedirs(os.path.dirname(self.folder_file(added)))
+        self.write_json(self.folder_file(added), added)
+
+        report = self.sync.run()
+
+        self.assertTrue(report.ok)
+        self.assertEqual(sorted(report.to_vocabulary), ["added_exercise", edited["id"]])
+        self.assertEqual(report.to_folders, [renamed["id"]])
+        self.assertEqual(report.removed_from_folders, [deleted["id"]])
+        by_id = {e["id"]: e for e in self.vocabulary()}
+        self.assertEqual(by_id[edited["id"]]["description"], "Edited in its folder.")
+        self.assertEqual(by_id["added_exercise"], added)
+        # Added after the last exercise of its category
+        ids = [e["id"] for e in self.vocabulary()]
+        same_category = [e["id"] for e in self.vocabulary() if e["category"] == added["category"]]
+        self.assertEqual(same_category[-1], "added_exercise")
+        self.assertEqual(len(ids), 12)
+        self.assertFalse(os.path.exists(self.folder_file(deleted)))
+        self.assertFalse(os.path.exists(self.folder_file(renamed)))
+        self.assertEqual(self.read_json(self.folder_file(by_id[renamed["id"]]))["name"], "Renamed Exercise")
+        self.assertFalse(self.sync.run().changed)
+
+    def test_conflicting_edits_are_left_alone(self):
+        """Test that an exercise edited on both sides is reported until a side is preferred."""
+        exercise = self.exercises[0]
+        self.write_json(self.folder_file(exercise), dict(exercise, description="Folder edit."))
+        self.save_vocabulary([dict(e, description="Vocabulary edit, longer.") if e["id"] == exercise["id"] else e
+                              for e in self.vocabulary()])
+
+        for _ in range(2):
+            report = self.sync.run()
+            self.assertEqual(report.conflicts, [exercise["id"]])
+            self.assertFalse(report.changed)
+        self.assertEqual(self.read_json(self.folder_file(exercise))["description"], "Folder edit.")
+
+        report = self.sync.run(prefer="vocabulary")
+        self.assertEqual(report.to_folders, [exercise["id"]])
+        self.assertEqual(self.read_json(self.folder_file(exercise))["description"], "Vocabulary edit, longer.")
+        self.assertTrue(self.sync.run().ok)
+
+    def test_invalid_folder_file_is_not_treated_as_deleted(self):
+        """Test that a broken exercise.json is reported and its vocabulary entry kept."""
+        exercise = self.exercises[0]
+        with open(self.folder_file(exercise), "w") as f:
+            f.write("{ not json")
+
+        report = self.sync.run()
+
+        self.assertEqual(len(report.issues), 1)
+        self.assertFalse(report.changed)
+        self.assertIn(exercise["id"], [e["id"] for e in self.vocabulary()])
+
+    def test_renamed_broken_folder_is_not_treated_as_deleted(self):
+        """Test that a folder renamed by hand with a broken exercise.json deletes nothing from the vocabulary."""
+        exercise = self.exercises[0]
+        old_dir = os.path.dirname(self.folder_file(exercise))
+        new_dir = os.path.join(os.path.dirname(old_dir), "Renamed By Hand")
+        os.rename(old_dir, new_dir)
+        with open(os.path.join(new_dir, "exercise.json"), "w") as f:
+            f.write("{ half-edited")
+
+        report = self.sync.run()
+
+        self.assertEqual(len(report.issues), 1)
+        self.assertFalse(report.changed)
+        self.assertIn(exercise["id"], [e["id"] for e in self.vocabulary()])
+
+        self.write_json(os.path.join(new_dir, "exercise.json"), exercise)
+        report = self.sync.run()
+        self.assertTrue(report.ok)
+        self.assertIn(exercise["id"], [e["id"] for e in self.vocabulary()])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.generator import CourseGenerator
+from src.course_generator.synthetic import (generate_exercises, generate_templates,
+                                            write_category_folders, write_master_files)
+from src.course_generator.validation import find_exercise_files, load_exercise_files
+
+class TestSynthetic(unittest.TestCase):
+    def test_deterministic_and_prefix_stable(self):
+        """Test that the same seed gives the same data and smaller runs are prefixes of larger ones."""
+        self.assertEqual(list(generate_exercises(50, seed=3)), list(generate_exercises(50, seed=3)))
+        self.assertEqual(list(generate_exercises(20, seed=3)), list(generate_exercises(50, seed=3))[:20])
+        self.assertNotEqual(list(generate_exercises(20, seed=3)), list(generate_exercises(20, seed=4)))
+        self.assertEqual(generate_templates(60, 5, seed=3), generate_templates(60, 5, seed=3))
+
+    def test_folders_validate_and_templates_generate(self):
+        """Test that synthetic folders pass validation and templates produce courses."""
+        exercises = list(generate_exercises(120))
+        templates = generate_templates(len(exercises), 3)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            write_master_files(tmp_dir, exercises, templates)
+            write_category_folders(tmp_dir, exercises)
+
+            loaded, issues = load_exercise_files(find_exercise_files(tmp_dir), tmp_dir)
+            self.assertEqual(issues, [])
+            self.assertEqual(len(loaded), len(exercises))
+
+            generator = CourseGenerator(os.path.join(tmp_dir, "vocabulary.json"),
+                                        os.path.join(tmp_dir, "program_templates.json"))
+            course = generator.generate_course("Synthetic", 7, "synthetic_template_00002", seed=1)
+            self.assertEqual(len(course.sessions), 7)
+            for session in course.sessions:
+                for section in session.sections.values():
+                    for exercise in section:
+                        self.assertTrue(exercise.exercise_id.startswith("synthetic_"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.generator import CourseGenerator
+from src.course_generator.validation import (ExerciseValidator, VocabularyError, find_exercise_files,
+                                             load_exercise_files, validate_vocabulary)
+
+VALID = {
+    "id": "plank_001",
+    "name": "Plank",
+    "description": "Hold a straight line.",
+    "default_sets": 2,
+    "default_reps": "30 seconds",
+    "difficulty": "beginner",
+    "equipment": "none",
+    "primary_muscle_groups": ["core"],
+    "image": None,
+    "category": "Conditioning"
+}
+
+class TestExerciseValidation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base_dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_exercise(self, category, folder, data):
+        path = os.path.join(self.base_dir, category, folder)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "exercise.json"), "w") as f:
+            json.dump(data, f)
+
+    def test_reports_every_issue(self):
+        """Test that all problems in an exercise are reported together."""
+        data = dict(VALID, difficulty="expert", default_sets="3", primary_muscle_groups=["core", 1])
+        del data["name"]
+        issues = ExerciseValidator().validate(data, "plank")
+
+        self.assertEqual({issue.field for issue in issues},
+                         {"name", "difficulty", "default_sets", "primary_muscle_groups"})
+
+    def test_valid_exercise(self):
+        """Test that a well-formed exercise has no issues."""
+        self.assertEqual(ExerciseValidator(image_root=self.base_dir).validate(VALID), [])
+
+    def test_duplicate_ids_and_missing_images(self):
+        """Test that duplicate ids and missing images are found across files."""
+        self.write_exercise("Conditioning", "Plank", VALID)
+        self.write_exercise("Conditioning", "Plank Copy", dict(VALID, name="Plank Copy"))
+        self.write_exercise("Conditioning", "Side Plank", dict(VALID, id="side_plank_001", image="Conditioning/Side Plank/a.png"))
+        self.write_exercise("Warmup", "Misfiled", dict(VALID, id="misfiled_001"))
+
+        exercises, issues = load_exercise_files(find_exercise_files(self.base_dir), self.base_dir)
+        messages = [str(issue) for issue in issues]
+
+        self.assertEqual(len(issues), 3)
+        self.assertTrue(any("duplicate id 'plank_001'" in m for m in messages))
+        self.assertTrue(any("image not found" in m for m in messages))
+        self.assertTrue(any("does not match folder 'Warmup'" in m for m in messages))
+        self.assertEqual(len(exercises), 2)
+
+    def test_parallel_matches_serial(self):
+        """Test that parallel loading returns the same exercises in the same order."""
+        for i in range(20):
+            self.write_exercise("Conditioning", f"Exercise {i:02d}", dict(VALID, id=f"exercise_{i:03d}", name=f"Exercise {i:02d}"))
+        paths = find_exercise_files(self.base_dir)
+
+        self.assertEqual(load_exercise_files(paths, self.base_dir, workers=1),
+                         load_exercise_files(paths, self.base_dir, workers=2))
+
+    def test_generator_rejects_invalid_vocabulary(self):
+        """Test that CourseGenerator raises VocabularyError instead of KeyError."""
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        templates_path = os.path.join(project_root, "data", "exercises", "program_templates.json")
+        vocabulary_path = os.path.join(self.base_dir, "vocabulary.json")
+        broken = dict(VALID)
+        del broken["default_sets"]
+        with open(vocabulary_path, "w") as f:
+            json.dump({"exercises": [broken, dict(VALID, category="Cardio")]}, f)
+
+        with self.assertRaises(VocabularyError) as ctx:
+            CourseGenerator(vocabulary_path, templates_path)
+        self.assertEqual(len(ctx.exception.issues), 3)
+        self.assertEqual(validate_vocabulary([VALID]), [])
+
+if __name__ == '__main__':
+    unittest.main()
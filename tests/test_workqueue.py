@@ -0,0 +1,125 @@
+import unittest
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.course_generator.workqueue import DONE, FAILED, PENDING, RUNNING, LeaseLost, QueueWorker, WorkQueue
+
+def record_job(log_path, job_id, spec):
+    # O_APPEND writes of one short line are atomic, so every process can share the log
+    with open(log_path, "a") as f:
+        f.write(f"{job_id}\n")
+    time.sleep(spec.get("sleep", 0))
+
+def run_worker(queue_dir, log_path, lease_seconds):
+    worker = QueueWorker(WorkQueue(queue_dir, lease_seconds),
+                         lambda job_id, spec: record_job(log_path, job_id, spec), poll_interval=0.05)
+    worker.run()
+
+def crash_holding_job(queue_dir, lease_seconds):
+    lease = WorkQueue(queue_dir, lease_seconds).claim("crasher")
+    os._exit(0 if lease else 1)
+
+class TestWorkQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.queue_dir = os.path.join(self.tmp_dir.name, "queue")
+        self.log_path = os.path.join(self.tmp_dir.name, "log.txt")
+        self.queue = WorkQueue(self.queue_dir, lease_seconds=0.5)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def processed(self):
+        with open(self.log_path) as f:
+            return f.read().split()
+
+    def test_submit_is_idempotent(self):
+        """Test that resubmitting a job id keeps the original spec and state."""
+        self.assertTrue(self.queue.submit("u1.pdf", {"days": 7}))
+        self.assertFalse(self.queue.submit("u1.pdf", {"days": 14}))
+        self.assertEqual(self.queue.state("u1.pdf"), PENDING)
+        self.assertIsNone(self.queue.state("u2.pdf"))
+        with self.assertRaises(ValueError):
+            self.queue.submit("bad~id", {})
+
+        lease = self.queue.claim("worker-a")
+        self.assertEqual((lease.job_id, lease.spec, lease.attempt), ("u1.pdf", {"days": 7}, 1))
+        self.assertIsNone(self.queue.claim("worker-b"))
+        self.assertEqual(self.queue.state("u1.pdf"), RUNNING)
+        self.queue.complete(lease)
+        self.assertEqual(self.queue.state("u1.pdf"), DONE)
+
+    def test_resubmit_during_rename_is_refused(self):
+        """Test that a resubmit never requeues a job, even while its state file is between directories."""
+        self.queue.submit("u1.pdf", {})
+        lease = self.queue.claim("worker-a")
+        # Mid-rename, no directory shows the job
+        hidden = os.path.join(self.queue_dir, "tmp", "in-flight")
+        os.rename(os.path.join(self.queue_dir, RUNNING, lease.file_name), hidden)
+        self.assertIsNone(self.queue.state("u1.pdf"))
+
+        self.assertFalse(self.queue.submit("u1.pdf", {}))
+        os.rename(hidden, os.path.join(self.queue_dir, RUNNING, lease.file_name))
+        self.assertEqual(self.queue.counts(), {PENDING: 0, RUNNING: 1, DONE: 0, FAILED: 0})
+
+    def test_expired_lease_is_recovered_once(self):
+        """Test that an expired job is requeued and its old holder can no longer finish it."""
+        self.queue.submit("u1.pdf", {})
+        stale = self.queue.claim("worker-a")
+        self.assertEqual(self.queue.recover(), 0)
+        self.assertEqual(self.queue.recover(now=stale.expires + 1), 1)
+
+        fresh = self.queue.claim("worker-b")
+        self.assertEqual(fresh.attempt, 2)
+        with self.assertRaises(LeaseLost):
+            self.queue.renew(stale)
+        with self.assertRaises(LeaseLost):
+            self.queue.complete(stale)
+        self.queue.renew(fresh)
+        self.queue.complete(fresh)
+        self.assertEqual(self.queue.counts(), {PENDING: 0, RUNNING: 0, DONE: 1, FAILED: 0})
+
+    def test_failing_job_is_retried_then_failed(self):
+        """Test that a handler error retries the job up to max_attempts."""
+        queue = WorkQueue(self.queue_dir, lease_seconds=5, max_attempts=2)
+        queue.submit("u1.pdf", {})
+        def handler(job_id, spec):
+            raise RuntimeError("renderer crashed")
+        worker = QueueWorker(queue, handler, "worker-a", poll_interval=0.01)
+        worker.run()
+
+        self.assertEqual(worker.failed, 2)
+        self.assertEqual(queue.state("u1.pdf"), FAILED)
+        with open(os.path.join(self.queue_dir, FAILED, "u1.pdf")) as f:
+            self.assertEqual(json.load(f), {"attempts": 2, "error": "RuntimeError: renderer crashed"})
+
+    def test_worker_processes_share_queue_and_recover_crashes(self):
+        """Test that concurrent worker processes process every job once, including a crashed worker's."""
+        for i in range(40):
+            self.queue.submit(f"job{i:02d}", {"sleep": 0.01})
+        crasher = multiprocessing.Process(target=crash_holding_job, args=(self.queue_dir, 0.5))
+        crasher.start()
+        crasher.join()
+        self.assertEqual(crasher.exitcode, 0)
+
+        workers = [multiprocessing.Process(target=run_worker, args=(self.queue_dir, self.log_path, 0.5))
+                   for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            self.assertEqual(worker.exitcode, 0)
+
+        processed = self.processed()
+        self.assertEqual(sorted(processed), [f"job{i:02d}" for i in range(40)])
+        self.assertEqual(self.queue.counts(), {PENDING: 0, RUNNING: 0, DONE: 40, FAILED: 0})
+
+if __name__ == '__main__':
+    unittest.main()
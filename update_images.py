@@ -1,69 +1,60 @@
 #!/usr/bin/env python3
 """
 Update exercise images by scanning exercise folders
-Automatically detects images and updates exercise.json files with image paths
+Images are hashed in parallel and stored once per distinct content in
+data/exercises/assets, with thumbnails; exercise.json files point to the stored copies
 """
 
 import json
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from course_generator.assets import AssetStore, find_images
+
 def update_images():
     # Base directory for exercises
     base_dir = Path(__file__).parent / "data" / "exercises"
     
-    # Image extensions to look for
-    image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg'}
+    # Hash, deduplicate and thumbnail every image; unchanged files are skipped
+    images = find_images(str(base_dir))
+    store = AssetStore(str(base_dir))
+    report = store.ingest(images)
     
     # Track statistics
     exercises_updated = 0
-    images_found = 0
     
-    # Scan all categories
-    for category_path in base_dir.iterdir():
-        if not category_path.is_dir() or category_path.name.startswith('.'):
+    for exercise_dir, asset_paths in store.exercise_images(images).items():
+        exercise_file = base_dir / exercise_dir / "exercise.json"
+        
+        # Read exercise data
+        with open(exercise_file, 'r', encoding='utf-8') as f:
+            exercise_data = json.load(f)
+        
+        # If multiple images, store as array, otherwise as string
+        if not asset_paths:
+            image = None
+        else:
+            image = asset_paths if len(asset_paths) > 1 else asset_paths[0]
+        if exercise_data.get('image') == image:
             continue
+        exercise_data['image'] = image
+        exercises_updated += 1
+        print(f"✓ {exercise_dir}: {len(asset_paths)} image(s)")
         
-        # Scan exercises in this category
-        for exercise_path in category_path.iterdir():
-            if not exercise_path.is_dir():
-                continue
-            
-            exercise_file = exercise_path / "exercise.json"
-            if not exercise_file.exists():
-                continue
-            
-            # Find all images in this folder
-            images = []
-            for file in exercise_path.iterdir():
-                if file.suffix.lower() in image_extensions:
-                    # Store relative path from data/exercises/
-                    relative_path = file.relative_to(base_dir)
-                    images.append(str(relative_path))
-                    images_found += 1
-            
-            # Read exercise data
-            with open(exercise_file, 'r', encoding='utf-8') as f:
-                exercise_data = json.load(f)
-            
-            # Update image field
-            if images:
-                # If multiple images, store as array, otherwise as string
-                exercise_data['image'] = images if len(images) > 1 else images[0]
-                exercises_updated += 1
-                print(f"✓ {category_path.name}/{exercise_path.name}: {len(images)} image(s)")
-            else:
-                # No images found, set to null
-                if exercise_data.get('image') is not None:
-                    exercise_data['image'] = None
-            
-            # Write back
-            with open(exercise_file, 'w', encoding='utf-8') as f:
-                json.dump(exercise_data, f, indent=4, ensure_ascii=False)
+        # Write back
+        with open(exercise_file, 'w', encoding='utf-8') as f:
+            json.dump(exercise_data, f, indent=4, ensure_ascii=False)
+    
+    for error in report.errors:
+        print(f"❌ {error}")
     
     print(f"\n✅ Done!")
-    print(f"🖼️  Images found: {images_found}")
+    print(f"🖼️  Images found: {report.images} ({report.hashed} hashed, {report.duplicates} duplicates)")
+    print(f"📦 New assets: {report.new_assets}, thumbnails made: {report.thumbnails}, files pruned: {report.pruned}")
     print(f"📄 Exercises updated: {exercises_updated}")
-    print(f"\n💡 Tip: Run 'python build_vocabulary.py' to update the master file")
+    print(f"\n💡 Tip: Run 'python sync_exercises.py' to update the master file")
 
 if __name__ == "__main__":
     update_images()
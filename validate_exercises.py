@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Validate every exercise.json file without writing anything
+Reports all problems in one pass; exits non-zero if any are found
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from course_generator.validation import find_exercise_files, load_exercise_files
+
+def validate_exercises(workers=None):
+    # Base directory for exercises
+    base_dir = Path(__file__).parent / "data" / "exercises"
+    
+    start = time.perf_counter()
+    exercise_files = find_exercise_files(str(base_dir))
+    exercises, issues = load_exercise_files(exercise_files, str(base_dir), workers=workers)
+    elapsed = time.perf_counter() - start
+    
+    for issue in issues:
+        print(f"❌ {issue}")
+    
+    print(f"\n{'✅ All valid!' if not issues else f'❌ {len(issues)} problem(s) found'}")
+    print(f"📄 Files checked: {len(exercise_files)} in {elapsed:.2f}s")
+    return not issues
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    sys.exit(0 if validate_exercises(workers) else 1)